@@ -1,4 +1,4 @@
-import requests
+from common.fetch import fetch_many  # pip install -e week3/dotnet
 
 BASE_URL = "https://api.spacexdata.com/v4/launches/upcoming"
 
@@ -11,9 +11,9 @@ def get_upcoming_launches():
     Returns:
         None
     """
-    response = requests.get(BASE_URL)
+    response = fetch_many([BASE_URL], retries=2)[BASE_URL]
 
-    if response.status_code == 200:
+    if not isinstance(response, Exception):
         launches = response.json()
 
         if not launches:
@@ -0,0 +1,44 @@
+import json
+
+import requests
+
+from api import BASE_URL, get_upcoming_launches
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = json.dumps(body)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+def fake_session_get(answers, calls):
+    def get(session, url, headers=None, timeout=None):
+        calls.append(url)
+        return answers.pop(0)
+    return get
+
+def test_upcoming_launches_retries_through_the_shared_fetcher(monkeypatch, capsys):
+    """
+    Test that a 503 from the API is retried by the fetch layer and the launches are printed.
+    """
+    calls = []
+    answers = [FakeResponse(503, {}), FakeResponse(200, [{"name": "Crew-12", "date_utc": "2026-11-01", "flight_number": 210}])]
+    monkeypatch.setattr(requests.Session, "get", fake_session_get(answers, calls))
+    get_upcoming_launches()
+    assert calls == [BASE_URL, BASE_URL]
+    assert "Mission Name: Crew-12" in capsys.readouterr().out
+
+def test_upcoming_launches_reports_failure(monkeypatch, capsys):
+    """
+    Test that a failed request prints the error message instead of raising.
+    """
+    calls = []
+    monkeypatch.setattr(requests.Session, "get", fake_session_get([FakeResponse(404, {})], calls))
+    get_upcoming_launches()
+    assert calls == [BASE_URL]
+    assert "Failed to fetch data from SpaceX API!" in capsys.readouterr().out
@@ -0,0 +1,5 @@
+"""Shared scraper engine for the week3 sites.
+
+Sites are described by config files in ``week3/dotnet/sites`` and run with
+``python -m common`` from ``week3/dotnet``.
+"""
@@ -0,0 +1,5 @@
+"""Entry point: ``python -m common [site ...]`` runs the configured sites."""
+from common.runner import main
+
+
+main()
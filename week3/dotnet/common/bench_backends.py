@@ -0,0 +1,107 @@
+"""Memory per concurrent page: Selenium (one Chrome per page) vs Playwright (one browser, many contexts).
+
+The fixture pages are served locally and ``--pages`` of them are kept open at
+the same time with each backend. The resident memory of every process started
+by this one (chromedriver/Chrome, or the Playwright server and Chromium) is
+read from /proc before and after, and divided by the number of pages.
+
+Usage (from week3/dotnet):
+    python -m common.bench_backends --pages 10
+    python -m common.bench_backends --pages 20 --backends playwright
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from common.bench_suite import prepare_fixtures, serve
+from common.playwright_backend import PlaywrightBrowser
+from common.pool import process_tree_rss_kb
+
+
+def _own_rss_kb():
+    with open("/proc/self/status", encoding="ascii") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+
+
+def children_rss_kb():
+    """Memory of every process started by this one, in KB (this process itself excluded)."""
+    total = process_tree_rss_kb(os.getpid())
+    if total is None:
+        raise RuntimeError("Reading process memory needs /proc (Linux)")
+    return total - _own_rss_kb()
+
+
+def measure_selenium(urls, driver_path=None):
+    """Opens one Chrome per URL, all at once; returns (KB before, KB with every page open)."""
+    from common.driver import create_chrome_driver
+
+    before = children_rss_kb()
+    drivers = []
+    try:
+        for url in urls:
+            driver = create_chrome_driver(driver_path)
+            drivers.append(driver)
+            driver.get(url)
+        time.sleep(1)  # let the renderers settle
+        return before, children_rss_kb()
+    finally:
+        for driver in drivers:
+            driver.quit()
+
+
+async def _measure_playwright(urls):
+    before = children_rss_kb()
+    async with PlaywrightBrowser() as browser:
+        drivers = await asyncio.gather(*(browser.new_driver() for _ in urls))
+        await asyncio.gather(*(driver.page.goto(url, wait_until="load") for driver, url in zip(drivers, urls)))
+        await asyncio.sleep(1)
+        after = children_rss_kb()
+        await asyncio.gather(*(driver.context.close() for driver in drivers))
+    return before, after
+
+
+def measure_playwright(urls):
+    """Opens one context per URL in a single browser; returns (KB before, KB with every page open)."""
+    return asyncio.run(_measure_playwright(urls))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare browser memory per concurrent page across backends.")
+    parser.add_argument("--pages", type=int, default=10, help="Pages open at the same time.")
+    parser.add_argument("--backends", default="selenium,playwright")
+    parser.add_argument("--driver-path", default=None)
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        fixtures = prepare_fixtures(folder, rows=2000, tables=50, depth=50)
+        server, base_url = serve(folder)
+        urls = [f"{base_url}/{fixtures[i % len(fixtures)]}" for i in range(args.pages)]
+        try:
+            for backend in args.backends.split(","):
+                try:
+                    if backend == "selenium":
+                        before, after = measure_selenium(urls, args.driver_path)
+                    elif backend == "playwright":
+                        before, after = measure_playwright(urls)
+                    else:
+                        raise ValueError(f"Unknown backend '{backend}'")
+                except Exception as e:
+                    print(f"⚠ {backend} failed: {e}")
+                    continue
+                results[backend] = (after - before) / args.pages
+        finally:
+            server.shutdown()
+
+    print(f"\n{'backend':<12} {'pages':>6} {'MB per page':>12}")
+    for backend, per_page in results.items():
+        print(f"{backend:<12} {args.pages:>6} {per_page / 1024:>12.1f}")
+    if len(results) == 2 and results["playwright"]:
+        print(f"Playwright uses {results['selenium'] / results['playwright']:.1f}x less memory per page.")
+    return results
+
+
+if __name__ == "__main__":
+    main()
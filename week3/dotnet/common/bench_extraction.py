@@ -0,0 +1,61 @@
+"""Benchmark of the table extraction engines on a live page.
+
+Usage (from week3/dotnet):
+    python -m common.bench_extraction https://en.wikipedia.org/wiki/Java_version_history
+"""
+import argparse
+import time
+
+from common.driver import create_chrome_driver, count_round_trips
+from common.extraction import ENGINES, get_engine
+
+
+def benchmark(driver, counter, engine_name, repeat=3):
+    """Runs one engine ``repeat`` times and returns its stats for the best run."""
+    engine = get_engine(engine_name)
+    best = None
+    for _ in range(repeat):
+        calls_before = counter["calls"]
+        start = time.perf_counter()
+        tables = engine.extract_tables(driver)
+        elapsed = time.perf_counter() - start
+        stats = {
+            "engine": engine_name,
+            "tables": len(tables),
+            "rows": sum(len(table.rows) for table in tables),
+            "round_trips": counter["calls"] - calls_before,
+            "seconds": elapsed,
+        }
+        if best is None or stats["seconds"] < best["seconds"]:
+            best = stats
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare WebDriver round trips and wall time per extraction engine.")
+    parser.add_argument("url", nargs="?", default="https://en.wikipedia.org/wiki/Java_version_history")
+    parser.add_argument("--driver-path", default=None, help="Path to chromedriver (Selenium Manager is used if omitted).")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    driver = create_chrome_driver(args.driver_path)
+    try:
+        driver.get(args.url)
+        counter = count_round_trips(driver)
+        results = [benchmark(driver, counter, name, args.repeat)
+                   for name, engine_class in ENGINES.items() if engine_class.needs_browser]
+    finally:
+        driver.quit()
+
+    print(f"{'engine':<10} {'tables':>7} {'rows':>7} {'round trips':>12} {'seconds':>9}")
+    for r in results:
+        print(f"{r['engine']:<10} {r['tables']:>7} {r['rows']:>7} {r['round_trips']:>12} {r['seconds']:>9.3f}")
+    baseline = next(r for r in results if r["engine"] == "webdriver")
+    for r in results:
+        if r is not baseline and r["seconds"]:
+            print(f"{r['engine']}: {baseline['round_trips'] / max(r['round_trips'], 1):.0f}x fewer round trips, "
+                  f"{baseline['seconds'] / r['seconds']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Load test of the lifecycle lookup service.
+
+Measures in-process lookup latency of a ``LifecycleSnapshot`` and HTTP
+requests/sec of ``common.service`` with several keep-alive clients, against
+an existing lifecycle database or a synthetic one.
+
+Usage (from week3/dotnet):
+    python -m common.bench_service                           # synthetic database, in-process server
+    python -m common.bench_service --db output/lifecycle.db
+    python -m common.bench_service --url http://127.0.0.1:8765 --clients 16 --seconds 10
+"""
+import argparse
+import datetime
+import http.client
+import os
+import random
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+import pandas as pd
+
+from common.lifecycle import DB_FILE, LifecycleSink
+from common.service import LifecycleService, LifecycleSnapshot, make_server
+from common.sites import SiteConfig
+
+
+def write_synthetic_db(path, products=20, releases=500):
+    """Writes ``products`` products with ``releases`` versions, builds and end dates each."""
+    columns = ["Version", "Release date", "Build", "End of support"]
+    start = datetime.date(2015, 1, 1)
+    for p in range(products):
+        site = SiteConfig(f"product_{p}", "https://example.com", "unused.csv", formats=("sqlite",))
+        rows = [[f"{r // 100}.{r % 100}", (start + datetime.timedelta(days=r)).isoformat(), f"{20000 + r}.{p}",
+                 (start + datetime.timedelta(days=3650 + r * 3)).isoformat()] for r in range(releases)]
+        sink = LifecycleSink(path, site)
+        sink.write(0, tuple(columns), pd.DataFrame(rows, columns=columns))
+        sink.close()
+
+
+def queries(snapshot, count=1000, seed=1):
+    """Random (path, params) requests over the products and versions of ``snapshot``."""
+    rng = random.Random(seed)
+    products = snapshot.products()
+    found = []
+    for _ in range(count):
+        product = rng.choice(products)
+        release = rng.choice(snapshot.releases[product])
+        found.append(rng.choice([
+            ("/latest", {"product": product}),
+            ("/latest", {"product": product, "prefix": release.version.split(".")[0]}),
+            ("/release", {"product": product, "version": release.version}),
+            ("/range", {"product": product, "low": release.version}),
+        ]))
+    return found
+
+
+def bench_lookups(service, requests, repeat=20):
+    """Microseconds per ``handle`` call, answered from memory."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for route, params in requests:
+            service.handle(route, params)
+    return (time.perf_counter() - start) / (repeat * len(requests)) * 1e6
+
+
+def _client(url, requests, deadline, latencies):
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            route, params = requests[i % len(requests)]
+            i += 1
+            start = time.perf_counter()
+            conn.request("GET", f"{route}?{urlencode(params)}")
+            conn.getresponse().read()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        conn.close()
+
+
+def bench_http(url, requests, clients=8, seconds=5.0):
+    """Runs ``clients`` keep-alive clients for ``seconds``; returns (requests/sec, p50 ms, p99 ms)."""
+    deadline = time.perf_counter() + seconds
+    latencies = [[] for _ in range(clients)]
+    threads = [threading.Thread(target=_client, args=(url, requests[c::clients] or requests, deadline, latencies[c]))
+               for c in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    done = sorted(latency for client in latencies for latency in client)
+    if not done:
+        return 0.0, 0.0, 0.0
+    return len(done) / seconds, done[len(done) // 2] * 1000, done[min(len(done) - 1, int(len(done) * 0.99))] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the lifecycle lookup service.")
+    parser.add_argument("--db", default=None, help="Lifecycle database (default: a synthetic one).")
+    parser.add_argument("--url", default=None, help="Running service to test (default: start one in-process).")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--products", type=int, default=20, help="Products of the synthetic database.")
+    parser.add_argument("--releases", type=int, default=500, help="Releases per product of the synthetic database.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = args.db
+        if path is None:
+            path = os.path.join(folder, DB_FILE)
+            write_synthetic_db(path, args.products, args.releases)
+        service = LifecycleService(path)
+        snapshot = service.snapshot
+        print(f"{len(snapshot)} releases of {len(snapshot.products())} products loaded.")
+        requests = queries(snapshot)
+        print(f"In-process lookup: {bench_lookups(service, requests):.1f} µs")
+        reload_start = time.perf_counter()
+        LifecycleSnapshot.load(path)
+        print(f"Snapshot rebuild: {(time.perf_counter() - reload_start) * 1000:.1f} ms")
+
+        server = None
+        url = args.url
+        if url is None:
+            server = make_server(service, port=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            rate, p50, p99 = bench_http(url, requests, args.clients, args.seconds)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+        print(f"HTTP, {args.clients} clients: {rate:.0f} requests/sec, p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+        return rate
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Benchmark suite of the scraper hot paths over local fixture pages.
+
+The pages are served from a local HTTP server: the real page fixtures in
+``common/fixtures`` plus generated ones (a 10k-row table, 200 tables, deeply
+nested divs). Every page is scraped once per engine, each case in a fresh
+worker process, and the time of each phase (driver start, navigation,
+expansion, extract_tables/extract_versions/extract_text_blocks,
+normalisation, save), rows/sec, the worker's peak RSS and, for the browser
+engines, the peak RSS of the chromedriver process tree (chromedriver plus
+Chrome, where most of the memory of a browser scrape lives) are recorded.
+
+Results are written as JSON so runs of different commits can be compared.
+
+Usage (from week3/dotnet):
+    python -m common.bench_suite                                  # static engine only
+    python -m common.bench_suite --engines static,script,webdriver,page_source
+    python -m common.bench_suite --compare output/bench/<earlier run>.json
+"""
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PHASES = ("driver_start", "navigation", "expansion", "extract_tables", "normalisation", "extract_versions",
+          "extract_text_blocks", "save")
+
+
+def write_large_table(path, rows=10000):
+    """One table with ``rows`` rows of versions, builds and long-form dates."""
+    months = ("January", "February", "March", "April", "May", "June", "July", "August", "September",
+              "October", "November", "December")
+    body = "".join(
+        f"<tr><td>8.0.{i}</td><td>{months[i % 12]} {i % 28 + 1}, {2015 + i % 10}</td><td>26100.{i}</td>"
+        f"<td>KB{5000000 + i}</td><td>{'LTS' if i % 3 else 'STS'}</td><td>Note {i}</td></tr>"
+        for i in range(rows))
+    _write(path, "<table><tr><th>Version</th><th>Release date[1]</th><th>Build</th><th>KB article</th>"
+                 f"<th>Support</th><th>Notes</th></tr>{body}</table>")
+
+
+def write_many_tables(path, tables=200, rows=20):
+    """``tables`` tables in three header layouts, with footnotes and line breaks in the headers."""
+    headers = ("<th>Version</th><th>Release date[2]</th><th>End of support</th>",
+               "<th>Version</th><th>Release<br>date</th><th>End of support[3]</th><th>Notes</th>",
+               "<th>Servicing option</th><th>Build</th><th>Availability date</th>")
+    parts = []
+    for t in range(tables):
+        body = "".join(f"<tr><td>{t}.{r}</td><td>2024-{r % 12 + 1:02d}-{r % 28 + 1:02d}</td>"
+                       f"<td>Oct {r % 28 + 1}, 2030</td><td>n{r}</td></tr>" for r in range(rows))
+        parts.append(f"<h2>Release {t}</h2><table><tr>{headers[t % 3]}</tr>{body}</table>")
+    _write(path, "".join(parts))
+
+
+def write_nested(path, depth=200, branches=40):
+    """``branches`` collapsible sections, each with version notes ``depth`` divs deep."""
+    parts = []
+    for b in range(branches):
+        inner = f'<p>Version 9.{b}.{depth} released <a href="/download/{b}">January {b % 28 + 1}, 2025</a></p>'
+        parts.append(f"<details><summary>Release 9.{b}</summary>{'<div>' * depth}{inner}{'</div>' * depth}"
+                     "</details>")
+    _write(path, "".join(parts))
+
+
+def _write(path, body):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><title>bench</title></head><body>{body}</body></html>")
+
+
+def prepare_fixtures(folder, rows=10000, tables=200, depth=200):
+    """Copies the real fixtures and writes the synthetic pages to ``folder``; returns their file names."""
+    names = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.endswith(".html"):
+            shutil.copy(os.path.join(FIXTURES_DIR, name), folder)
+            names.append(name)
+    write_large_table(os.path.join(folder, "large_table.html"), rows)
+    write_many_tables(os.path.join(folder, "many_tables.html"), tables)
+    write_nested(os.path.join(folder, "nested.html"), depth)
+    return names + ["large_table.html", "many_tables.html", "nested.html"]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(folder):
+    """Serves ``folder`` on a free local port; returns (server, base URL)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=folder))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None where it cannot be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if platform.system() == "Darwin" else peak
+
+
+def driver_peak_rss_kb(driver, peak=None):
+    """The larger of ``peak`` and the current RSS of ``driver``'s process tree (None without a driver)."""
+    from common.pool import driver_rss_kb
+
+    current = driver_rss_kb(driver) if driver is not None else None
+    if current is None:
+        return peak
+    return max(peak or 0, current)
+
+
+def run_case(fixture, url, engine, driver_path=None):
+    """Scrapes one page with one engine and returns its timings (runs in a worker process)."""
+    from common.driver import create_chrome_driver
+    from common.extraction import get_engine
+    from common.scraper import SiteScraper
+    from common.sites import SiteConfig
+
+    result = {"fixture": fixture, "engine": engine, "ok": False, "error": "", "phases": {}}
+    driver = None
+    driver_peak = None
+    start = time.perf_counter()
+    try:
+        if get_engine(engine).needs_browser:
+            driver_start = time.perf_counter()
+            driver = create_chrome_driver(driver_path)
+            result["phases"]["driver_start"] = time.perf_counter() - driver_start
+        site = SiteConfig(os.path.splitext(fixture)[0], url, "tables_{n}.csv", engine=engine, expand="all",
+                          extract=("tables", "text", "versions"), merge="schema", blocking={"block": []})
+        with tempfile.TemporaryDirectory() as output_folder:
+            scraper = SiteScraper(site, driver, output_folder)
+            # Chrome's tree is sampled after each step, as it is gone once the driver quits.
+            for step in (scraper.open_website, scraper.expand_sections, scraper.extract, scraper.save):
+                step()
+                driver_peak = driver_peak_rss_kb(driver, driver_peak)
+        table_rows = scraper.sink.rows if scraper.sink else 0
+        result["phases"].update(scraper.timings)
+        table_seconds = sum(scraper.timings.get(p, 0.0) for p in ("extract_tables", "normalisation"))
+        result.update(ok=True, tables=scraper.tables_count, rows=table_rows, versions=len(scraper.versions_data),
+                      rows_per_sec=table_rows / table_seconds if table_seconds else 0.0)
+    except Exception as e:
+        result["error"] = str(e).strip()
+    finally:
+        if driver is not None:
+            driver.quit()
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss_kb"] = peak_rss_kb()
+    result["driver_rss_kb"] = driver_peak
+    return result
+
+
+def run_suite(engines=("static",), rows=10000, tables=200, depth=200, driver_path=None):
+    """Runs every fixture with every engine, each case in a fresh process; returns the results."""
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        fixtures = prepare_fixtures(folder, rows, tables, depth)
+        server, base_url = serve(folder)
+        try:
+            for engine in engines:
+                for fixture in fixtures:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                        result = executor.submit(run_case, fixture, f"{base_url}/{fixture}", engine,
+                                                 driver_path).result()
+                    if not result["ok"]:
+                        print(f"⚠ {engine} on {fixture} failed: {result['error']}")
+                    results.append(result)
+        finally:
+            server.shutdown()
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def save_results(results, path=None):
+    """Writes the results with the commit and machine they were measured on; returns the path."""
+    commit = _git_commit()
+    taken = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = path or os.path.join("output", "bench", f"{taken}-{commit or 'nogit'}.json")
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"commit": commit, "taken": taken, "python": platform.python_version(),
+                   "platform": platform.platform(), "results": results}, f, indent=2)
+    return path
+
+
+def print_results(results, baseline=None):
+    """Prints one line per case; with a baseline run, also the change in total time."""
+    previous = {(r["fixture"], r["engine"]): r for r in (baseline or {}).get("results", [])}
+    print(f"\n{'fixture':<20} {'engine':<10} {'rows':>7} {'rows/s':>10} {'RSS MB':>7} {'Chrome MB':>9} "
+          f"{'seconds':>8}  phases")
+    for r in results:
+        if not r["ok"]:
+            print(f"{r['fixture']:<20} {r['engine']:<10} failed: {r['error']}")
+            continue
+        rss = f"{r['peak_rss_kb'] / 1024:.0f}" if r["peak_rss_kb"] else "-"
+        chrome = f"{r['driver_rss_kb'] / 1024:.0f}" if r.get("driver_rss_kb") else "-"
+        phases = " ".join(f"{p}={r['phases'][p]:.3f}" for p in PHASES if p in r["phases"])
+        line = f"{r['fixture']:<20} {r['engine']:<10} {r['rows']:>7} {r['rows_per_sec']:>10.0f} {rss:>7} " \
+               f"{chrome:>9} {r['seconds']:>8.3f}  {phases}"
+        old = previous.get((r["fixture"], r["engine"]))
+        if old and old.get("ok") and old["seconds"]:
+            line += f"  ({(r['seconds'] / old['seconds'] - 1) * 100:+.0f}% vs {baseline.get('commit') or 'baseline'})"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper phases on local fixture pages.")
+    parser.add_argument("--engines", default="static", help="Comma-separated engines: static, script, webdriver, page_source.")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows of the large synthetic table.")
+    parser.add_argument("--tables", type=int, default=200, help="Tables of the many-tables page.")
+    parser.add_argument("--depth", type=int, default=200, help="Nesting depth of the nested page.")
+    parser.add_argument("--driver-path", default=None)
+    parser.add_argument("--output", default=None, help="Results file (default: output/bench/<time>-<commit>.json).")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(tuple(args.engines.split(",")), args.rows, args.tables, args.depth, args.driver_path)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nResults saved to '{save_results(results, args.output)}'.")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Persistent fetch cache used to skip pages that did not change since the last run.
+
+Two checks are made per URL:
+    1. a conditional HEAD request with the stored ETag / Last-Modified; a 304
+       means the page is skipped before any browser work is done;
+    2. after rendering and expansion, a hash of the page text is compared with
+       the stored one; a match skips extraction and the CSV rewrite.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import requests
+
+from common.static import USER_AGENT
+
+
+NOT_MODIFIED = "not-modified"
+UNCHANGED = "unchanged"
+MISS = "miss"
+
+
+def content_hash(text):
+    """Returns a stable hash of the rendered page text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def check_upstream(url, entry, timeout=10, session=None):
+    """Sends a conditional HEAD request for ``url``.
+
+    Returns (not_modified, validators) where validators are the ETag and
+    Last-Modified values to store once the page was scraped successfully.
+    """
+    if not url.startswith(("http://", "https://")):
+        return False, {}
+    headers = {"User-Agent": USER_AGENT}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    try:
+        response = (session or requests).head(url, headers=headers, timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        print(f"⚠ Conditional request failed for {url}: {e}")
+        return False, {}
+    validators = {"etag": response.headers.get("ETag", ""),
+                  "last_modified": response.headers.get("Last-Modified", "")}
+    return response.status_code == 304 and bool(entry), validators
+
+
+class FetchCache:
+    """URL -> {etag, last_modified, content_hash} entries stored in a JSON file."""
+    def __init__(self, path=os.path.join("output", ".fetch_cache.json")):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, url):
+        """Returns the stored entry for ``url`` or None."""
+        return self.entries.get(url)
+
+    def update(self, url, entry):
+        """Stores a new entry for ``url``, keeping validators the server did not resend."""
+        with self._lock:
+            merged = dict(self.entries.get(url, {}))
+            merged.update({key: value for key, value in entry.items() if value})
+            self.entries[url] = merged
+
+    def save(self):
+        """Writes the cache file atomically."""
+        with self._lock:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,204 @@
+"""Typed Parquet output for the extracted tables.
+
+Tables are written to a hive-partitioned dataset::
+
+    <root>/source=<site>/schema=<header id>/scrape_date=<YYYY-MM-DD>/part-<table>.parquet
+
+Every ``schema=`` folder holds tables with the same header row and keeps its
+Arrow schema in ``_common_metadata``: ISO date columns are ``date32``, columns
+with few distinct values are dictionary-encoded and everything else (builds,
+KB numbers, versions) stays a string. When a later table has a value that is
+not a date in a ``date32`` column ("TBD", "Ongoing"), the column is widened to
+string and the files already written are rewritten, so no value is lost.
+Readers can then load only the partitions and columns they need, memory-mapped.
+
+pyarrow is an optional dependency; it is only needed when Parquet output is used.
+"""
+import datetime
+import hashlib
+import os
+import re
+import shutil
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+
+
+ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+METADATA_FILE = "_common_metadata"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+
+
+def schema_id(header):
+    """Short stable id of a header row, used as the ``schema=`` partition value."""
+    return hashlib.sha1("\x1f".join(header).encode("utf-8")).hexdigest()[:10]
+
+
+def infer_schema(df, category_ratio=0.5):
+    """Builds the Arrow schema of a table from its (string) values."""
+    _require_pyarrow()
+    fields = []
+    for name in df.columns:
+        values = df[name].astype("string").fillna("")
+        filled = values[values != ""]
+        if len(filled) and filled.map(lambda v: bool(ISO_DATE_RE.match(v))).all():
+            fields.append(pa.field(name, pa.date32()))
+        elif len(values) >= 4 and filled.nunique() <= len(values) * category_ratio:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def _cells(df, name):
+    if name in df.columns:
+        return df[name].astype("string").replace("", pd.NA)
+    return pd.Series([pd.NA] * len(df), dtype="string")
+
+
+def misfit_columns(df, schema):
+    """Names of the ``date32`` columns of ``schema`` holding a value of ``df`` that is not an ISO date."""
+    misfits = []
+    for field in schema:
+        if pa.types.is_date32(field.type):
+            values = _cells(df, field.name).dropna()
+            dates = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+            if dates.isna().any():
+                misfits.append(field.name)
+    return misfits
+
+
+def widen_schema(schema, names):
+    """Returns ``schema`` with the columns ``names`` turned into strings."""
+    for name in names:
+        schema = schema.set(schema.get_field_index(name), pa.field(name, pa.string()))
+    return schema
+
+
+def to_arrow(df, schema):
+    """Converts a table of strings to Arrow with the given schema.
+
+    Empty cells become nulls; a value that does not fit a date column raises ValueError.
+    """
+    arrays = []
+    for field in schema:
+        values = _cells(df, field.name)
+        if pa.types.is_date32(field.type):
+            dates = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+            if (dates.isna() & values.notna()).any():
+                raise ValueError(f"Column '{field.name}' has values that are not dates")
+            arrays.append(pa.array([d.date() if not pd.isna(d) else None for d in dates], type=pa.date32()))
+        elif pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values.to_numpy(dtype=object, na_value=None), type=pa.string())
+                          .dictionary_encode().cast(field.type))
+        else:
+            arrays.append(pa.array(values.to_numpy(dtype=object, na_value=None), type=pa.string()))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _rewrite_parts(folder, schema):
+    # Older files keep the narrower type; cast them so every file of the layout matches ``schema``.
+    for parent, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith(".parquet"):
+                path = os.path.join(parent, name)
+                pq.write_table(pq.read_table(path, partitioning=None).cast(schema), path)
+
+
+class ParquetSink:
+    """Writes each table as a Parquet file under its source/schema/scrape-date partition."""
+    def __init__(self, root, source, scrape_date=None):
+        _require_pyarrow()
+        self.root = root
+        self.source = source
+        self.scrape_date = scrape_date or datetime.date.today().isoformat()
+        self.schemas = {}
+        self.cleared = set()
+        self.paths = []
+        self.rows = 0
+        self.tables = 0
+
+    def _schema_for(self, folder, df):
+        metadata = os.path.join(folder, METADATA_FILE)
+        if folder not in self.schemas:
+            if os.path.exists(metadata):
+                self.schemas[folder] = pq.read_schema(metadata)
+            else:
+                os.makedirs(folder, exist_ok=True)
+                self.schemas[folder] = infer_schema(df)
+                pq.write_metadata(self.schemas[folder], metadata)
+        misfits = misfit_columns(df, self.schemas[folder])
+        if misfits:
+            self.schemas[folder] = widen_schema(self.schemas[folder], misfits)
+            _rewrite_parts(folder, self.schemas[folder])
+            pq.write_metadata(self.schemas[folder], metadata)
+            print(f"⚠ Columns {', '.join(misfits)} of '{folder}' hold non-date values; stored as strings now.")
+        return self.schemas[folder]
+
+    def write(self, table_index, header, df):
+        """Writes ``df`` (with unique column names) as one Parquet file."""
+        schema_folder = os.path.join(self.root, f"source={self.source}", f"schema={schema_id(header)}")
+        schema = self._schema_for(schema_folder, df)
+        part_folder = os.path.join(schema_folder, f"scrape_date={self.scrape_date}")
+        if part_folder not in self.cleared:
+            # A re-run on the same day replaces that day's partition.
+            shutil.rmtree(part_folder, ignore_errors=True)
+            os.makedirs(part_folder)
+            self.cleared.add(part_folder)
+        path = os.path.join(part_folder, f"part-{table_index:04d}.parquet")
+        pq.write_table(to_arrow(df, schema), path)
+        self.paths.append(path)
+        self.rows += len(df)
+        self.tables += 1
+
+    def close(self):
+        """Returns the number of rows written."""
+        if self.tables:
+            print(f"Parquet data saved under '{os.path.join(self.root, f'source={self.source}')}'.")
+        return self.rows
+
+    def abort(self):
+        """Removes the files written by this run, so a failed scrape leaves no partial partition."""
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+        self.paths = []
+
+
+def list_schemas(root, source):
+    """Returns {schema id: Arrow schema} for every table layout of a source."""
+    _require_pyarrow()
+    source_folder = os.path.join(root, f"source={source}")
+    schemas = {}
+    for name in sorted(os.listdir(source_folder)):
+        metadata = os.path.join(source_folder, name, METADATA_FILE)
+        if name.startswith("schema=") and os.path.exists(metadata):
+            schemas[name[len("schema="):]] = pq.read_schema(metadata)
+    return schemas
+
+
+def read_dataset(root, source, schema, columns=None, scrape_date=None):
+    """Loads one table layout of a source, optionally only some columns and one scrape date.
+
+    Files are memory-mapped and partitions that do not match are never opened.
+    """
+    _require_pyarrow()
+    folder = os.path.join(root, f"source={source}", f"schema={schema}")
+    partitioning = ds.partitioning(pa.schema([pa.field("scrape_date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(folder, format="parquet", partitioning=partitioning,
+                         schema=pq.read_schema(os.path.join(folder, METADATA_FILE)).append(
+                             pa.field("scrape_date", pa.string())),
+                         filesystem=pafs.LocalFileSystem(use_mmap=True))
+    filter_expression = ds.field("scrape_date") == scrape_date if scrape_date else None
+    return dataset.to_table(columns=columns, filter=filter_expression)
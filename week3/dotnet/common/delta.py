@@ -0,0 +1,134 @@
+"""Change detection between runs: only inserted, updated and removed rows are written.
+
+A site with the "delta" output format keeps, per table row, a stable identity
+and a hash of the row's contents in a compact state file. On the next run the
+new rows are compared with that state and the changes are written as JSON
+lines that downstream systems can apply instead of re-importing whole CSVs::
+
+    <output>/delta/<site>/state.json                  {"rows": {identity: hash}}
+    <output>/delta/<site>/<UTC timestamp>.jsonl       {"op": "insert" | "update" | "remove", ...}
+
+The identity is the table's header fingerprint plus the values of the site's
+key columns (``delta_keys``): the first key set whose columns all exist in the
+table is used, e.g. ``[["Version", "Servicing option"], ["Build"]]``. Tables
+without any key set are keyed by their whole row, so an edit shows up as a
+removal plus an insertion.
+"""
+import hashlib
+import json
+import os
+
+from common.columnar import schema_id
+from common.schemas import header_signature, normalize_header
+from common.snapshots import utc_timestamp
+
+
+STATE_FILE = "state.json"
+
+
+def row_hash(values):
+    """Short hash of a row's cell values."""
+    return hashlib.blake2b("\x1f".join(values).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _key_sets(delta_keys):
+    # A flat list of column names is a single key set.
+    if delta_keys and all(isinstance(key, str) for key in delta_keys):
+        return [list(delta_keys)]
+    return [list(keys) for keys in delta_keys or []]
+
+
+class DeltaSink:
+    """Compares the streamed tables with the previous run's state and writes the changes on ``close()``.
+
+    Only the hashes of the current rows are kept in memory; inserted and
+    updated rows are spooled to disk as the tables stream in, and the spool
+    becomes the change file once the removals are known.
+    """
+    def __init__(self, folder, delta_keys=()):
+        self.folder = folder
+        self.key_sets = [[normalize_header(key).casefold() for key in keys] for keys in _key_sets(delta_keys)]
+        self.previous = self._load_state()
+        self.seen = {}     # identity -> row hash of this run
+        self.spool_path = os.path.join(folder, "changes.spool")
+        self.spool = None
+        self.paths = []
+        self.rows = 0
+        self.tables = 0
+        self.changes = {"insert": 0, "update": 0, "remove": 0}
+
+    def _load_state(self):
+        path = os.path.join(self.folder, STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["rows"]
+
+    def _key_positions(self, signature):
+        for keys in self.key_sets:
+            if all(key in signature for key in keys):
+                return [signature.index(key) for key in keys]
+        return None
+
+    def _record(self, change):
+        if self.spool is None:
+            os.makedirs(self.folder, exist_ok=True)
+            self.spool = open(self.spool_path, "w", encoding="utf-8")
+        self.spool.write(json.dumps(change, ensure_ascii=False) + "\n")
+        self.changes[change["op"]] += 1
+
+    def write(self, table_index, header, df):
+        """Hashes every row of ``df`` and spools the ones that are new or changed."""
+        signature = header_signature(header)
+        prefix = schema_id(signature)
+        positions = self._key_positions(signature)
+        columns = list(df.columns)
+        for row in df.astype(str).itertuples(index=False, name=None):
+            key = "|".join(row[p] for p in positions) if positions is not None else "|".join(row)
+            identity, n = f"{prefix}|{key}", 1
+            while identity in self.seen:
+                # Repeated keys inside one table layout are told apart by their order.
+                n += 1
+                identity = f"{prefix}|{key}#{n}"
+            digest = row_hash(row)
+            self.seen[identity] = digest
+            if identity not in self.previous:
+                self._record({"op": "insert", "id": identity, "row": dict(zip(columns, row))})
+            elif self.previous[identity] != digest:
+                self._record({"op": "update", "id": identity, "row": dict(zip(columns, row))})
+        self.rows += len(df)
+        self.tables += 1
+
+    def close(self):
+        """Writes the change file (if anything changed) and the new state; returns the rows seen."""
+        for identity in self.previous:
+            if identity not in self.seen:
+                self._record({"op": "remove", "id": identity})
+        os.makedirs(self.folder, exist_ok=True)
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+            stem = os.path.join(self.folder, utc_timestamp().replace(":", ""))
+            path, n = stem + ".jsonl", 1
+            while os.path.exists(path):  # two runs within the same second
+                n += 1
+                path = f"{stem}-{n}.jsonl"
+            os.replace(self.spool_path, path)
+            self.paths.append(path)
+        state_path = os.path.join(self.folder, STATE_FILE)
+        with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"rows": self.seen}, f, separators=(",", ":"))
+        os.replace(state_path + ".tmp", state_path)
+        self.paths.append(state_path)
+        self.previous = self.seen
+        print(f"Delta: {self.changes['insert']} inserted, {self.changes['update']} updated, "
+              f"{self.changes['remove']} removed rows in '{self.folder}'.")
+        return self.rows
+
+    def abort(self):
+        """Drops the spooled changes; the state of the previous run is kept."""
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        if os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
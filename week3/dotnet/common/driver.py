@@ -0,0 +1,40 @@
+"""Chrome WebDriver setup shared by the scrapers and tools."""
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+
+def create_chrome_driver(driver_path=None, headless=True):
+    """Initialize and configure a Chrome WebDriver.
+
+    When no driver_path is given Selenium Manager locates chromedriver itself.
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920x1080")
+    chrome_options.add_argument("--log-level=3")
+    service = Service(driver_path) if driver_path else Service()
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+def count_round_trips(driver):
+    """Counts every WebDriver command sent by ``driver`` (and its elements).
+
+    Returns a dict whose "calls" entry is incremented on each round trip. The
+    driver is only wrapped once; later calls return the same counter. Drivers
+    that count their own calls (``PlaywrightDriver``) already have one.
+    """
+    if hasattr(driver, "round_trips"):
+        return driver.round_trips
+    counter = {"calls": 0}
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        counter["calls"] += 1
+        return original(driver_command, params)
+
+    driver.execute = execute
+    driver.round_trips = counter
+    return counter
@@ -0,0 +1,341 @@
+"""Table extraction engines shared by the scrapers.
+
+Every engine turns the tables of the current page into ``RawTable`` objects so
+the scrapers can build their DataFrames the same way no matter how the cells
+were read. ``iter_tables`` yields them one at a time, so the scraper can write
+each table and let it go before the next one is built; ``extract_tables``
+returns them as a list.
+"""
+import json
+import time
+
+from selenium.common.exceptions import WebDriverException
+from lxml import html as lxml_html
+from selenium.webdriver.common.by import By
+
+from common.parallel import iter_tables_parallel
+from common.static import StaticHtmlEngine, parse_text_nodes, visible_text
+from common.tables import Cell, RawTable, select_tables
+
+
+PAGE_TEXT_JS = "return document.body ? document.body.innerText : '';"
+
+PAGE_HTML_JS = "return '<!DOCTYPE html>' + document.documentElement.outerHTML;"
+
+# Walks the DOM once and returns every visible text node with the href of its
+# nearest enclosing link and the id of its nearest block-level ancestor, so text
+# nested in many divs is read exactly once.
+TEXT_NODES_JS = """
+var BLOCK = /^(ADDRESS|ARTICLE|ASIDE|BLOCKQUOTE|BODY|DD|DETAILS|DIV|DL|DT|FIGCAPTION|FOOTER|FORM|H[1-6]|HEADER|LI|MAIN|NAV|OL|P|PRE|SECTION|SUMMARY|TABLE|TD|TH|TR|UL)$/;
+var SKIP = /^(SCRIPT|STYLE|NOSCRIPT|TEMPLATE)$/;
+var blockIds = new Map();
+var out = [];
+if (document.body) {
+    var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    var node;
+    while ((node = walker.nextNode())) {
+        var text = node.nodeValue.trim();
+        var parent = node.parentElement;
+        if (!text || !parent || SKIP.test(parent.tagName) || !parent.getClientRects().length) {
+            continue;
+        }
+        var link = parent.closest('a[href]');
+        var block = parent;
+        while (block.parentElement && !BLOCK.test(block.tagName)) {
+            block = block.parentElement;
+        }
+        if (!blockIds.has(block)) {
+            blockIds.set(block, blockIds.size);
+        }
+        out.push([text, link ? link.href : '', blockIds.get(block)]);
+    }
+}
+return JSON.stringify(out);
+"""
+
+
+class WebDriverTableEngine:
+    """Reads tables element by element through WebDriver (the original approach).
+
+    Every row lookup and every ``.text`` is a separate round trip to chromedriver,
+    so this is only kept as a fallback and as the baseline for the benchmark.
+    A table that fails (e.g. a stale element after the page re-rendered it) is
+    read again from a fresh lookup, up to ``retries`` times.
+    """
+    name = "webdriver"
+    needs_browser = True
+    retries = 2
+    retry_delay = 0.5
+
+    def open(self, driver, url):
+        """Loads ``url`` in the browser."""
+        driver.get(url)
+
+    def page_text(self, driver):
+        """Returns the rendered text of the whole page."""
+        return driver.execute_script(PAGE_TEXT_JS)
+
+    def page_html(self, driver):
+        """Returns the current (post-JS, expanded) DOM serialized as HTML."""
+        return driver.execute_script(PAGE_HTML_JS)
+
+    def text_nodes(self, driver):
+        """Returns (text, link, block id) for every visible text node, in one round trip."""
+        return [tuple(node) for node in json.loads(driver.execute_script(TEXT_NODES_JS))]
+
+    def _read_rows(self, table):
+        # One lookup per row keeps the cells in document order, so a th row header stays in its column.
+        return [[Cell(cell.text.strip(), cell.tag_name.lower() == "th", 1, 1)
+                 for cell in row.find_elements(By.XPATH, ".//th|.//td")]
+                for row in table.find_elements(By.XPATH, ".//tr")]
+
+    def iter_tables(self, driver, skip=()):
+        """Yields a ``RawTable`` for every table on the page whose index is not in ``skip``, as it is read."""
+        for idx, table in enumerate(driver.find_elements(By.XPATH, "//table")):
+            if idx in skip:
+                continue
+            raw = None
+            for attempt in range(self.retries + 1):
+                try:
+                    if attempt:
+                        time.sleep(self.retry_delay * 2 ** (attempt - 1))
+                        table = driver.find_element(By.XPATH, f"(//table)[{idx + 1}]")
+                    raw = RawTable(idx, self._read_rows(table))
+                except WebDriverException as e:
+                    if attempt == self.retries:
+                        print(f"⚠ Error extracting table {idx+1}: {e}")
+                    continue
+                except Exception as e:
+                    print(f"⚠ Error extracting table {idx+1}: {e}")
+                    break
+                break
+            if raw is not None:
+                yield raw
+
+    def extract_tables(self, driver, skip=(), on_table=None):
+        """Returns a ``RawTable`` for every table on the page whose index is not in ``skip``.
+
+        Each table is passed to ``on_table`` as soon as it has been read.
+        """
+        return select_tables(self.iter_tables(driver, skip), on_table=on_table)
+
+
+# Serializes every table in one go. Hidden cells report an empty string, the
+# same as WebElement.text does for elements that are not displayed.
+EXTRACT_TABLES_JS = """
+var out = [];
+var tables = document.querySelectorAll('table');
+for (var t = 0; t < tables.length; t++) {
+    var rows = tables[t].querySelectorAll('tr');
+    var rowsOut = [];
+    for (var r = 0; r < rows.length; r++) {
+        var cells = rows[r].querySelectorAll('th, td');
+        var cellsOut = [];
+        for (var c = 0; c < cells.length; c++) {
+            var cell = cells[c];
+            var text = cell.getClientRects().length ? cell.innerText : '';
+            cellsOut.push([text, cell.tagName === 'TH' ? 1 : 0, cell.rowSpan || 1, cell.colSpan || 1]);
+        }
+        rowsOut.push(cellsOut);
+    }
+    out.push(rowsOut);
+}
+return JSON.stringify(out);
+"""
+
+
+class ScriptTableEngine:
+    """Serializes all tables inside the browser with a single ``execute_script`` call."""
+    name = "script"
+    needs_browser = True
+
+    def open(self, driver, url):
+        """Loads ``url`` in the browser."""
+        driver.get(url)
+
+    def page_text(self, driver):
+        """Returns the rendered text of the whole page."""
+        return driver.execute_script(PAGE_TEXT_JS)
+
+    def page_html(self, driver):
+        """Returns the current (post-JS, expanded) DOM serialized as HTML."""
+        return driver.execute_script(PAGE_HTML_JS)
+
+    def text_nodes(self, driver):
+        """Returns (text, link, block id) for every visible text node, in one round trip."""
+        return [tuple(node) for node in json.loads(driver.execute_script(TEXT_NODES_JS))]
+
+    def iter_tables(self, driver, skip=()):
+        """Yields a ``RawTable`` for every table on the page whose index is not in ``skip``.
+
+        The page comes back in one payload; each table's part of it is dropped once it has been converted.
+        """
+        payload = json.loads(driver.execute_script(EXTRACT_TABLES_JS))
+        for idx in range(len(payload)):
+            rows, payload[idx] = payload[idx], None
+            if idx not in skip:
+                yield _table_from_payload(idx, rows)
+
+    def extract_tables(self, driver, skip=(), on_table=None):
+        """Returns a ``RawTable`` for every table on the page whose index is not in ``skip``."""
+        return select_tables(self.iter_tables(driver, skip), on_table=on_table)
+
+
+def _table_from_payload(idx, rows, spans=True):
+    return RawTable(idx, [
+        [Cell(text.strip(), bool(header), rowspan if spans else 1, colspan if spans else 1)
+         for text, header, rowspan, colspan in row]
+        for row in rows
+    ])
+
+
+def tables_from_payload(payload):
+    """Builds ``RawTable`` objects from the JSON payload of ``EXTRACT_TABLES_JS``."""
+    return [_table_from_payload(idx, rows) for idx, rows in enumerate(payload)]
+
+
+# The headings, paragraphs and list items the browser path of text extraction reads, as
+# WebElement.text would give them (empty, and so skipped, when not displayed).
+TEXT_BLOCKS_JS = """
+var out = [];
+var elements = document.querySelectorAll('h1, h2, h3, h4, h5, h6, p, li, pre, code');
+for (var i = 0; i < elements.length; i++) {
+    var el = elements[i];
+    var text = el.getClientRects().length ? el.innerText.trim() : '';
+    if (text) {
+        out.push({tag: el.tagName.toLowerCase(), text: text});
+    }
+}
+return out;
+"""
+
+# Everything the browser engines read from a page, in one round trip, for ``RenderedPageEngine``.
+RENDERED_PAGE_JS = """
+return JSON.stringify({
+    text: (function () { %s })(),
+    tables: JSON.parse((function () { %s })()),
+    text_nodes: JSON.parse((function () { %s })()),
+    blocks: (function () { %s })()
+});
+""" % (PAGE_TEXT_JS, EXTRACT_TABLES_JS, TEXT_NODES_JS, TEXT_BLOCKS_JS)
+
+
+def render_page(driver, engine_name):
+    """Returns what the browser renders for the current page, as JSON for ``RenderedPageEngine``."""
+    rendered = json.loads(driver.execute_script(RENDERED_PAGE_JS))
+    rendered["engine"] = engine_name
+    return json.dumps(rendered)
+
+
+class RenderedPageEngine:
+    """Replays a page from what the browser rendered for it (see ``render_page``), without a browser.
+
+    Text, table cells and text nodes are the browser's own ``innerText``, so
+    content hidden by stylesheets or scripts stays out of a replay just as it
+    did in the live run. Used by ``common.runner.replay_sites`` for snapshots
+    of the "script" and "webdriver" engines.
+    """
+    name = "rendered"
+    needs_browser = False
+
+    def __init__(self):
+        self.rendered = None
+        self.url = ""
+
+    def open(self, driver, url):
+        raise ValueError("The 'rendered' engine only replays stored snapshots")
+
+    def load(self, url, page_source):
+        """Uses a stored rendering (the JSON of ``render_page``) of ``url``."""
+        self.rendered = json.loads(page_source)
+        self.url = url
+
+    def page_text(self, driver):
+        """Returns the rendered text of the whole page."""
+        return self.rendered["text"]
+
+    def text_nodes(self, driver):
+        """Returns (text, link, block id) for every visible text node."""
+        return [tuple(node) for node in self.rendered["text_nodes"]]
+
+    def text_blocks(self, driver):
+        """Returns ``{"tag", "text"}`` for every displayed heading, paragraph and list item."""
+        return list(self.rendered["blocks"])
+
+    def iter_tables(self, driver, skip=()):
+        """Yields a ``RawTable`` for every rendered table whose index is not in ``skip``."""
+        # The webdriver engine reads every cell with a span of 1.
+        spans = self.rendered.get("engine") != WebDriverTableEngine.name
+        for idx, rows in enumerate(self.rendered["tables"]):
+            if idx not in skip:
+                yield _table_from_payload(idx, rows, spans)
+
+    def extract_tables(self, driver, skip=(), on_table=None):
+        """Returns a ``RawTable`` for every rendered table whose index is not in ``skip``."""
+        return select_tables(self.iter_tables(driver, skip), on_table=on_table)
+
+
+class PageSourceEngine:
+    """Renders and expands the page in the browser, then parses one snapshot of its DOM.
+
+    The DOM is taken once, on the first call after the page was opened; from then
+    on the browser is not used, so the scraper can hand it back to the pool while
+    the tables are parsed with lxml over worker processes.
+    """
+    name = "page_source"
+    needs_browser = True
+
+    def __init__(self):
+        self.page_source = None
+        self.url = ""
+
+    def open(self, driver, url):
+        """Loads ``url`` in the browser."""
+        self.page_source = None
+        self.url = url
+        driver.get(url)
+
+    def detach(self, driver):
+        """Takes the current DOM (once) and returns it; ``driver`` is not needed afterwards."""
+        if self.page_source is None:
+            self.page_source = driver.execute_script(PAGE_HTML_JS)
+        return self.page_source
+
+    def page_text(self, driver):
+        """Returns the visible text of the DOM snapshot."""
+        document = lxml_html.fromstring(self.detach(driver))
+        body = document.find("body")
+        return visible_text(body if body is not None else document)
+
+    def page_html(self, driver):
+        """Returns the DOM snapshot."""
+        return self.detach(driver)
+
+    def text_nodes(self, driver):
+        """Returns (text, link, block id) for every visible text node of the DOM snapshot."""
+        return parse_text_nodes(self.detach(driver), self.url)
+
+    def iter_tables(self, driver, skip=()):
+        """Yields a ``RawTable`` for every table of the DOM snapshot whose index is not in ``skip``."""
+        return (table for table in iter_tables_parallel(self.detach(driver)) if table.index not in skip)
+
+    def extract_tables(self, driver, skip=(), on_table=None):
+        """Returns a ``RawTable`` for every table of the DOM snapshot whose index is not in ``skip``."""
+        return select_tables(self.iter_tables(driver, skip), on_table=on_table)
+
+
+ENGINES = {
+    WebDriverTableEngine.name: WebDriverTableEngine,
+    ScriptTableEngine.name: ScriptTableEngine,
+    StaticHtmlEngine.name: StaticHtmlEngine,
+    PageSourceEngine.name: PageSourceEngine,
+    RenderedPageEngine.name: RenderedPageEngine,
+}
+
+
+def get_engine(name):
+    """Returns an extraction engine instance by name ("script", "webdriver", "static", "page_source" or "rendered")."""
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown extraction engine '{name}', expected one of {sorted(ENGINES)}")
@@ -0,0 +1,181 @@
+"""Asyncio HTTP fetch layer shared by the static sources and the API clients.
+
+``AsyncFetcher`` downloads many pages in parallel while staying polite to
+each server:
+
+    - one keep-alive ``requests.Session`` per host, its connection pool sized
+      to the per-host limit, so connections are reused across requests;
+    - a global concurrency cap and a per-host one;
+    - a token-bucket rate limit per domain (``rate`` requests per second,
+      overridable per host with ``host_rates``);
+    - retries with jittered exponential backoff on connection errors,
+      timeouts and 429/5xx answers (``Retry-After`` is honoured).
+
+The blocking ``requests`` calls run on a bounded thread pool behind the
+asyncio API, so no extra HTTP client library is needed.
+
+Usage:
+    pages = fetch_many(urls, rate=5)           # {url: FetchResponse or exception}
+
+    async with AsyncFetcher(rate=5) as fetcher:
+        responses = await fetcher.fetch_all(urls)
+"""
+import asyncio
+import functools
+import json
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.static import USER_AGENT
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class FetchResponse(namedtuple("FetchResponse", ["url", "status", "headers", "text"])):
+    """Status, headers and body of a finished request (``status`` is 200 or 304 on success)."""
+    __slots__ = ()
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, with bursts of up to ``burst``."""
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """Concurrent, rate-limited GET requests over per-host keep-alive connection pools.
+
+    concurrency  -- requests in flight over all hosts
+    per_host     -- requests in flight (and pooled connections) per host
+    rate, burst  -- token bucket per host; None disables rate limiting
+    host_rates   -- {host: rate} overrides of ``rate``
+    retries      -- extra attempts after a retryable failure
+    backoff      -- base delay in seconds; attempt n waits up to backoff * 2**n (capped at max_backoff)
+    """
+    def __init__(self, concurrency=16, per_host=4, rate=None, burst=1, host_rates=None,
+                 retries=3, backoff=0.5, max_backoff=10.0, timeout=30, headers=None):
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch")
+        self.limit = asyncio.Semaphore(concurrency)
+        self.sessions = {}
+        self.host_limits = {}
+        self.buckets = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def _session(self, host):
+        if host not in self.sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(self.headers)
+            self.sessions[host] = session
+            self.host_limits[host] = asyncio.Semaphore(self.per_host)
+            rate = self.host_rates.get(host, self.rate)
+            self.buckets[host] = TokenBucket(rate, self.burst) if rate else None
+        return self.sessions[host]
+
+    def _delay(self, attempt, response):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.max_backoff))
+        return delay
+
+    async def fetch(self, url, headers=None):
+        """GETs ``url`` and returns a ``FetchResponse``.
+
+        Raises ``requests.RequestException`` once the retries are used up or
+        on a non-retryable error status; 304 answers are returned, not raised.
+        """
+        loop = asyncio.get_running_loop()
+        if url.startswith("file://"):
+            with open(url[len("file://"):], encoding="utf-8") as f:
+                return FetchResponse(url, 200, {}, f.read())
+        host = urlsplit(url).hostname or ""
+        session = self._session(host)
+        get = functools.partial(session.get, url, headers=headers, timeout=self.timeout)
+        for attempt in range(self.retries + 1):
+            if self.buckets[host]:
+                await self.buckets[host].acquire()
+            response = None
+            try:
+                async with self.limit, self.host_limits[host]:
+                    response = await loop.run_in_executor(self.executor, get)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if response is not None:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return FetchResponse(url, response.status_code, response.headers, response.text)
+                error = requests.HTTPError(f"{response.status_code} Server Error for url: {url}", response=response)
+            if attempt == self.retries:
+                raise error
+            await asyncio.sleep(self._delay(attempt, response))
+
+    async def fetch_all(self, urls, headers_for=None):
+        """Fetches every URL concurrently; failed URLs get their exception instead of a response."""
+        headers_for = headers_for or {}
+        return await asyncio.gather(*(self.fetch(url, headers_for.get(url)) for url in urls),
+                                    return_exceptions=True)
+
+    def close(self):
+        """Closes the pooled connections and the worker threads."""
+        for session in self.sessions.values():
+            session.close()
+        self.sessions = {}
+        self.executor.shutdown(wait=False)
+
+
+def fetch_many(urls, headers_for=None, **options):
+    """Blocking helper: fetches ``urls`` concurrently and returns {url: FetchResponse or exception}.
+
+    Duplicate URLs are only requested once. ``options`` are passed to ``AsyncFetcher``.
+    """
+    urls = list(dict.fromkeys(urls))
+
+    async def run():
+        async with AsyncFetcher(**options) as fetcher:
+            return await fetcher.fetch_all(urls, headers_for)
+
+    return dict(zip(urls, asyncio.run(run())))
@@ -0,0 +1,99 @@
+"""Per-table checkpoints of a page extraction, so a retried run resumes where it stopped.
+
+Used by the "webdriver" engine, which reads a page table by table over many
+round trips. Every table is appended to a journal as soon as it has been read
+from the page, and a last line marks the page as fully read; the journal is
+removed once the outputs are saved. When a run dies half way (a crash, a
+killed worker, a browser that went away), the next run of the same URL
+replays the tables already in the journal and only reads the remaining ones
+from the page. If every table had been read, the page is not opened at all::
+
+    <output>/.journal/<site>.jsonl
+        {"url": ..., "started": ...}                                   first line
+        {"table": 3, "rows": [[[text, header, rowspan, colspan], ...], ...]}
+        {"complete": 12}                                               every table read
+
+Journals older than ``max_age`` seconds are ignored, so an old crash never
+resurrects stale tables.
+"""
+import json
+import os
+import time
+
+from common.tables import Cell, RawTable
+
+
+JOURNAL_DIR = ".journal"
+
+
+class TableJournal:
+    """Append-only journal of the tables read from one site's page."""
+    def __init__(self, folder, name, max_age=3600):
+        self.path = os.path.join(folder, f"{name}.jsonl")
+        self.max_age = max_age
+        self.complete = False
+        self._file = None
+
+    def _read(self, url):
+        tables = {}
+        self.complete = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("url") != url or time.time() - header.get("started", 0) > self.max_age:
+                    return {}
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # the line being written when the run died
+                    if "complete" in entry:
+                        self.complete = entry["complete"] == len(tables)
+                        break
+                    tables[entry["table"]] = RawTable(entry["table"], [[Cell(*cell) for cell in row]
+                                                                       for row in entry["rows"]])
+        except (OSError, ValueError):
+            return {}
+        return tables
+
+    def resume(self, url):
+        """Returns {index: RawTable} recorded for ``url`` by an interrupted run and keeps appending to it.
+
+        Starts a new journal when there is nothing to resume. ``complete`` tells
+        whether that run had read every table of the page.
+        """
+        self.close()
+        tables = self._read(url)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if tables:
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write({"url": url, "started": time.time()})
+        return tables
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Flushed per table: a dying process keeps everything written so far.
+        self._file.flush()
+
+    def record(self, table):
+        """Appends one table read from the page."""
+        self._write({"table": table.index, "rows": [[list(cell) for cell in row] for row in table.rows]})
+
+    def finish(self, count):
+        """Marks the page as fully read, with ``count`` tables."""
+        if not self.complete:
+            self._write({"complete": count})
+            self.complete = True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """Removes the journal once the outputs are saved."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
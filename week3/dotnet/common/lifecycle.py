@@ -0,0 +1,317 @@
+"""SQLite lifecycle database: products, releases, builds and support end dates.
+
+Sites with the "sqlite" output format upsert every table row that holds a
+version into one database shared by all sites (``<output>/lifecycle.db``)::
+
+    products        (id, name)
+    sources         (id, site, url)
+    releases        (id, product_id, version, version_key, release_date, source_id, scraped)
+    builds          (id, release_id, build, build_key, date)
+    support_dates   (release_id, kind, end_date)      kind: "mainstream end date", ...
+
+``version_key`` is ``parse_version``'s sort key encoded as text, so versions
+sort correctly in SQL. Product, version key and end date are indexed, so
+questions such as "what goes out of support in the next 90 days" are one
+indexed query instead of loading every CSV::
+
+    python -m common.lifecycle expiring --days 90
+    python -m common.lifecycle latest windows_server
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sqlite3
+
+from common.schemas import normalize_header
+from common.versions import VERSION_COLUMN_RE, find_version, parse_version
+
+
+DB_FILE = "lifecycle.db"
+ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+){0,3}\b")
+END_COLUMN_RE = re.compile(r"\bend\b|retire|\beol\b|end of|expir", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS releases (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    version TEXT NOT NULL,
+    version_key TEXT NOT NULL,
+    release_date TEXT,
+    source_id INTEGER REFERENCES sources(id),
+    scraped TEXT NOT NULL,
+    UNIQUE (product_id, version)
+);
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    release_id INTEGER NOT NULL REFERENCES releases(id),
+    build TEXT NOT NULL,
+    build_key TEXT NOT NULL,
+    date TEXT,
+    UNIQUE (release_id, build)
+);
+CREATE TABLE IF NOT EXISTS support_dates (
+    release_id INTEGER NOT NULL REFERENCES releases(id),
+    kind TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    PRIMARY KEY (release_id, kind)
+);
+CREATE INDEX IF NOT EXISTS releases_product_key ON releases (product_id, version_key);
+CREATE INDEX IF NOT EXISTS builds_key ON builds (release_id, build_key);
+CREATE INDEX IF NOT EXISTS support_end_date ON support_dates (end_date);
+"""
+
+UPSERT_RELEASE = """
+INSERT INTO releases (product_id, version, version_key, release_date, source_id, scraped)
+VALUES ((SELECT id FROM products WHERE name = ?), ?, ?, ?, (SELECT id FROM sources WHERE url = ?), ?)
+ON CONFLICT (product_id, version) DO UPDATE SET
+    version_key = MIN(releases.version_key, excluded.version_key),
+    release_date = MIN(COALESCE(releases.release_date, excluded.release_date),
+                       COALESCE(excluded.release_date, releases.release_date)),
+    source_id = excluded.source_id,
+    scraped = excluded.scraped
+"""
+RELEASE_ID = "(SELECT r.id FROM releases r JOIN products p ON p.id = r.product_id WHERE p.name = ? AND r.version = ?)"
+UPSERT_BUILD = f"""
+INSERT INTO builds (release_id, build, build_key, date) VALUES ({RELEASE_ID}, ?, ?, ?)
+ON CONFLICT (release_id, build) DO UPDATE SET date = COALESCE(excluded.date, builds.date)
+"""
+UPSERT_SUPPORT = f"""
+INSERT INTO support_dates (release_id, kind, end_date) VALUES ({RELEASE_ID}, ?, ?)
+ON CONFLICT (release_id, kind) DO UPDATE SET end_date = excluded.end_date
+"""
+
+
+def version_sort_key(version):
+    """Encodes a parsed ``Version``'s key as text that sorts like the key itself.
+
+    Numbers are zero-padded; a space ends the dotted part so "8.0" sorts before
+    "8.0.1", and "0" (pre-release) sorts before "1" (release).
+    """
+    numbers, release, build = version.key
+    text = ".".join(f"{n:010d}" for n in numbers) + " "
+    if release == (1,):
+        text += "1"
+    else:
+        text += "0" + ".".join(f"{n:010d}" if kind == 0 else f"~{part}" for kind, n, part in release[1])
+    return f"{text} {build:010d}"
+
+
+def connect(path):
+    """Opens (and creates, if needed) the lifecycle database in WAL mode."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    # isolation_level=None: transactions are started explicitly, one per scrape.
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def parse_release_version(text):
+    """Parses a release's version cell; also accepts names such as "Oracle Linux 9" or ".NET 8.0"."""
+    number = NUMBER_RE.search(text)
+    return parse_version(text) or find_version(text) or (parse_version(number.group(0)) if number else None)
+
+
+def _columns(columns, version_columns=None):
+    """Picks the version, build, release date and support end date columns of a table."""
+    names = {col: normalize_header(col) for col in columns}
+    dates = [col for col in columns if "date" in names[col].lower() or END_COLUMN_RE.search(names[col])]
+    ends = [col for col in dates if END_COLUMN_RE.search(names[col])]
+    builds = [col for col in columns if "build" in names[col].lower() and col not in dates]
+    versions = list(version_columns or [col for col in columns if VERSION_COLUMN_RE.search(names[col])
+                                        and col not in dates and col not in builds])
+    released = next((col for col in dates if col not in ends), None)
+    return versions, builds[0] if builds else None, released, ends
+
+
+class LifecycleSink:
+    """Collects the lifecycle rows of one scrape and upserts them in one transaction on ``close()``.
+
+    Only the releases (one per version, merged across tables) stay in memory;
+    build and support-date rows are spooled to disk next to the database as the
+    tables stream in. The database is only locked for the final batch of
+    ``executemany`` calls, which read the spool back.
+    """
+    def __init__(self, path, site, scrape_date=None):
+        self.path = path
+        self.site = site
+        self.scrape_date = scrape_date or datetime.date.today().isoformat()
+        self.product_column = site.index.get("product_column")
+        self.version_columns = site.index.get("version_columns")
+        self.releases = {}  # (product, version) -> release row
+        self.spool_path = f"{path}.{site.name}.spool"
+        self.spool = None
+        self.counts = {"build": 0, "support": 0}
+        self.paths = []
+        self.rows = 0
+        self.tables = 0
+
+    def _spool_row(self, kind, row):
+        if self.spool is None:
+            os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+            self.spool = open(self.spool_path, "w", encoding="utf-8")
+        self.spool.write(json.dumps([kind, *row], ensure_ascii=False) + "\n")
+        self.counts[kind] += 1
+
+    def _spooled(self, kind):
+        if not self.counts[kind]:
+            return
+        with open(self.spool_path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry[0] == kind:
+                    yield tuple(entry[1:])
+
+    def write(self, table_index, header, df):
+        """Turns the rows of ``df`` that hold a version into release, build and support rows."""
+        columns = list(df.columns)
+        versions, build_column, released, ends = _columns(columns, self.version_columns)
+        positions = {col: i for i, col in enumerate(columns)}
+        for row in df.astype(str).itertuples(index=False, name=None):
+            cells = {col: row[positions[col]].strip() for col in columns}
+            build = parse_version(cells[build_column]) if build_column else None
+            version = next((cells[col] for col in versions if cells.get(col)), "")
+            if not version:
+                if build is None:
+                    continue
+                version = build.raw
+            parsed = parse_release_version(version) or build
+            if parsed is None:
+                continue
+            product = f"{self.site.name} {cells[self.product_column]}".strip() if self.product_column \
+                else self.site.name
+            date = cells[released] if released and ISO_DATE_RE.match(cells[released]) else None
+            url = cells.get("URL") or self.site.url
+            release = self.releases.get((product, version))
+            if release is None:
+                self.releases[product, version] = [product, version, version_sort_key(parsed), date, url,
+                                                   self.scrape_date]
+            else:
+                # A release listed with several builds keeps its earliest key and date.
+                release[2] = min(release[2], version_sort_key(parsed))
+                release[3] = min(filter(None, (release[3], date)), default=None)
+            if build is not None:
+                self._spool_row("build", (product, version, build.raw, version_sort_key(build), date))
+            for col in ends:
+                if ISO_DATE_RE.match(cells[col]):
+                    self._spool_row("support", (product, version, normalize_header(col).lower(), cells[col]))
+        self.rows += len(df)
+        self.tables += 1
+
+    def close(self):
+        """Upserts the collected rows in a single transaction; returns the rows seen."""
+        if self.spool is not None:
+            self.spool.close()
+        conn = connect(self.path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR IGNORE INTO products (name) VALUES (?)",
+                                 sorted({(product,) for product, _ in self.releases}))
+                conn.executemany("INSERT INTO sources (site, url) VALUES (?, ?) ON CONFLICT (url) DO NOTHING",
+                                 sorted({(self.site.name, r[4]) for r in self.releases.values()}))
+                conn.executemany(UPSERT_RELEASE, [tuple(r) for r in self.releases.values()])
+                conn.executemany(UPSERT_BUILD, self._spooled("build"))
+                conn.executemany(UPSERT_SUPPORT, self._spooled("support"))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+            self._drop_spool()
+        self.paths.append(self.path)
+        print(f"Lifecycle: {len(self.releases)} releases, {self.counts['build']} builds and "
+              f"{self.counts['support']} support dates saved to '{self.path}'.")
+        return self.rows
+
+    def abort(self):
+        """Drops the spooled rows; the database is left as it was."""
+        self._drop_spool()
+
+    def _drop_spool(self):
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        if os.path.exists(self.spool_path):
+            os.remove(self.spool_path)
+
+
+class LifecycleDB:
+    """Read-only queries over the lifecycle database."""
+    def __init__(self, path):
+        self.conn = connect(path)
+
+    def close(self):
+        self.conn.close()
+
+    def has_site(self, site):
+        """Whether a scrape of the site named ``site`` has stored releases."""
+        return self.conn.execute("SELECT 1 FROM sources WHERE site = ? LIMIT 1", (site,)).fetchone() is not None
+
+    def products(self):
+        """Returns the product names."""
+        return [name for (name,) in self.conn.execute("SELECT name FROM products ORDER BY name")]
+
+    def expiring(self, days=90, today=None):
+        """(product, version, kind, end date) rows whose support ends within ``days`` of ``today``."""
+        start = today or datetime.date.today()
+        return self.conn.execute(
+            "SELECT p.name, r.version, s.kind, s.end_date FROM support_dates s "
+            "JOIN releases r ON r.id = s.release_id JOIN products p ON p.id = r.product_id "
+            "WHERE s.end_date >= ? AND s.end_date <= ? ORDER BY s.end_date, p.name, r.version",
+            (start.isoformat(), (start + datetime.timedelta(days=days)).isoformat())).fetchall()
+
+    def latest(self, product):
+        """(version, release date, latest build) of the newest release of ``product``, or None."""
+        return self.conn.execute(
+            "SELECT r.version, r.release_date, "
+            "(SELECT b.build FROM builds b WHERE b.release_id = r.id ORDER BY b.build_key DESC LIMIT 1) "
+            "FROM releases r JOIN products p ON p.id = r.product_id WHERE p.name = ? "
+            "ORDER BY r.version_key DESC LIMIT 1", (product,)).fetchone()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the lifecycle database.")
+    parser.add_argument("--db", default=os.path.join("output", DB_FILE))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("products")
+    expiring = sub.add_parser("expiring")
+    expiring.add_argument("--days", type=int, default=90)
+    latest = sub.add_parser("latest")
+    latest.add_argument("product")
+    args = parser.parse_args(argv)
+
+    db = LifecycleDB(args.db)
+    try:
+        if args.command == "products":
+            print("\n".join(db.products()))
+        elif args.command == "expiring":
+            for product, version, kind, end_date in db.expiring(args.days):
+                print(f"{end_date}  {product:<30} {version:<20} {kind}")
+        else:
+            row = db.latest(args.product)
+            if row:
+                version, release_date, build = row
+                print(f"{args.product:<30} {version:<20} {release_date or '':<12} {build or ''}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
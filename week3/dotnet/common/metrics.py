@@ -0,0 +1,90 @@
+"""Structured logs and Prometheus metrics of scrape runs.
+
+Every scrape result carries the seconds spent in each phase (driver_acquire,
+navigation, expansion, extract_*, normalisation, save) and its counters
+(tables found, rows, cells, WebDriver calls, bytes written). Collecting them
+costs a few ``perf_counter`` calls and dict updates per page; nothing is
+written unless a ``RunMetrics`` is used, e.g. with ``python -m common
+--metrics-dir output/metrics``, which writes:
+
+    <folder>/run-<run id>.jsonl   one JSON object per site and one for the run
+    <folder>/scraper.prom         Prometheus textfile-collector format, replaced each run
+"""
+import datetime
+import json
+import os
+
+
+PROM_FILE = "scraper.prom"
+
+COUNTER_HELP = {
+    "tables_found": "Tables found on the page.",
+    "rows": "Rows written.",
+    "cells": "Table cells written.",
+    "webdriver_calls": "WebDriver round trips (browser calls under Playwright).",
+    "bytes_written": "Bytes of output files written.",
+}
+
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunMetrics:
+    """Writes the JSON log and the Prometheus metrics of one run to ``folder``."""
+    def __init__(self, folder, run_id=None):
+        self.folder = folder
+        self.run_id = run_id or _utc_now().strftime("%Y%m%dT%H%M%SZ")
+        self.log_path = os.path.join(folder, f"run-{self.run_id}.jsonl")
+        self.prom_path = os.path.join(folder, PROM_FILE)
+        os.makedirs(folder, exist_ok=True)
+
+    def log(self, event, **fields):
+        """Appends one structured event to the run's JSON log."""
+        record = {"ts": _utc_now().isoformat(timespec="milliseconds"), "run": self.run_id, "event": event, **fields}
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def record_run(self, results, total_seconds):
+        """Logs every site result and the run summary, then writes the Prometheus file."""
+        for r in results:
+            self.log("site", **{key: value for key, value in r.items() if key != "cache_entry"})
+        self.log("run", sites=len(results), ok=sum(1 for r in results if r["ok"]), seconds=total_seconds)
+        self.write_prometheus(results, total_seconds)
+
+    def write_prometheus(self, results, total_seconds):
+        """Writes the metrics of the run atomically, as the textfile collector expects."""
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric("scraper_phase_seconds", "Seconds spent in each scrape phase.",
+               [({"site": r["site"], "phase": phase}, f"{seconds:.6f}")
+                for r in results for phase, seconds in sorted(r["phases"].items())])
+        metric("scraper_site_seconds", "Total seconds spent on the site.",
+               [({"site": r["site"]}, f"{r['seconds']:.6f}") for r in results])
+        metric("scraper_site_success", "1 if the site was scraped (or skipped as unchanged), else 0.",
+               [({"site": r["site"], "cache": r["cache"]}, int(r["ok"])) for r in results])
+        for counter, help_text in COUNTER_HELP.items():
+            metric(f"scraper_{counter}", help_text,
+                   [({"site": r["site"]}, r["counters"][counter]) for r in results if counter in r["counters"]])
+        metric("scraper_page_load_milliseconds", "Browser page load time.",
+               [({"site": r["site"]}, r["load_ms"]) for r in results if r["load_ms"] is not None])
+        metric("scraper_bytes_transferred", "Bytes downloaded for the page.",
+               [({"site": r["site"]}, r["bytes"]) for r in results if r["bytes"] is not None])
+        metric("scraper_run_seconds", "Duration of the whole run.", [({}, f"{total_seconds:.6f}")])
+        metric("scraper_run_timestamp_seconds", "Unix time the run finished.", [({}, f"{_utc_now().timestamp():.0f}")])
+
+        tmp_path = self.prom_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prom_path)
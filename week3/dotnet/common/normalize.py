@@ -0,0 +1,90 @@
+"""Column-level date normalisation for extracted tables.
+
+Instead of trying every date format on every cell, each column is sampled to
+decide whether it holds dates and in which format, then the whole column is
+converted at once with ``pd.to_datetime``. Cells the chosen format does not
+cover fall back to a memoized per-value parse. All dates come out as ISO
+``YYYY-MM-DD`` for every site.
+"""
+import datetime
+from functools import lru_cache
+
+import pandas as pd
+
+
+DATE_OUTPUT = "%Y-%m-%d"
+
+# Formats seen on the scraped sites, tried in this order.
+DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y")
+
+
+@lru_cache(maxsize=65536)
+def format_date(text, formats=DATE_FORMATS):
+    """Returns ``text`` as an ISO date if one of ``formats`` matches, else unchanged."""
+    for fmt in formats:
+        try:
+            return datetime.datetime.strptime(text, fmt).strftime(DATE_OUTPUT)
+        except ValueError:
+            continue
+    return text
+
+
+def infer_date_formats(values, formats=DATE_FORMATS, threshold=0.6):
+    """Returns the formats seen in ``values``, most common first.
+
+    The list is empty unless together they match at least ``threshold`` of the values.
+    """
+    if len(values) == 0:
+        return []
+    covered = pd.Series(False, index=values.index)
+    matches = []
+    for fmt in formats:
+        matched = pd.to_datetime(values, format=fmt, errors="coerce").notna()
+        if matched.any():
+            matches.append((int(matched.sum()), fmt))
+            covered |= matched
+    if covered.mean() < threshold:
+        return []
+    return [fmt for _, fmt in sorted(matches, key=lambda m: -m[0])]
+
+
+def _looks_like_date(value):
+    # Cheap pre-filter: dates always contain a digit and are short.
+    return 6 <= len(value) <= 20 and any(ch.isdigit() for ch in value)
+
+
+def normalize_column(series, formats=DATE_FORMATS, sample_size=20, threshold=0.6):
+    """Returns the column with its dates converted to ISO, or the column unchanged."""
+    text = series.astype("string").str.strip().fillna("").to_numpy(dtype=object)
+    filled = text[text != ""]
+    sample = pd.Series(filled[:sample_size], dtype=object)
+    if sample.empty or sample.map(_looks_like_date).mean() < threshold:
+        return series
+    column_formats = infer_date_formats(sample, formats, threshold)
+    if not column_formats:
+        return series
+
+    result = series.to_numpy(dtype=object).copy()
+    remaining = text != ""
+    for fmt in column_formats:
+        parsed = pd.to_datetime(pd.Series(text[remaining], dtype=object), format=fmt, errors="coerce")
+        ok = parsed.notna().to_numpy()
+        positions = remaining.nonzero()[0]
+        result[positions[ok]] = parsed[ok].dt.strftime(DATE_OUTPUT).to_numpy(dtype=object)
+        remaining[positions[ok]] = False
+        if not remaining.any():
+            break
+    # Mixed columns: whatever the sampled formats missed gets the memoized fallback.
+    for position in remaining.nonzero()[0]:
+        result[position] = format_date(text[position], formats)
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def normalize_dates(df, formats=DATE_FORMATS, sample_size=20, threshold=0.6):
+    """Normalises every date column of ``df`` in place and returns it."""
+    if not formats:
+        return df
+    formats = tuple(formats)
+    for position in range(df.shape[1]):
+        df.isetitem(position, normalize_column(df.iloc[:, position], formats, sample_size, threshold))
+    return df
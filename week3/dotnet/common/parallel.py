@@ -0,0 +1,100 @@
+"""Parses the tables of one page snapshot in worker processes.
+
+Reading cells with lxml is pure Python per cell (``visible_text``), so a page
+with hundreds of tables keeps one core busy. ``parse_tables_parallel`` cuts
+the document into one HTML fragment per ``<table>``, hands disjoint groups of
+fragments to a shared ``ProcessPoolExecutor`` and gets compact row arrays
+back, in the same ``RawTable`` form the other engines return.
+
+Used by the "page_source" engine, which renders and expands the page in the
+browser, takes the DOM once and then lets the browser go while the tables are
+parsed (see ``common.extraction.PageSourceEngine``).
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from common.static import _span, visible_text
+from common.tables import Cell, RawTable
+
+
+# Below this many tables the pool costs more than it saves.
+MIN_PARALLEL_TABLES = 16
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(workers=None):
+    """The shared parse pool, started on first use and shut down at exit."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: the scraper runs threads, which fork() does not copy safely.
+            _executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                            mp_context=get_context("spawn"))
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
+def split_tables(page_html):
+    """Returns the HTML of every ``<table>`` of the document, in document order."""
+    document = lxml_html.fromstring(page_html)
+    return [etree.tostring(table, encoding="unicode", with_tail=False) for table in document.iter("table")]
+
+
+def parse_fragments(fragments):
+    """Parses table fragments into [table][row][cell] = (text, is header, rowspan, colspan)."""
+    tables = []
+    for fragment in fragments:
+        table = lxml_html.fragment_fromstring(fragment)
+        tables.append([[(visible_text(cell), cell.tag == "th", _span(cell, "rowspan"), _span(cell, "colspan"))
+                        for cell in row.iter("th", "td")]
+                       for row in table.iter("tr")])
+    return tables
+
+
+def _chunks(fragments, count):
+    # Contiguous groups of about the same amount of HTML, so no worker gets all the big tables.
+    target = sum(len(f) for f in fragments) / count
+    chunks, current, size = [], [], 0
+    for fragment in fragments:
+        current.append(fragment)
+        size += len(fragment)
+        if size >= target:
+            chunks.append(current)
+            current, size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def iter_tables_parallel(page_html, executor=None, min_tables=MIN_PARALLEL_TABLES):
+    """Yields a ``RawTable`` for every ``<table>`` of ``page_html``, parsed over worker processes.
+
+    Tables come out in document order as the workers finish their groups, so
+    only the groups not consumed yet are held. Small pages (and single-core
+    machines) are parsed in this process unless an ``executor`` is given.
+    """
+    fragments = split_tables(page_html)
+    workers = os.cpu_count() or 1
+    if executor is None and (len(fragments) < min_tables or workers == 1):
+        parsed = map(parse_fragments, ([fragment] for fragment in fragments))
+    else:
+        executor = executor or get_executor()
+        parsed = executor.map(parse_fragments, _chunks(fragments, workers * 2))
+    idx = 0
+    for chunk in parsed:
+        for rows in chunk:
+            yield RawTable(idx, [[Cell(*cell) for cell in row] for row in rows])
+            idx += 1
+
+
+def parse_tables_parallel(page_html, executor=None, min_tables=MIN_PARALLEL_TABLES):
+    """Parses every ``<table>`` of ``page_html`` into ``RawTable`` objects, over worker processes."""
+    return list(iter_tables_parallel(page_html, executor, min_tables))
@@ -0,0 +1,155 @@
+"""Playwright backend: one Chromium process shared by many isolated browser contexts.
+
+With Selenium every concurrent page is a chromedriver plus a whole Chrome
+(about 300 MB). Here a single browser is launched and every site gets its own
+``BrowserContext`` (separate cookies, cache and storage) and page, driven
+under asyncio, so many sites can be open at once in little memory.
+
+The scrapers are unchanged: each site still runs the ``SiteScraper``
+open/expand/extract/save lifecycle in a worker thread, against a
+``PlaywrightDriver`` that offers the part of the Selenium driver API the
+engines use (``get``, ``execute_script``, ``execute_cdp_cmd``, XPath
+``find_elements`` for text blocks) and forwards every call to the event loop.
+The "webdriver" engine, which walks the tables element by element, is not
+supported; ``check_sites`` rejects such configs before anything runs.
+
+Playwright is optional: ``pip install playwright && playwright install chromium``.
+
+Usage (from week3/dotnet):
+    python -m common --backend playwright --pool-size 20
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common.extraction import get_engine
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # the Playwright backend is optional
+    async_playwright = None
+
+
+# Wraps a Selenium-style script body (``arguments[i]``, ``return``) into a function for ``page.evaluate``.
+SCRIPT_WRAPPER = "function (args) { return (function () { %s }).apply(null, args); }"
+
+# Engines that need more of the Selenium API than ``PlaywrightDriver`` offers.
+UNSUPPORTED_ENGINES = ("webdriver",)
+
+FIND_ELEMENTS_JS = """
+var found = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var out = [];
+for (var i = 0; i < found.snapshotLength; i++) {
+    var el = found.snapshotItem(i);
+    out.push([el.tagName.toLowerCase(), el.getClientRects().length ? el.innerText : '']);
+}
+return out;
+"""
+
+
+def _require_playwright():
+    if async_playwright is None:
+        raise RuntimeError("The Playwright backend needs playwright: pip install playwright && "
+                           "playwright install chromium")
+
+
+def check_sites(sites):
+    """Raises ValueError when a site uses an engine the Playwright backend cannot run."""
+    unsupported = [site.name for site in sites if site.engine in UNSUPPORTED_ENGINES]
+    if unsupported:
+        raise ValueError(f"The Playwright backend cannot run the 'webdriver' engine (sites: {', '.join(unsupported)}); "
+                         "use the script, page_source or static engine")
+
+
+class PlaywrightElement:
+    """Text and tag name of an element, read when it was found."""
+    def __init__(self, tag_name, text):
+        self.tag_name = tag_name
+        self.text = text
+
+
+class PlaywrightDriver:
+    """Selenium-like, blocking facade over one Playwright page, for use from worker threads."""
+    def __init__(self, loop, context, page, timeout=60):
+        self.loop = loop
+        self.context = context
+        self.page = page
+        self.timeout = timeout
+        self._cdp = None
+        # Each forwarded call is one round trip to the browser; read by ``count_round_trips``.
+        self.round_trips = {"calls": 0}
+
+    def _call(self, coroutine):
+        self.round_trips["calls"] += 1
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(self.timeout)
+
+    def get(self, url):
+        self._call(self.page.goto(url, wait_until="load"))
+
+    def execute_script(self, script, *args):
+        return self._call(self.page.evaluate(SCRIPT_WRAPPER % script, list(args)))
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self._cdp is None:
+            self._cdp = self._call(self.context.new_cdp_session(self.page))
+        return self._call(self._cdp.send(cmd, params))
+
+    def find_elements(self, by, value):
+        """XPath lookups only; the elements carry their text, no further round trips."""
+        return [PlaywrightElement(tag, text) for tag, text in self.execute_script(FIND_ELEMENTS_JS, value)]
+
+    def quit(self):
+        self._call(self.context.close())
+
+
+class PlaywrightBrowser:
+    """Async context manager owning the Playwright server and the one shared browser."""
+    def __init__(self, headless=True):
+        _require_playwright()
+        self.headless = headless
+        self._playwright = None
+        self.browser = None
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.browser.close()
+        await self._playwright.stop()
+
+    async def new_driver(self):
+        """Opens a fresh, isolated context with one page."""
+        context = await self.browser.new_context(viewport={"width": 1920, "height": 1080})
+        page = await context.new_page()
+        return PlaywrightDriver(asyncio.get_running_loop(), context, page)
+
+
+async def scrape_sites_async(sites, scrape, concurrency=20, headless=True):
+    """Runs ``scrape(site, driver)`` for every site, ``concurrency`` at a time, over one browser.
+
+    ``scrape`` is blocking (the normal scraper lifecycle) and runs in a worker
+    thread; browser sites get a new context each, static sites get None.
+    Returns the results in the order of ``sites``.
+    """
+    check_sites(sites)
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        async with PlaywrightBrowser(headless) as browser:
+            async def run(site):
+                async with slots:
+                    if not get_engine(site.engine).needs_browser:
+                        return await loop.run_in_executor(threads, scrape, site, None)
+                    start = time.perf_counter()
+                    driver = await browser.new_driver()
+                    acquired = time.perf_counter() - start
+                    try:
+                        result = await loop.run_in_executor(threads, scrape, site, driver)
+                    finally:
+                        await driver.context.close()
+                    result["phases"]["driver_acquire"] = acquired
+                    return result
+
+            return await asyncio.gather(*(run(site) for site in sites))
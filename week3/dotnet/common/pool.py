@@ -0,0 +1,138 @@
+"""A bounded pool of reusable WebDriver sessions."""
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from common.driver import create_chrome_driver
+
+
+def process_tree_rss_kb(pid):
+    """Resident memory of a process and all its descendants in KB, or None where /proc is not available."""
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/status", encoding="ascii", errors="replace") as f:
+                total += next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), 0)
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children", encoding="ascii") as f:
+                    pending.extend(int(child) for child in f.read().split())
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return total or None
+    return total
+
+
+def driver_rss_kb(driver):
+    """Memory of the chromedriver process tree (chromedriver plus Chrome) of ``driver``, or None."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return process_tree_rss_kb(process.pid) if process is not None else None
+
+
+class DriverPool:
+    """Hands out at most ``size`` WebDriver sessions and reuses them between pages.
+
+    Drivers are started lazily, so Chrome startup is only paid by the workers
+    that actually need a browser. A driver is quit and replaced on its next use
+    once it has served ``max_pages`` pages or its browser uses more than
+    ``max_rss_mb`` of memory, so long-running processes do not accumulate leaks.
+    """
+    def __init__(self, size=2, factory=None, max_pages=None, max_rss_mb=None, **driver_options):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.factory = factory or (lambda: create_chrome_driver(**driver_options))
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.recycled = 0
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._pages = {}  # id(driver) -> pages served
+        self._created = 0
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def _get(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    create = self._reserved < self.size
+                    if create:
+                        self._reserved += 1
+                driver = self._start() if create else self._idle.get()
+            # None is the free slot of a retired driver: reserve it on the next pass.
+            if driver is not None:
+                return driver
+
+    def _start(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._reserved -= 1
+            raise
+        with self._lock:
+            self._all.append(driver)
+            self._pages[id(driver)] = 0
+            self._created += 1
+        return driver
+
+    def _worn_out(self, driver):
+        if self.max_pages and self._pages[id(driver)] >= self.max_pages:
+            return True
+        if self.max_rss_mb:
+            rss = driver_rss_kb(driver)
+            return rss is not None and rss > self.max_rss_mb * 1024
+        return False
+
+    def _retire(self, driver):
+        with self._lock:
+            self._all.remove(driver)
+            del self._pages[id(driver)]
+            self._reserved -= 1
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠ Could not close driver: {e}")
+
+    @contextmanager
+    def acquire(self):
+        """Borrows a driver for the duration of the ``with`` block."""
+        driver = self._get()
+        try:
+            yield driver
+        finally:
+            with self._lock:
+                self._pages[id(driver)] += 1
+            if self._worn_out(driver):
+                self._retire(driver)
+                # Wakes up a borrower waiting for an idle driver; it will start a new one.
+                self._idle.put(None)
+            else:
+                self._idle.put(driver)
+
+    @property
+    def started(self):
+        """Number of browser sessions started so far."""
+        return self._created
+
+    @property
+    def live(self):
+        """Number of browser sessions currently running."""
+        return len(self._all)
+
+    def close(self):
+        """Quits every driver started by the pool."""
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._pages = {}
+            self._reserved = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"⚠ Could not close driver: {e}")
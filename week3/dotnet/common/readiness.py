@@ -0,0 +1,95 @@
+"""Condition-based page readiness waits used instead of fixed ``time.sleep`` calls.
+
+A page counts as ready when all of these hold at the same time:
+    * ``document.readyState`` is "complete",
+    * at least ``min_tables`` tables exist and their count stopped changing,
+    * no new network resources were loaded for a while (network idle),
+    * a MutationObserver saw no DOM changes for a while (DOM settled).
+Every check is read with a single script call per poll, and the wait returns
+as soon as the page is ready, or gives up after the per-site ``timeout``.
+
+Network idle is judged from the Resource Timing entries, whose buffer holds
+only 250 by default; once it is full the count stops moving and a busy page
+looks idle. ``prepare`` therefore raises the buffer before the page loads
+(Chromium drivers), and the probe raises it on its first call otherwise.
+"""
+import time
+import weakref
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+RESOURCE_TIMING_BUFFER_SIZE = 100000
+RESOURCE_BUFFER_JS = f"performance.setResourceTimingBufferSize({RESOURCE_TIMING_BUFFER_SIZE});"
+READINESS_PROBE_JS = """
+if (!window.__readiness) {
+    window.__readiness = {last: performance.now()};
+    %s
+    new MutationObserver(function () { window.__readiness.last = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return [document.readyState,
+        document.querySelectorAll('table').length,
+        performance.getEntriesByType('resource').length,
+        performance.now() - window.__readiness.last];
+""" % RESOURCE_BUFFER_JS
+# Drivers that already register RESOURCE_BUFFER_JS on every new document.
+_PREPARED = weakref.WeakSet()
+
+
+class ReadinessPolicy:
+    """Per-site readiness settings; all durations are in seconds."""
+    def __init__(self, timeout=10, min_tables=0, table_stable_for=0.25, network_idle_for=0.25,
+                 dom_quiet_for=0.25, poll_frequency=0.05):
+        self.timeout = timeout
+        self.min_tables = min_tables
+        self.table_stable_for = table_stable_for
+        self.network_idle_for = network_idle_for
+        self.dom_quiet_for = dom_quiet_for
+        self.poll_frequency = poll_frequency
+
+    def _condition(self):
+        state = {"tables": None, "tables_since": 0.0, "resources": None, "resources_since": 0.0}
+
+        def ready(driver):
+            ready_state, tables, resources, quiet_ms = driver.execute_script(READINESS_PROBE_JS)
+            now = time.monotonic()
+            if tables != state["tables"]:
+                state["tables"], state["tables_since"] = tables, now
+            if resources != state["resources"]:
+                state["resources"], state["resources_since"] = resources, now
+            return (ready_state == "complete"
+                    and tables >= self.min_tables
+                    and now - state["tables_since"] >= self.table_stable_for
+                    and now - state["resources_since"] >= self.network_idle_for
+                    and quiet_ms / 1000.0 >= self.dom_quiet_for)
+
+        return ready
+
+    def prepare(self, driver):
+        """Raises the Resource Timing buffer of every page ``driver`` opens from now on.
+
+        Needs DevTools access; returns False without it (the probe then raises
+        the buffer once it first runs, and entries dropped before are lost).
+        """
+        if driver in _PREPARED:
+            return True
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return False
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_BUFFER_JS})
+        except Exception as e:
+            print(f"⚠ Could not raise the resource timing buffer: {e}")
+            return False
+        _PREPARED.add(driver)
+        return True
+
+    def wait(self, driver):
+        """Blocks until the current page is ready; returns the seconds spent waiting."""
+        start = time.monotonic()
+        try:
+            WebDriverWait(driver, self.timeout, poll_frequency=self.poll_frequency).until(self._condition())
+        except TimeoutException:
+            print(f"⚠ Page not settled after {self.timeout}s, continuing anyway.")
+        return time.monotonic() - start
@@ -0,0 +1,371 @@
+"""Runs the configured sites concurrently over a bounded pool of reusable WebDriver sessions.
+
+Usage (from week3/dotnet):
+    python -m common                       # every site in sites/
+    python -m common windows_server java   # only these sites
+    python -m common --mode process --pool-size 4
+    python -m common --snapshot            # also keep the rendered pages
+    python -m common --replay              # re-extract from the kept pages, offline
+    python -m common --metrics-dir output/metrics   # JSON log + Prometheus file of the run
+    python -m common --backend playwright --pool-size 20   # one browser, a context per site
+
+All sites run in one process (or one pool of worker processes), sharing a single
+import of selenium/pandas and one browser per worker. The pages of static sites
+are downloaded up front, concurrently and rate limited, by ``common.fetch``.
+"""
+import argparse
+import asyncio
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from multiprocessing import util
+
+from common.cache import MISS, NOT_MODIFIED, UNCHANGED, FetchCache, check_upstream
+from common.driver import count_round_trips
+from common.extraction import get_engine
+from common.fetch import fetch_many
+from common.metrics import RunMetrics
+from common.playwright_backend import check_sites, scrape_sites_async
+from common.pool import DriverPool
+from common.scraper import SiteScraper
+from common.sinks import outputs_exist
+from common.sites import SITES_DIR, load_sites
+from common.snapshots import SnapshotStore
+
+
+def _new_result(site):
+    return {"site": site.name, "url": site.url, "output": site.primary_output, "ok": False, "tables": 0,
+            "rows": 0, "error": "", "cache": MISS, "cache_entry": None, "seconds": 0.0, "load_ms": None,
+            "bytes": None, "phases": {}, "counters": {}}
+
+
+def scrape_site(site, driver=None, output_folder="output", cached=None, page_source=None, snapshots=None,
+                scrape_date=None, release=None):
+    """Scrapes one site with an already running driver (or none for static sites).
+
+    ``cached`` is the previous fetch-cache entry of the URL; when the rendered
+    page hashes the same and every configured output exists, extraction is skipped.
+    ``page_source`` is the already downloaded HTML of a static site. The
+    expanded page is kept in ``snapshots`` (a ``SnapshotStore``) when given.
+    The time of each phase and the scrape counters are returned in the result
+    under "phases" and "counters". ``release`` is called as soon as the
+    driver is no longer needed, before extraction, when the engine parses
+    its own snapshot of the page.
+    """
+    start = time.perf_counter()
+    result = _new_result(site)
+    scraper = None
+    counted = hasattr(driver, "round_trips") or hasattr(driver, "execute")
+    round_trips = count_round_trips(driver) if counted else None
+    calls_before = round_trips["calls"] if round_trips else 0
+    try:
+        scraper = SiteScraper(site, driver, output_folder, scrape_date)
+        if scraper.resume_journal():
+            # An interrupted run read every table: only the outputs are missing, the page is not opened.
+            scraper.extract()
+            result.update(tables=scraper.tables_count, rows=scraper.save(), cache_entry={})
+        else:
+            scraper.open_website(page_source)
+            if scraper.load_stats:
+                result["load_ms"] = scraper.load_stats["load_ms"]
+                result["bytes"] = scraper.load_stats["bytes"]
+            scraper.expand_sections()
+            if snapshots:
+                scraper.save_snapshot(snapshots)
+            if release and scraper.release_driver():
+                if round_trips:
+                    result["counters"]["webdriver_calls"] = round_trips["calls"] - calls_before
+                release()
+            digest = scraper.page_hash()
+            result["cache_entry"] = {"content_hash": digest}
+            if cached and cached.get("content_hash") == digest and outputs_exist(site, output_folder):
+                result["cache"] = UNCHANGED
+                scraper.clear_journal()
+            else:
+                scraper.extract()
+                result["tables"] = scraper.tables_count
+                result["rows"] = scraper.save()
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = str(e)
+        print(f"⚠ Failed to scrape {site.url}: {e}")
+        if scraper:
+            scraper.abort()
+    if scraper:
+        result["phases"] = dict(scraper.timings)
+        # After an early release the driver serves other sites, so its calls were counted then.
+        calls = result["counters"].get("webdriver_calls",
+                                       round_trips["calls"] - calls_before if round_trips else 0)
+        result["counters"] = dict(scraper.counters, rows=result["rows"], bytes_written=scraper.bytes_written,
+                                  webdriver_calls=calls)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _validators(headers):
+    return {"etag": headers.get("ETag", ""), "last_modified": headers.get("Last-Modified", "")}
+
+
+def _conditional_headers(entry):
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _is_static(site):
+    return not get_engine(site.engine).needs_browser and site.url.startswith(("http://", "https://"))
+
+
+def prefetch_static(sites, cached, **fetch_options):
+    """Downloads the pages of the static HTTP sites concurrently with conditional GETs.
+
+    Returns {url: FetchResponse or exception}; a 304 response means the cached page is current.
+    """
+    static = [(site, entry) for site, entry in zip(sites, cached) if _is_static(site)]
+    if not static:
+        return {}
+    headers_for = {site.url: _conditional_headers(entry) for site, entry in static}
+    return fetch_many([site.url for site, _ in static], headers_for, **fetch_options)
+
+
+def run_site(pool, site, output_folder, cached=None, prefetched=None, snapshots=None):
+    """Scrapes one site, borrowing a driver from ``pool`` only if its engine needs a browser.
+
+    ``cached`` is the site's fetch-cache entry: the page is not scraped again
+    when it is unchanged upstream and every output exists. ``prefetched`` is
+    the response (or exception) of a static page already fetched by
+    ``prefetch_static``. Scrape errors are reported in the result, not raised.
+    """
+    validators = {}
+    if prefetched is not None:
+        # Static site: the conditional GET already happened in prefetch_static.
+        result = _new_result(site)
+        if isinstance(prefetched, Exception):
+            result["error"] = str(prefetched)
+            print(f"⚠ Failed to scrape {site.url}: {prefetched}")
+            return result
+        if prefetched.status != 304:
+            result = scrape_site(site, None, output_folder, cached, prefetched.text, snapshots)
+            result["bytes"] = len(prefetched.text.encode("utf-8"))
+            if result["ok"]:
+                result["cache_entry"].update(_validators(prefetched.headers))
+            return result
+        if cached and outputs_exist(site, output_folder):
+            result.update(ok=True, cache=NOT_MODIFIED)
+            return result
+        # 304 but an output is gone: the body is empty, so download the page again
+        # without validators (they are stored again on the next conditional GET).
+        return scrape_site(site, None, output_folder, snapshots=snapshots)
+    if cached is not None:
+        start = time.perf_counter()
+        not_modified, validators = check_upstream(site.url, cached)
+        if not_modified and outputs_exist(site, output_folder):
+            result = _new_result(site)
+            result.update(ok=True, cache=NOT_MODIFIED, seconds=time.perf_counter() - start)
+            return result
+    if not get_engine(site.engine).needs_browser:
+        result = scrape_site(site, None, output_folder, cached, snapshots=snapshots)
+    else:
+        waiting = time.perf_counter()
+        with ExitStack() as borrowed:
+            driver = borrowed.enter_context(pool.acquire())
+            # Includes starting Chrome when the pool has no idle driver yet.
+            acquired = time.perf_counter() - waiting
+            # "page_source" sites give the driver back before parsing, so it can open the next URL.
+            result = scrape_site(site, driver, output_folder, cached, snapshots=snapshots, release=borrowed.close)
+        result["phases"]["driver_acquire"] = acquired
+    if result["ok"]:
+        result["cache_entry"].update(validators)
+    return result
+
+
+class _ReservedDriver:
+    """The pool interface over a driver that was already opened for one site."""
+    def __init__(self, driver):
+        self.driver = driver
+
+    @contextmanager
+    def acquire(self):
+        yield self.driver
+
+
+# Each worker process keeps one driver alive for all the sites it is given.
+_process_pool = None
+
+
+def _init_process_worker(driver_options):
+    global _process_pool
+    _process_pool = DriverPool(1, **driver_options)
+    util.Finalize(_process_pool, _process_pool.close, exitpriority=10)
+
+
+def _run_in_process(site, output_folder, cached, prefetched, snapshots):
+    return run_site(_process_pool, site, output_folder, cached, prefetched, snapshots)
+
+
+def run_sites(sites, pool_size=2, mode="thread", output_folder="output", cache=None, fetch_options=None,
+              snapshots=None, backend="selenium", **driver_options):
+    """Scrapes ``sites`` with ``pool_size`` workers; returns (results, total seconds).
+
+    With ``backend="playwright"`` one browser is shared and ``pool_size`` sites
+    run at once, each in its own browser context (``mode`` is then ignored).
+
+    When a ``FetchCache`` is given, unchanged pages are skipped and the cache is
+    updated and saved with the entries of the successful sites. ``fetch_options``
+    are passed to ``AsyncFetcher`` for the static sites. Rendered pages are kept
+    in ``snapshots`` when a ``SnapshotStore`` is given.
+    """
+    start = time.perf_counter()
+    if backend == "playwright":
+        check_sites(sites)
+    cached = [(cache.get(s.url) or {}) if cache else None for s in sites]
+    pages = prefetch_static(sites, cached, **(fetch_options or {}))
+    prefetched = [pages.get(s.url) if _is_static(s) else None for s in sites]
+    if backend == "playwright":
+        position = {id(site): i for i, site in enumerate(sites)}
+
+        def scrape(site, driver):
+            i = position[id(site)]
+            return run_site(_ReservedDriver(driver), site, output_folder, cached[i], prefetched[i], snapshots)
+
+        results = asyncio.run(scrape_sites_async(sites, scrape, pool_size, driver_options.get("headless", True)))
+    elif backend != "selenium":
+        raise ValueError(f"Unknown backend '{backend}', expected 'selenium' or 'playwright'")
+    elif mode == "thread":
+        pool = DriverPool(pool_size, **driver_options)
+        try:
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                results = list(executor.map(lambda s, c, p: run_site(pool, s, output_folder, c, p, snapshots),
+                                            sites, cached, prefetched))
+        finally:
+            pool.close()
+    elif mode == "process":
+        with ProcessPoolExecutor(max_workers=pool_size, initializer=_init_process_worker,
+                                 initargs=(driver_options,)) as executor:
+            results = list(executor.map(_run_in_process, sites, [output_folder] * len(sites), cached, prefetched,
+                                        [snapshots] * len(sites)))
+    else:
+        raise ValueError(f"Unknown mode '{mode}', expected 'thread' or 'process'")
+    if cache:
+        for result in results:
+            if result["ok"] and result["cache_entry"]:
+                cache.update(result["url"], result["cache_entry"])
+        cache.save()
+    return results, time.perf_counter() - start
+
+
+def replay_sites(sites, store, output_folder="output", history=False):
+    """Runs extraction over stored snapshots instead of live pages; no browser or network is used.
+
+    Each site is replayed from its latest snapshot, or with ``history`` from
+    every snapshot, oldest first: the Parquet dataset then gets one scrape_date
+    partition per snapshot day and the CSVs end up matching the latest one.
+    Snapshots with a browser rendering are replayed from it, others are
+    parsed from their HTML like static pages.
+    Returns (results, total seconds) like ``run_sites``.
+    """
+    start = time.perf_counter()
+    results = []
+    for site in sites:
+        entries = store.entries(site.url) if history else [e for e in [store.latest(site.url)] if e]
+        if not entries:
+            result = _new_result(site)
+            result["error"] = "no snapshot"
+            print(f"⚠ No snapshot of {site.url} in '{store.root}'")
+            results.append(result)
+            continue
+        for entry in entries:
+            # Snapshots are already rendered and expanded: nothing is opened or expanded again.
+            rendered = store.load_rendered(entry)
+            offline = copy.copy(site)
+            offline.engine, offline.expand = ("rendered" if rendered else "static"), ""
+            results.append(scrape_site(offline, None, output_folder, page_source=rendered or store.load_html(entry),
+                                       scrape_date=entry["taken"][:10]))
+    return results, time.perf_counter() - start
+
+
+def _kilobytes(value):
+    return "-" if value is None else f"{value / 1024:.0f}"
+
+
+def print_report(results, total_seconds):
+    """Prints per-site latency, page load time, bytes transferred, overall throughput and cache hits."""
+    print(f"\n{'site':<25} {'status':<7} {'cache':<13} {'tables':>6} {'rows':>7} {'load ms':>8} {'KB':>7} "
+          f"{'seconds':>8}")
+    for r in results:
+        status = "ok" if r["ok"] else "failed"
+        load_ms = "-" if r["load_ms"] is None else r["load_ms"]
+        print(f"{r['site']:<25} {status:<7} {r['cache']:<13} {r['tables']:>6} {r['rows']:>7} {load_ms:>8} "
+              f"{_kilobytes(r['bytes']):>7} {r['seconds']:>8.2f}")
+    done = sum(1 for r in results if r["ok"])
+    per_minute = len(results) / total_seconds * 60 if total_seconds else 0.0
+    print(f"\n{done}/{len(results)} sites in {total_seconds:.2f}s ({per_minute:.1f} sites/min)")
+    transferred = sum(r["bytes"] or 0 for r in results)
+    print(f"Transferred: {_kilobytes(transferred)} KB")
+    not_modified = sum(1 for r in results if r["cache"] == NOT_MODIFIED)
+    unchanged = sum(1 for r in results if r["cache"] == UNCHANGED)
+    print(f"Cache: {not_modified + unchanged} hits ({not_modified} not modified, {unchanged} unchanged DOM), "
+          f"{len(results) - not_modified - unchanged} misses")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the configured sites over a shared pool of browsers.")
+    parser.add_argument("sites", nargs="*", help="Site names to run (defaults to every config in --sites-dir).")
+    parser.add_argument("--sites-dir", default=SITES_DIR, help="Folder with the .toml/.yaml site configs.")
+    parser.add_argument("--pool-size", type=int, default=2, help="Number of concurrent browser sessions.")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--backend", choices=["selenium", "playwright"], default="selenium",
+                        help="playwright: one browser with a context per site (pip install playwright).")
+    parser.add_argument("--driver-path", default=None)
+    parser.add_argument("--output-folder", default="output")
+    parser.add_argument("--no-cache", action="store_true", help="Scrape every page even if it did not change.")
+    parser.add_argument("--formats", help="Comma-separated table output formats for every site, e.g. csv,parquet.")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Requests per second per host when downloading static pages (default: unlimited).")
+    parser.add_argument("--no-blocking", action="store_true",
+                        help="Load every image, font and tracker (to compare with the blocking profile).")
+    parser.add_argument("--fetch-concurrency", type=int, default=16, help="Parallel downloads of static pages.")
+    parser.add_argument("--snapshots-dir", default=None, help="Snapshot store (default: <output-folder>/snapshots).")
+    parser.add_argument("--snapshot", action="store_true", help="Keep the expanded DOM of every scraped page.")
+    parser.add_argument("--har", action="store_true", help="With --snapshot, also keep a HAR log of each page.")
+    parser.add_argument("--metrics-dir", default=None,
+                        help="Write a JSON log and a Prometheus textfile with per-phase timings and counters.")
+    replay = parser.add_mutually_exclusive_group()
+    replay.add_argument("--replay", action="store_true",
+                        help="Re-extract from the latest snapshot of each site, without a browser or network.")
+    replay.add_argument("--replay-all", action="store_true", help="Re-extract from every snapshot, oldest first.")
+    args = parser.parse_args(argv)
+
+    sites = load_sites(args.sites_dir, args.sites)
+    if args.backend == "playwright" and not (args.replay or args.replay_all):
+        check_sites(sites)
+    if args.formats:
+        for site in sites:
+            site.formats = tuple(args.formats.split(","))
+            site.validate()
+    if args.no_blocking:
+        for site in sites:
+            site.blocking = {"block": []}
+    store = SnapshotStore(args.snapshots_dir or os.path.join(args.output_folder, "snapshots"), args.har)
+    if args.replay or args.replay_all:
+        results, total = replay_sites(sites, store, args.output_folder, history=args.replay_all)
+    else:
+        cache = None if args.no_cache else FetchCache(os.path.join(args.output_folder, ".fetch_cache.json"))
+        results, total = run_sites(sites, args.pool_size, args.mode, args.output_folder, cache,
+                                   {"concurrency": args.fetch_concurrency, "rate": args.rate},
+                                   store if args.snapshot else None, args.backend, driver_path=args.driver_path)
+    print_report(results, total)
+    if args.metrics_dir:
+        metrics = RunMetrics(args.metrics_dir)
+        metrics.record_run(results, total)
+        print(f"Metrics written to '{metrics.log_path}' and '{metrics.prom_path}'.")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Long-running scheduler that scrapes every site on its own interval with warm browsers.
+
+Instead of a cron job paying the selenium/pandas imports, chromedriver spawn
+and Chrome start-up on every run, the daemon keeps a ``DriverPool`` alive and
+reuses its sessions, so a scheduled scrape only costs navigation and
+extraction. Each site runs every ``interval`` seconds (its own ``interval``
+option or ``--interval``) with +/- ``jitter``; a failing site is retried with
+exponential backoff. Browsers are replaced after ``--max-pages`` pages or when
+they use more than ``--max-rss-mb``.
+
+The queue (next run, failures, last result of every site) is written to
+``<output>/scheduler_state.json`` after every scrape.
+
+Usage (from week3/dotnet):
+    python -m common.scheduler --interval 3600 --pool-size 2
+    python -m common.scheduler windows_server dotnet --interval 900 --metrics-dir output/metrics
+    python -m common.scheduler --status
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from common.cache import FetchCache
+from common.metrics import RunMetrics
+from common.pool import DriverPool
+from common.runner import run_site
+from common.sites import SITES_DIR, load_sites
+
+
+STATE_FILE = "scheduler_state.json"
+
+
+class SiteJob:
+    """Schedule and last outcome of one site."""
+    def __init__(self, site, interval, next_run):
+        self.site = site
+        self.interval = interval
+        self.next_run = next_run
+        self.failures = 0
+        self.runs = 0
+        self.running = False
+        self.last_run = None
+        self.last_ok = None
+        self.last_error = ""
+        self.last_seconds = None
+
+    def state(self):
+        return {"site": self.site.name, "interval": self.interval, "next_run": self.next_run,
+                "running": self.running, "runs": self.runs, "failures": self.failures, "last_run": self.last_run,
+                "last_ok": self.last_ok, "last_error": self.last_error, "last_seconds": self.last_seconds}
+
+
+class Scheduler:
+    """Runs due sites on a thread pool sharing one warm ``DriverPool``.
+
+    ``clock`` returns the current time in seconds (``time.time`` by default).
+    """
+    def __init__(self, sites, pool, output_folder="output", interval=3600, jitter=0.1, backoff=60,
+                 max_backoff=3600, cache=None, metrics=None, clock=time.time, seed=None):
+        self.pool = pool
+        self.output_folder = output_folder
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.metrics = metrics
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.state_path = os.path.join(output_folder, STATE_FILE)
+        self._stop = threading.Event()
+        now = clock()
+        self.jobs = [SiteJob(site, site.interval or interval, now) for site in sites]
+
+    def _jittered(self, seconds):
+        return seconds * (1 + self.random.uniform(-self.jitter, self.jitter))
+
+    def _reschedule(self, job, result):
+        job.running = False
+        job.runs += 1
+        job.last_run = self.clock()
+        job.last_ok = result["ok"]
+        job.last_error = result["error"]
+        job.last_seconds = result["seconds"]
+        if result["ok"]:
+            job.failures = 0
+            job.next_run = job.last_run + self._jittered(job.interval)
+        else:
+            job.failures += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (job.failures - 1), job.interval)
+            job.next_run = job.last_run + self._jittered(delay)
+        if self.cache and result["ok"] and result["cache_entry"]:
+            self.cache.update(result["url"], result["cache_entry"])
+            self.cache.save()
+        if self.metrics:
+            self.metrics.log("site", **{key: value for key, value in result.items() if key != "cache_entry"})
+
+    def _run(self, job):
+        cached = (self.cache.get(job.site.url) or {}) if self.cache else None
+        try:
+            return run_site(self.pool, job.site, self.output_folder, cached)
+        except Exception as e:
+            # run_site reports scrape errors itself; this is e.g. a browser that failed to start.
+            print(f"⚠ Failed to scrape {job.site.url}: {e}")
+            return {"url": job.site.url, "ok": False, "error": str(e), "seconds": 0.0, "cache_entry": None}
+
+    def state(self):
+        """Queue state: the jobs ordered by their next run, and the browser pool."""
+        return {"time": self.clock(),
+                "pool": {"size": self.pool.size, "live": self.pool.live, "started": self.pool.started,
+                         "recycled": self.pool.recycled},
+                "jobs": [job.state() for job in sorted(self.jobs, key=lambda job: job.next_run)]}
+
+    def write_state(self):
+        os.makedirs(self.output_folder, exist_ok=True)
+        with open(self.state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.state(), f, indent=2)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def stop(self):
+        """Asks ``run`` to return once the running scrapes finish."""
+        self._stop.set()
+
+    def run(self, max_runs=None):
+        """Schedules the sites until ``stop`` is called (or ``max_runs`` scrapes finished)."""
+        finished = 0
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            while not self._stop.is_set() and (max_runs is None or finished < max_runs):
+                now = self.clock()
+                submitted = False
+                for job in sorted(self.jobs, key=lambda job: job.next_run):
+                    if job.next_run > now or job.running or len(running) >= self.pool.size:
+                        continue
+                    job.running = True
+                    running[executor.submit(self._run, job)] = job
+                    submitted = True
+                if submitted:
+                    self.write_state()
+                idle = [job.next_run for job in self.jobs if not job.running]
+                # With every worker busy, only a finished scrape can free one.
+                timeout = max(0.0, min(idle) - now) if idle and len(running) < self.pool.size else None
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._reschedule(running.pop(future), future.result())
+                        finished += 1
+                    if done:
+                        self.write_state()
+                else:
+                    self._stop.wait(timeout)
+            for future, job in running.items():
+                self._reschedule(job, future.result())
+        self.write_state()
+        return finished
+
+
+def print_state(path):
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    pool = state["pool"]
+    print(f"Browsers: {pool['live']}/{pool['size']} running, {pool['started']} started, {pool['recycled']} recycled")
+    print(f"{'site':<20} {'next run':<20} {'runs':>5} {'fails':>5}  last")
+    for job in state["jobs"]:
+        next_run = "running" if job["running"] else time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job["next_run"]))
+        last = "-" if job["last_ok"] is None else ("ok" if job["last_ok"] else f"failed: {job['last_error']}")
+        print(f"{job['site']:<20} {next_run:<20} {job['runs']:>5} {job['failures']:>5}  {last}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the configured sites on a schedule with warm browsers.")
+    parser.add_argument("sites", nargs="*", help="Site names to run (defaults to every config in --sites-dir).")
+    parser.add_argument("--sites-dir", default=SITES_DIR)
+    parser.add_argument("--output-folder", default="output")
+    parser.add_argument("--pool-size", type=int, default=2, help="Concurrent browser sessions kept alive.")
+    parser.add_argument("--driver-path", default=None)
+    parser.add_argument("--interval", type=float, default=3600, help="Seconds between runs of a site.")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Random +/- fraction of every interval.")
+    parser.add_argument("--backoff", type=float, default=60, help="First retry delay after a failure, doubled each time.")
+    parser.add_argument("--max-backoff", type=float, default=3600)
+    parser.add_argument("--max-pages", type=int, default=50, help="Replace a browser after this many pages.")
+    parser.add_argument("--max-rss-mb", type=float, default=1024, help="Replace a browser using more memory than this.")
+    parser.add_argument("--no-cache", action="store_true", help="Scrape every page even if it did not change.")
+    parser.add_argument("--metrics-dir", default=None, help="Append a JSON log line per scrape.")
+    parser.add_argument("--status", action="store_true", help="Print the queue state of a running scheduler.")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        print_state(os.path.join(args.output_folder, STATE_FILE))
+        return
+
+    sites = load_sites(args.sites_dir, args.sites)
+    pool = DriverPool(args.pool_size, max_pages=args.max_pages, max_rss_mb=args.max_rss_mb,
+                      driver_path=args.driver_path)
+    cache = None if args.no_cache else FetchCache(os.path.join(args.output_folder, ".fetch_cache.json"))
+    scheduler = Scheduler(sites, pool, args.output_folder, args.interval, args.jitter, args.backoff,
+                          args.max_backoff, cache, RunMetrics(args.metrics_dir) if args.metrics_dir else None)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    print(f"Scheduling {len(sites)} sites; queue state in '{scheduler.state_path}'.")
+    try:
+        scheduler.run()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
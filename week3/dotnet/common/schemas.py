@@ -0,0 +1,87 @@
+"""Header fingerprints and schema clustering for the "schema" merge mode.
+
+Header cells are normalised before they are compared: footnote markers such
+as ``[8]`` or ``[note 1]`` are dropped and whitespace, including line breaks,
+is collapsed, so "Release date[8]" and "Release\\ndate" are the same column.
+
+Tables whose normalised column sets overlap by at least ``threshold``
+(Jaccard similarity) are put in the same cluster. Each distinct header is
+mapped to its cluster once, with the position of every one of its columns
+in the cluster's column list, so later tables are merged by index lookups.
+"""
+import re
+from collections import namedtuple
+
+
+FOOTNOTE_RE = re.compile(r"\[(?:\d+|[a-z]|note \d+|nb \d+|citation needed)\]", re.IGNORECASE)
+
+HeaderMapping = namedtuple("HeaderMapping", ["cluster", "positions"])
+
+
+def normalize_header(name):
+    """Returns the header text without footnote markers and with single spaces."""
+    return " ".join(FOOTNOTE_RE.sub("", str(name)).split())
+
+
+def header_signature(header):
+    """Fingerprint of a header row: its normalised, case-folded column names.
+
+    Repeated names get a _1, _2 suffix so every column keeps its own slot.
+    """
+    seen = {}
+    signature = []
+    for name in header:
+        key = normalize_header(name).casefold()
+        if key in seen:
+            seen[key] += 1
+            key = f"{key}_{seen[key]}"
+        else:
+            seen[key] = 0
+        signature.append(key)
+    return tuple(signature)
+
+
+def _similarity(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class SchemaClusters:
+    """Assigns header rows to clusters of compatible schemas."""
+    def __init__(self, threshold=0.75):
+        self.threshold = threshold
+        self.columns = []      # per cluster: display names of the columns, in first-seen order
+        self.keys = []         # per cluster: {signature key: position}
+        self.mappings = {}     # signature -> HeaderMapping
+
+    @staticmethod
+    def _display_name(columns, name):
+        # Keeps the CSV header unique when two columns only differ by case or are repeated.
+        candidate, n = name, 0
+        while candidate in columns:
+            n += 1
+            candidate = f"{name}_{n}"
+        return candidate
+
+    def assign(self, header):
+        """Returns the ``HeaderMapping`` of ``header``, creating or widening a cluster if needed."""
+        signature = header_signature(header)
+        if signature in self.mappings:
+            return self.mappings[signature]
+        names = set(signature)
+        best, best_score = None, 0.0
+        for cluster, keys in enumerate(self.keys):
+            score = _similarity(names, set(keys))
+            if score >= self.threshold and score > best_score:
+                best, best_score = cluster, score
+        if best is None:
+            best = len(self.keys)
+            self.keys.append({})
+            self.columns.append([])
+        keys, columns = self.keys[best], self.columns[best]
+        for key, name in zip(signature, header):
+            if key not in keys:
+                keys[key] = len(columns)
+                columns.append(self._display_name(columns, normalize_header(name) or f"column_{len(columns) + 1}"))
+        mapping = HeaderMapping(best, [keys[key] for key in signature])
+        self.mappings[signature] = mapping
+        return mapping
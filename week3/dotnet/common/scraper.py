@@ -0,0 +1,398 @@
+"""The shared scraper engine: one class that runs any site described by a ``SiteConfig``."""
+import heapq
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from operator import attrgetter
+
+import pandas as pd
+from selenium.webdriver.common.by import By
+
+from common.blocking import BlockingProfile, page_load_stats
+from common.cache import content_hash
+from common.extraction import get_engine, render_page
+from common.journal import JOURNAL_DIR, TableJournal
+from common.normalize import format_date, normalize_dates
+from common.readiness import ReadinessPolicy
+from common.sinks import open_sink
+from common.snapshots import RESOURCE_ENTRIES_JS, build_har, utc_timestamp
+from common.static import parse_text_blocks
+
+
+EXPAND_ALL_XPATH = "//details | //button | //summary"
+
+# Opens every element matched by arguments[0] in one call: <details> get open=true
+# (their <summary> is then left alone, a click would close them again), already
+# expanded controls are skipped and everything else is clicked. With arguments[1]
+# set, controls that would navigate away (links, form submits) are skipped.
+# Returns [expanded, skipped].
+EXPAND_SECTIONS_JS = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var skipNavigation = arguments[1];
+var expanded = 0, skipped = 0;
+function navigates(el) {
+    var link = el.closest('a[href]');
+    if (link) {
+        var href = link.getAttribute('href');
+        if (href && href.charAt(0) !== '#' && href.indexOf('javascript:') !== 0) return true;
+    }
+    if (el.tagName === 'BUTTON' && el.form && (el.type === 'submit' || el.hasAttribute('formaction'))) return true;
+    return /location|window\\.open/.test(el.getAttribute('onclick') || '');
+}
+for (var i = 0; i < result.snapshotLength; i++) {
+    var el = result.snapshotItem(i);
+    if (el.tagName === 'DETAILS') {
+        if (!el.open) { el.open = true; expanded++; }
+        continue;
+    }
+    var details = el.tagName === 'SUMMARY' ? el.parentElement : null;
+    if (details && details.tagName === 'DETAILS') {
+        if (!details.open) { details.open = true; expanded++; }
+        continue;
+    }
+    if (el.getAttribute('aria-expanded') === 'true' || (skipNavigation && navigates(el))) {
+        skipped++;
+        continue;
+    }
+    try { el.click(); expanded++; } catch (e) { skipped++; }
+}
+return [expanded, skipped];
+"""
+
+VERSION_RE = re.compile(r'\bv?(\d+\.\d+(\.\d+)*)\b', re.IGNORECASE)
+DATE_RE = re.compile(r'(\b\d{4}-\d{2}-\d{2}\b|\b[A-Za-z]{3,9}\s\d{1,2},\s?\d{4}\b|\b\d{1,2}\s[A-Za-z]{3,9}\s\d{4}\b)')
+
+
+class SiteScraper:
+    """Open/expand/extract/save lifecycle for one site config.
+
+    The driver is passed in (e.g. from a ``DriverPool``) and is not closed here;
+    it may be None when the site uses the static engine.
+    """
+    def __init__(self, site, driver=None, output_folder="output", scrape_date=None):
+        self.site = site
+        self.engine = get_engine(site.engine)
+        if self.engine.needs_browser and driver is None:
+            raise ValueError(f"The '{self.engine.name}' engine needs a WebDriver")
+        self.driver = driver if self.engine.needs_browser else None
+        self.readiness = ReadinessPolicy(**site.readiness)
+        self.blocking = BlockingProfile(**site.blocking)
+        self.load_stats = None
+        self.sink = None
+        self.journal = None
+        self.journaled = {}
+        self.all_text_data = []
+        self.versions_data = []
+        self.output_folder = output_folder
+        self.scrape_date = scrape_date
+        self.timings = {}  # phase -> seconds spent in it
+        self.counters = {"tables_found": 0, "cells": 0}
+        self.output_paths = []
+        os.makedirs(self.output_folder, exist_ok=True)
+
+    def open_website(self, page_source=None):
+        """Opens the site URL and waits until the page is ready.
+
+        Static sites may pass the already downloaded ``page_source`` instead.
+        """
+        with self._timed("navigation"):
+            if page_source is not None and not self.engine.needs_browser:
+                self.engine.load(self.site.url, page_source)
+                return
+            if self.driver:
+                self.blocking.apply(self.driver)
+                self.readiness.prepare(self.driver)
+            self.engine.open(self.driver, self.site.url)
+            if self.driver:
+                self.readiness.wait(self.driver)
+                self.load_stats = page_load_stats(self.driver)
+
+    def resume_journal(self):
+        """Opens the table journal of a ``checkpoint`` site and loads what an interrupted run read.
+
+        Returns True when that run had read every table and the site extracts
+        nothing else: the page then needs no navigation or expansion, only saving.
+        """
+        if not self.site.checkpoint:
+            return False
+        self.journal = TableJournal(os.path.join(self.output_folder, JOURNAL_DIR), self.site.name)
+        self.journaled = self.journal.resume(self.site.url)
+        if self.journaled:
+            print(f"Resuming {self.site.name}: {len(self.journaled)} tables were read by an interrupted run.")
+        return self.journal.complete and self.site.extract == ("tables",)
+
+    def expand_sections(self):
+        """Opens the configured collapsible sections ("all" opens every details/summary/button).
+
+        Everything is expanded by one injected script, followed by a single
+        readiness wait for the DOM to settle. Returns the number of sections opened.
+        """
+        if not self.driver or not self.site.expand:
+            return 0
+        xpath = EXPAND_ALL_XPATH if self.site.expand == "all" else self.site.expand
+        with self._timed("expansion"):
+            try:
+                expanded, _ = self.driver.execute_script(EXPAND_SECTIONS_JS, xpath, self.site.expand_skip_navigation)
+            except Exception as e:
+                print(f" Could not expand sections: {e}")
+                return 0
+            if expanded:
+                self.readiness.wait(self.driver)
+        return expanded
+
+    def release_driver(self):
+        """Drops the driver once the engine has taken its own copy of the page.
+
+        Only engines that parse a DOM snapshot (``detach``) can let the browser
+        go before extraction; returns True if the driver was dropped.
+        """
+        if self.driver is None or not hasattr(self.engine, "detach"):
+            return False
+        self.engine.detach(self.driver)
+        self.driver = None
+        return True
+
+    def page_hash(self):
+        """Hash of the current page text, used to detect unchanged pages."""
+        return content_hash(self.engine.page_text(self.driver))
+
+    def save_snapshot(self, store):
+        """Stores the expanded page (and a HAR log if the store records them) in a ``SnapshotStore``."""
+        taken = utc_timestamp()
+        har = rendered = None
+        if store.har and self.driver:
+            har = build_har(self.site.url, self.driver.execute_script(RESOURCE_ENTRIES_JS), taken)
+        # Engines that detach parse the same HTML snapshot with lxml, so the HTML replays them faithfully.
+        if self.driver and not hasattr(self.engine, "detach"):
+            rendered = render_page(self.driver, self.engine.name)
+        return store.save(self.site.url, self.engine.page_html(self.driver), self.site.name, har, taken, rendered)
+
+    @contextmanager
+    def _timed(self, phase):
+        # Adds the time spent in the block to ``self.timings[phase]``.
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def format_date(self, text):
+        """Formats a single date string as YYYY-MM-DD if one of the site's formats matches."""
+        return format_date(text, self.site.date_formats)
+
+    def extract(self):
+        """Runs every extract mode of the site."""
+        if "tables" in self.site.extract:
+            self.extract_tables()
+        if "text" in self.site.extract:
+            self.extract_text_blocks()
+        if "versions" in self.site.extract:
+            self.extract_versions()
+
+    def extract_tables(self):
+        """Extracts tables from the webpage and streams each one to the site's sink.
+
+        Tables are pulled from the engine one at a time: each one is built,
+        normalised (dates per column) and written before the next is read, and
+        is not kept afterwards. Reading, normalisation and writing are timed as
+        the "extract_tables", "normalisation" and "save" phases. With
+        ``checkpoint`` set, the tables journaled by an interrupted run are
+        reused and only the others are read from the page.
+        """
+        if self.sink is None:
+            self.sink = open_sink(self.site, self.output_folder, self.scrape_date)
+        if self.site.checkpoint and self.journal is None:
+            self.resume_journal()
+        found = 0
+        for idx, table in enumerate(self._read_tables(self.journaled)):
+            found = idx + 1
+            try:
+                with self._timed("extract_tables"):
+                    rows = table.header_body_rows() if self.site.rows == "header_body" else table.cell_rows()
+                    table_data = []
+                    header_length = 0
+                    for row_idx, cells in enumerate(rows):
+                        formatted_cols = list(cells)
+                        # Pad or truncate data rows to the header length
+                        if row_idx == 0:
+                            header_length = len(formatted_cols)
+                        elif len(formatted_cols) < header_length:
+                            formatted_cols += [''] * (header_length - len(formatted_cols))
+                        elif len(formatted_cols) > header_length:
+                            formatted_cols = formatted_cols[:header_length]
+                        if formatted_cols:
+                            table_data.append(formatted_cols)
+
+                if table_data:
+                    with self._timed("normalisation"):
+                        df = normalize_dates(pd.DataFrame(table_data[1:], columns=table_data[0]),
+                                             self.site.date_formats)
+                        df.columns = self.make_columns_unique(df.columns)
+                    with self._timed("save"):
+                        self.sink.write(idx, tuple(table_data[0]), df)
+                    self.counters["cells"] += df.size
+            except Exception as e:
+                print(f"⚠ Error extracting table {idx+1}: {e}")
+        self.counters["tables_found"] += found
+        if self.journal:
+            self.journal.finish(found)
+        return self.sink.tables
+
+    def _read_tables(self, done):
+        # Journaled tables and the ones read from the page, merged in page order;
+        # every new table is journaled before it is handed on.
+        fresh = () if self.journal and self.journal.complete else self.engine.iter_tables(self.driver, skip=done)
+        by_index = attrgetter("index")
+        tables = heapq.merge(sorted(done.values(), key=by_index), fresh, key=by_index)
+        while True:
+            with self._timed("extract_tables"):
+                table = next(tables, None)
+            if table is None:
+                return
+            if self.journal and table.index not in done:
+                self.journal.record(table)
+            yield table
+
+    def extract_text_blocks(self):
+        """Extract all headings, paragraphs, and lists for contextual data."""
+        with self._timed("extract_text_blocks"):
+            self._extract_text_blocks()
+
+    def _extract_text_blocks(self):
+        if not self.driver:
+            if hasattr(self.engine, "text_blocks"):
+                self.all_text_data.extend(self.engine.text_blocks(self.driver))
+            else:
+                self.all_text_data.extend(parse_text_blocks(self.engine.page_source))
+            return
+        content_elements = self.driver.find_elements(
+            By.XPATH, "//h1|//h2|//h3|//h4|//h5|//h6|//p|//li|//pre|//code"
+        )
+        for el in content_elements:
+            text = el.text.strip()
+            if text:
+                self.all_text_data.append({"tag": el.tag_name, "text": text})
+
+    def extract_versions(self):
+        """Extract versions, dates, and URLs in a single pass over the page's text nodes.
+
+        Text nodes are grouped by their nearest block element, so every piece of
+        text is scanned once. Rows are keyed by (Version, URL): a version seen
+        again, even with another date, keeps its first row.
+        """
+        with self._timed("extract_versions"):
+            self._extract_versions()
+
+    def _extract_versions(self):
+        blocks = {}
+        for text, href, block_id in self.engine.text_nodes(self.driver):
+            blocks.setdefault(block_id, []).append((text, href))
+
+        seen = set()
+        for parts in blocks.values():
+            text = " ".join(part for part, _ in parts)
+            version_match = VERSION_RE.search(text)
+            if not version_match:
+                continue
+            version = version_match.group(0)
+            if not version.lower().startswith("v"):
+                version = f"v{version}"
+            # Link of the text node that holds the version, if it is inside one
+            href = next((link for part, link in parts if VERSION_RE.search(part)), "")
+            url = href if href.startswith("http") else ""
+            if (version, url) in seen:
+                continue
+            seen.add((version, url))
+            date_match = DATE_RE.search(text)
+            self.versions_data.append({
+                "Version": version,
+                "Date": self.format_date(date_match.group(0)) if date_match else "",
+                "URL": url,
+            })
+
+    def make_columns_unique(self, columns):
+        """Suffixes repeated column names with _1, _2, ..."""
+        seen = {}
+        new_columns = []
+        for col in columns:
+            if col not in seen:
+                seen[col] = 0
+                new_columns.append(col)
+            else:
+                seen[col] += 1
+                new_columns.append(f"{col}_{seen[col]}")
+        return new_columns
+
+    def save(self):
+        """Saves everything that was extracted; returns the number of rows written."""
+        rows = 0
+        with self._timed("save"):
+            if "tables" in self.site.extract:
+                rows += self.save_tables()
+            if "text" in self.site.extract:
+                self.save_text_blocks()
+            if "versions" in self.site.extract:
+                rows += self.save_versions()
+        return rows
+
+    def _write_csv(self, df, filename):
+        csv_path = os.path.join(self.output_folder, filename)
+        df.to_csv(csv_path, index=False)
+        self.output_paths.append(csv_path)
+        print(f"Data saved to '{csv_path}'.")
+        return len(df)
+
+    @property
+    def bytes_written(self):
+        """Size of the files written by ``save()``."""
+        return sum(os.path.getsize(path) for path in self.output_paths if os.path.exists(path))
+
+    @property
+    def tables_count(self):
+        """Number of tables written to the sink so far."""
+        return self.sink.tables if self.sink else 0
+
+    def save_tables(self):
+        """Finishes the output files of the streamed tables."""
+        if not self.tables_count:
+            print("No tables found to save.")
+            self.clear_journal()
+            return 0
+        rows = self.sink.close()
+        self.output_paths.extend(self.sink.paths)
+        self.clear_journal()
+        return rows
+
+    def abort(self):
+        """Removes the unfinished outputs of a failed scrape; the table journal is kept for a retry."""
+        if self.sink is not None:
+            self.sink.abort()
+            self.sink = None
+        if self.journal is not None:
+            self.journal.close()
+
+    def clear_journal(self):
+        """Removes the table journal once the outputs are current."""
+        if self.journal is not None:
+            self.journal.clear()
+            self.journal = None
+
+    def save_text_blocks(self):
+        """Saves the text blocks as JSON."""
+        if not self.all_text_data:
+            print("⚠ No text data found.")
+            return
+        json_path = os.path.join(self.output_folder, self.site.text_output)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.all_text_data, f, ensure_ascii=False, indent=2)
+        self.output_paths.append(json_path)
+        print(f"Text content saved to '{json_path}'")
+
+    def save_versions(self):
+        """Saves version, date and URL rows (already de-duplicated during extraction)."""
+        if not self.versions_data:
+            print("⚠ No version data found.")
+            return 0
+        return self._write_csv(pd.DataFrame(self.versions_data), self.site.output)
@@ -0,0 +1,259 @@
+"""Local lookup service over the lifecycle database, reloaded when a scrape lands.
+
+The releases of ``output/lifecycle.db`` (see ``common.lifecycle``) are loaded
+into a ``LifecycleSnapshot``: a dict for point lookups, a ``VersionIndex``
+(see ``common.versions``) for latest and range queries and an array of
+support end dates sorted by date, all searched with ``bisect``. A background
+thread watches the database files and builds a new snapshot when they change;
+the service then swaps a single reference, so readers never wait and always
+see one complete snapshot.
+
+Usage (from week3/dotnet):
+    python -m common.service serve --port 8765
+    python -m common.service latest windows_server
+    python -m common.service latest dotnet 8.0
+
+Endpoints (JSON):
+    /products
+    /latest?product=dotnet[&prefix=8.0]
+    /release?product=oracle_linux&version=9.4
+    /range?product=windows_server[&low=26100][&high=26200]
+    /expiring[?days=90]
+    /health
+"""
+import argparse
+import bisect
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from common.lifecycle import DB_FILE, parse_release_version
+from common.versions import VersionIndex, parse_version
+
+
+Release = namedtuple("Release", ["product", "version", "release_date", "build", "support"])
+# What the snapshot's ``VersionIndex`` holds: the parsed version next to the release.
+IndexedRelease = namedtuple("IndexedRelease", ["product", "version", "release"])
+
+RELEASES_SQL = """
+SELECT p.name, r.id, r.version, r.release_date,
+       (SELECT b.build FROM builds b WHERE b.release_id = r.id ORDER BY b.build_key DESC LIMIT 1)
+FROM releases r JOIN products p ON p.id = r.product_id
+ORDER BY p.name, r.version_key
+"""
+
+
+def _bound(version):
+    parsed = parse_version(version)
+    if parsed is None:
+        raise ValueError(f"Not a version: {version!r}")
+    return parsed.key
+
+
+class LifecycleSnapshot:
+    """Immutable in-memory indexes of one state of the lifecycle database.
+
+    ``releases`` are ``Release`` tuples; those whose version cannot be parsed
+    only answer point lookups.
+    """
+    def __init__(self, releases, loaded=None):
+        self.loaded = loaded or time.time()
+        self.by_version = {}  # (product, version) -> release
+        indexed = []
+        ends = []
+        for release in releases:
+            self.by_version[release.product, release.version] = release
+            parsed = parse_release_version(release.version) or parse_version(release.build or "")
+            if parsed is not None:
+                indexed.append(IndexedRelease(release.product, parsed, release))
+            ends.extend((end_date, release.product, release.version, kind)
+                        for kind, end_date in release.support.items())
+        self.index = VersionIndex(indexed)
+        ends.sort()
+        self.end_dates = [end[0] for end in ends]
+        self.ends = ends
+
+    @classmethod
+    def load(cls, path):
+        """Reads every release with its latest build and support dates from the database at ``path``."""
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+        try:
+            support = {}
+            for release_id, kind, end_date in conn.execute("SELECT release_id, kind, end_date FROM support_dates"):
+                support.setdefault(release_id, {})[kind] = end_date
+            rows = [Release(product, version, release_date, build, support.get(release_id, {}))
+                    for product, release_id, version, release_date, build in conn.execute(RELEASES_SQL)]
+        finally:
+            conn.close()
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.by_version)
+
+    def products(self):
+        return sorted({product for product, _ in self.by_version})
+
+    def release(self, product, version):
+        return self.by_version.get((product, version))
+
+    def between(self, product, low=None, high=None):
+        """Releases of ``product`` with low <= version < high (version strings; either may be None)."""
+        found = self.index.between(product, _bound(low) if low else None, _bound(high) if high else None)
+        return [entry.release for entry in found]
+
+    def latest(self, product, prefix=None):
+        """Newest release of ``product``, optionally within a version line such as "8.0"."""
+        found = self.index.latest(product, prefix)
+        return found.release if found else None
+
+    def expiring(self, days=90, today=None):
+        """(end date, product, version, kind) of support periods ending within ``days``."""
+        start = today or datetime.date.today()
+        first = bisect.bisect_left(self.end_dates, start.isoformat())
+        last = bisect.bisect_right(self.end_dates, (start + datetime.timedelta(days=days)).isoformat())
+        return self.ends[first:last]
+
+
+def _file_signature(path):
+    # The WAL file changes on every commit, the main file only on checkpoints.
+    # Readers create an empty WAL file, which is the same as none.
+    signature = []
+    for name in (path, path + "-wal"):
+        try:
+            stat = os.stat(name)
+            signature.append((stat.st_mtime_ns, stat.st_size) if stat.st_size else None)
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class LifecycleService:
+    """Serves lookups from the current snapshot and swaps in a new one when the database changes."""
+    def __init__(self, path, poll_interval=2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.signature = None
+        self.snapshot = LifecycleSnapshot([])
+        self.reloads = 0
+        self._stop = threading.Event()
+        self._watcher = None
+        self.reload()
+
+    def reload(self):
+        """Rebuilds the snapshot if the database changed; returns True if it was swapped."""
+        signature = _file_signature(self.path)
+        if signature == self.signature or signature[0] is None:
+            return False
+        snapshot = LifecycleSnapshot.load(self.path)
+        # Readers hold a reference to the old snapshot; replacing the attribute is atomic.
+        self.snapshot, self.signature = snapshot, signature
+        self.reloads += 1
+        return True
+
+    def start(self):
+        """Starts watching the database in a background thread."""
+        self._watcher = threading.Thread(target=self._watch, name="lifecycle-reload", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except sqlite3.Error as e:
+                print(f"⚠ Could not reload '{self.path}': {e}")
+
+    def handle(self, route, params):
+        """Answers one query; returns (HTTP status, JSON-serialisable body)."""
+        snapshot = self.snapshot
+        product = params.get("product", "")
+        try:
+            if route == "/products":
+                return 200, snapshot.products()
+            if route == "/latest":
+                found = snapshot.latest(product, params.get("prefix"))
+                return (200, found._asdict()) if found else (404, {"error": "not found"})
+            if route == "/release":
+                found = snapshot.release(product, params.get("version", ""))
+                return (200, found._asdict()) if found else (404, {"error": "not found"})
+            if route == "/range":
+                return 200, [r._asdict() for r in snapshot.between(product, params.get("low"), params.get("high"))]
+            if route == "/expiring":
+                days = int(params.get("days", 90))
+                return 200, [dict(zip(("end_date", "product", "version", "kind"), end))
+                             for end in snapshot.expiring(days)]
+            if route == "/health":
+                return 200, {"releases": len(snapshot), "loaded": snapshot.loaded, "reloads": self.reloads}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 404, {"error": f"unknown route {route}"}
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    """Returns a threading HTTP server answering the service's JSON endpoints."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so clients do not reconnect per request
+        disable_nagle_algorithm = True  # headers and body are separate writes
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            status, body = service.handle(url.path, params)
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve or query the lifecycle database from memory.")
+    parser.add_argument("--db", default=os.path.join("output", DB_FILE))
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--poll", type=float, default=2.0, help="Seconds between checks for a new scrape.")
+    latest = sub.add_parser("latest")
+    latest.add_argument("product")
+    latest.add_argument("prefix", nargs="?", help="Version line, e.g. 8.0")
+    args = parser.parse_args(argv)
+
+    if args.command == "latest":
+        found = LifecycleSnapshot.load(args.db).latest(args.product, args.prefix)
+        if found:
+            support = ", ".join(f"{kind} {date}" for kind, date in sorted(found.support.items()))
+            print(f"{found.product:<30} {found.version:<20} {found.build or '':<16} {support}")
+        return
+
+    service = LifecycleService(args.db, args.poll)
+    service.start()
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {len(service.snapshot)} releases on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
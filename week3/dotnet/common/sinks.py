@@ -0,0 +1,289 @@
+"""Streaming table writers.
+
+The scraper pulls the tables of a page from the engine one at a time and
+each one is written as soon as its DataFrame is built, then dropped, so peak
+memory follows the largest table rather than the page. Rows that can only be
+finished at the end (combined CSVs, delta changes, lifecycle builds) are
+spooled to disk, not kept in memory.
+
+Files are written under a temporary name (``.tmp`` / ``.spool``) and renamed
+on ``close()``. Every sink has ``abort()``, which removes those files; used as
+a context manager, a sink is closed when the block succeeds and aborted when
+it raises, so a failed run never leaves half-written outputs behind::
+
+    with open_sink(site, "output") as sink:
+        sink.write(0, header, df)
+"""
+import csv
+import os
+
+from common.columnar import ParquetSink
+from common.delta import STATE_FILE, DeltaSink
+from common.lifecycle import DB_FILE, LifecycleDB, LifecycleSink
+from common.schemas import SchemaClusters
+
+
+def _write_spooled(spool_path, path, columns, layouts):
+    """Builds ``path`` from a spool of (layout id, values...) rows, then removes the spool."""
+    width = len(columns)
+    with open(spool_path, encoding="utf-8", newline="") as spool, \
+            open(path + ".tmp", "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(list(columns))
+        for layout_id, *values in csv.reader(spool):
+            row = [""] * width
+            for position, value in zip(layouts[int(layout_id)], values):
+                row[position] = value
+            writer.writerow(row)
+    os.remove(spool_path)
+    os.replace(path + ".tmp", path)
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class StreamingSink:
+    """Context-manager protocol of the sinks: ``close()`` on success, ``abort()`` on error."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class SchemaCsvSink(StreamingSink):
+    """One CSV per distinct header row; later tables with the same header are appended."""
+    def __init__(self, output_folder, pattern):
+        self.output_folder = output_folder
+        self.pattern = pattern
+        self.files = {}  # header tuple -> (final path, open .tmp handle)
+        self.paths = []  # files finished by close()
+        self.rows = 0
+        self.tables = 0
+
+    def write(self, table_index, header, df):
+        """Appends ``df`` to the file of its header."""
+        if header not in self.files:
+            path = os.path.join(self.output_folder, self.pattern.format(n=len(self.files) + 1))
+            handle = open(path + ".tmp", "w", encoding="utf-8", newline="")
+            csv.writer(handle, lineterminator="\n").writerow(df.columns)
+            self.files[header] = (path, handle)
+        df.to_csv(self.files[header][1], header=False, index=False, lineterminator="\n")
+        self.rows += len(df)
+        self.tables += 1
+
+    def close(self):
+        """Finishes every file; returns the number of rows written."""
+        for path, handle in self.files.values():
+            handle.close()
+            os.replace(path + ".tmp", path)
+            self.paths.append(path)
+            print(f"Data saved to '{path}'.")
+        self.files = {}
+        return self.rows
+
+    def abort(self):
+        """Removes the unfinished files."""
+        for path, handle in self.files.values():
+            handle.close()
+            _remove(path + ".tmp")
+        self.files = {}
+
+
+class CombinedCsvSink(StreamingSink):
+    """One CSV with the union of all columns, in first-seen order.
+
+    Rows are spooled to disk together with the id of their column layout and the
+    final file is assembled on ``close()`` once the full set of columns is known.
+    """
+    def __init__(self, output_folder, filename, tag_column=None):
+        self.path = os.path.join(output_folder, filename)
+        self.tag_column = tag_column
+        self.layouts = []
+        self.columns = {}  # column name -> position in the final file
+        self.spool = None
+        self.paths = []
+        self.rows = 0
+        self.tables = 0
+
+    def write(self, table_index, header, df):
+        """Spools the rows of ``df``; ``header`` must already be unique per column."""
+        columns = list(df.columns)
+        if self.tag_column:
+            columns.append(self.tag_column)
+        for col in columns:
+            self.columns.setdefault(col, len(self.columns))
+        self.layouts.append([self.columns[col] for col in columns])
+        if self.spool is None:
+            self.spool = open(self.path + ".spool", "w", encoding="utf-8", newline="")
+        writer = csv.writer(self.spool, lineterminator="\n")
+        layout_id = len(self.layouts) - 1
+        tag = [f"table_{table_index+1}"] if self.tag_column else []
+        for row in df.itertuples(index=False, name=None):
+            writer.writerow([layout_id, *row, *tag])
+        self.rows += len(df)
+        self.tables += 1
+
+    def close(self):
+        """Writes the combined CSV from the spool; returns the number of rows written."""
+        if self.spool is None:
+            return 0
+        self.spool.close()
+        _write_spooled(self.path + ".spool", self.path, self.columns, self.layouts)
+        self.spool = None
+        self.paths.append(self.path)
+        print(f"All data combined and saved to '{self.path}'.")
+        return self.rows
+
+    def abort(self):
+        """Removes the spool and the unfinished file."""
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+        _remove(self.path + ".spool")
+        _remove(self.path + ".tmp")
+
+
+class ClusteredCsvSink(StreamingSink):
+    """One dense CSV per cluster of compatible headers (see ``common.schemas``).
+
+    Footnote markers and line breaks in header cells are ignored when tables
+    are compared. Rows are spooled per cluster with the column mapping of their
+    header and each file is assembled on ``close()``.
+    """
+    def __init__(self, output_folder, pattern, threshold=0.75):
+        self.output_folder = output_folder
+        self.pattern = pattern
+        self.clusters = SchemaClusters(threshold)
+        self.layouts = []
+        self.layout_ids = {}  # (cluster, positions) -> layout id
+        self.spools = {}      # cluster -> (spool path, open handle)
+        self.paths = []
+        self.rows = 0
+        self.tables = 0
+
+    def write(self, table_index, header, df):
+        """Spools the rows of ``df`` in the cluster of ``header``."""
+        mapping = self.clusters.assign(header)
+        layout = (mapping.cluster, tuple(mapping.positions))
+        if layout not in self.layout_ids:
+            self.layout_ids[layout] = len(self.layouts)
+            self.layouts.append(mapping.positions)
+        if mapping.cluster not in self.spools:
+            path = os.path.join(self.output_folder, self.pattern.format(n=mapping.cluster + 1))
+            self.spools[mapping.cluster] = (path + ".spool", open(path + ".spool", "w", encoding="utf-8", newline=""))
+        writer = csv.writer(self.spools[mapping.cluster][1], lineterminator="\n")
+        layout_id = self.layout_ids[layout]
+        for row in df.itertuples(index=False, name=None):
+            writer.writerow([layout_id, *row])
+        self.rows += len(df)
+        self.tables += 1
+
+    def close(self):
+        """Writes one CSV per cluster; returns the number of rows written."""
+        for cluster, (spool_path, handle) in sorted(self.spools.items()):
+            handle.close()
+            path = spool_path[:-len(".spool")]
+            _write_spooled(spool_path, path, self.clusters.columns[cluster], self.layouts)
+            self.paths.append(path)
+            print(f"Data saved to '{path}'.")
+        self.spools = {}
+        return self.rows
+
+    def abort(self):
+        """Removes the spools and the unfinished files."""
+        for spool_path, handle in self.spools.values():
+            handle.close()
+            _remove(spool_path)
+            _remove(spool_path[:-len(".spool")] + ".tmp")
+        self.spools = {}
+
+
+class MultiSink(StreamingSink):
+    """Sends every table to several sinks (e.g. CSV and Parquet)."""
+    def __init__(self, sinks):
+        self.sinks = sinks
+        self.tables = 0
+
+    @property
+    def rows(self):
+        return self.sinks[0].rows if self.sinks else 0
+
+    def write(self, table_index, header, df):
+        for sink in self.sinks:
+            sink.write(table_index, header, df)
+        self.tables += 1
+
+    @property
+    def paths(self):
+        return [path for sink in self.sinks for path in sink.paths]
+
+    def close(self):
+        """Closes every sink; returns the rows written by the first one."""
+        rows = [sink.close() for sink in self.sinks]
+        return rows[0] if rows else 0
+
+    def abort(self):
+        """Aborts every sink."""
+        for sink in self.sinks:
+            sink.abort()
+
+
+def open_sink(site, output_folder, scrape_date=None):
+    """Returns the sink for the site's output formats and merge mode.
+
+    ``scrape_date`` (YYYY-MM-DD, default today) is the Parquet partition to write
+    and the scrape date recorded in the lifecycle database.
+    """
+    sinks = []
+    if "csv" in site.formats:
+        if site.merge == "by_header":
+            sinks.append(SchemaCsvSink(output_folder, site.output))
+        elif site.merge == "schema":
+            sinks.append(ClusteredCsvSink(output_folder, site.output))
+        else:
+            sinks.append(CombinedCsvSink(output_folder, site.output, "Source_Table" if site.merge == "tagged" else None))
+    if "parquet" in site.formats:
+        sinks.append(ParquetSink(os.path.join(output_folder, "dataset"), site.name, scrape_date))
+    if "delta" in site.formats:
+        sinks.append(DeltaSink(os.path.join(output_folder, "delta", site.name), site.delta_keys))
+    if "sqlite" in site.formats:
+        sinks.append(LifecycleSink(os.path.join(output_folder, DB_FILE), site, scrape_date))
+    # The Parquet, delta and lifecycle sinks only get the context-manager protocol through MultiSink.
+    return sinks[0] if len(sinks) == 1 and isinstance(sinks[0], StreamingSink) else MultiSink(sinks)
+
+
+def outputs_exist(site, output_folder):
+    """Whether a previous run left every output the site is configured to write.
+
+    Used before skipping an unchanged page: a format added to the site since,
+    or an output deleted by hand, makes the page be extracted again.
+    """
+    paths = []
+    if "text" in site.extract:
+        paths.append(os.path.join(output_folder, site.text_output))
+    if "versions" in site.extract or ("tables" in site.extract and "csv" in site.formats):
+        paths.append(os.path.join(output_folder, site.primary_output))
+    if "tables" in site.extract:
+        if "parquet" in site.formats:
+            paths.append(os.path.join(output_folder, "dataset", f"source={site.name}"))
+        if "delta" in site.formats:
+            paths.append(os.path.join(output_folder, "delta", site.name, STATE_FILE))
+    if not all(os.path.exists(path) for path in paths):
+        return False
+    if "tables" in site.extract and "sqlite" in site.formats:
+        db_path = os.path.join(output_folder, DB_FILE)
+        if not os.path.exists(db_path):
+            return False
+        db = LifecycleDB(db_path)
+        try:
+            return db.has_site(site.name)
+        finally:
+            db.close()
+    return True
@@ -0,0 +1,164 @@
+"""Declarative site configs for the shared scraper engine.
+
+Each site is one TOML (or YAML, if PyYAML is installed) file in the ``sites``
+folder, for example::
+
+    name = "windows_server"
+    url = "https://learn.microsoft.com/en-us/windows/release-health/windows-server-release-info"
+    expand = "//*[@id='winrelinfo_container']"
+    output = "micro.csv"
+
+    [readiness]
+    min_tables = 1
+
+Adding a site only needs a new file; see ``SiteConfig`` for every option.
+"""
+import os
+import tomllib
+
+try:
+    import yaml
+except ImportError:  # YAML configs are optional
+    yaml = None
+
+from common.blocking import BlockingProfile
+from common.normalize import DATE_FORMATS
+
+
+SITES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sites")
+
+EXTRACT_MODES = ("tables", "text", "versions")
+ROW_MODES = ("header_body", "all_cells")
+MERGE_MODES = ("combined", "by_header", "tagged", "schema")
+OUTPUT_FORMATS = ("csv", "parquet", "delta", "sqlite")
+
+
+class SiteConfig:
+    """Everything the engine needs to know about one site.
+
+    name          -- identifier used on the command line
+    url           -- page to scrape
+    engine        -- extraction engine: "script", "static", "webdriver" or "page_source"
+                     (render in the browser, parse one DOM snapshot in worker processes)
+    expand        -- XPath of sections to click, "all" for every details/summary/button, or empty
+    expand_skip_navigation -- do not click links or submit buttons that would leave the page
+    extract       -- what to pull out of the page: any of "tables", "text", "versions"
+    rows          -- "header_body" (th of the first row, td of the others) or "all_cells"
+    date_formats  -- candidate date formats for the date columns; empty disables date
+                     normalisation (dates are always written as YYYY-MM-DD)
+    merge         -- "combined" (one CSV), "by_header" (one CSV per header), "tagged"
+                     (one CSV with a Source_Table column) or "schema" (one dense CSV per
+                     cluster of compatible headers, ignoring footnotes and line breaks)
+    output        -- CSV file name; "{n}" is replaced by the group number for "by_header"
+                     and "schema"
+    text_output   -- JSON file for the "text" extract mode
+    formats       -- table output formats: "csv", "parquet" (typed dataset under
+                     output/dataset, partitioned by site and scrape date), "delta"
+                     (rows inserted, updated or removed since the last run, see ``common.delta``)
+                     and/or "sqlite" (releases, builds and support dates in output/lifecycle.db,
+                     see ``common.lifecycle``)
+    delta_keys    -- columns identifying a row for "delta": a list of names, or a list of
+                     key sets of which the first one present in a table is used
+    interval      -- seconds between runs of the site in ``common.scheduler`` (default: the
+                     scheduler's --interval)
+    checkpoint    -- "webdriver" engine only: journal every table as it is read, so a run
+                     that died half way resumes from the last good table, and one that
+                     died after reading them all does not open the page again
+                     (see ``common.journal``)
+    readiness     -- keyword arguments for ``ReadinessPolicy``
+    blocking      -- keyword arguments for ``BlockingProfile`` (block / deny / allow);
+                     images, fonts, media and trackers are blocked by default
+    index         -- how ``common.versions`` and ``common.lifecycle`` read the tables:
+                     "version_columns" (default: columns named like version/build/release)
+                     and "product_column"
+    """
+    def __init__(self, name, url, output, engine="script", expand="", expand_skip_navigation=True,
+                 extract=("tables",), rows="header_body", date_formats=DATE_FORMATS,
+                 merge="combined", text_output="all_text_data.json", formats=("csv",), readiness=None,
+                 index=None, blocking=None, delta_keys=(), interval=None,
+                 checkpoint=False):
+        self.name = name
+        self.url = url
+        self.output = output
+        self.engine = engine
+        self.expand = expand or ""
+        self.expand_skip_navigation = expand_skip_navigation
+        self.extract = tuple(extract)
+        self.rows = rows
+        self.date_formats = tuple(date_formats)
+        self.merge = merge
+        self.text_output = text_output
+        self.formats = tuple(formats)
+        self.readiness = dict(readiness or {})
+        self.index = dict(index or {})
+        self.blocking = dict(blocking or {})
+        self.delta_keys = tuple(delta_keys or ())
+        self.interval = interval
+        self.checkpoint = checkpoint
+        self.validate()
+
+    def validate(self):
+        """Raises ValueError when an option has an unsupported value."""
+        for mode in self.extract:
+            if mode not in EXTRACT_MODES:
+                raise ValueError(f"Site '{self.name}': unknown extract mode '{mode}', expected {EXTRACT_MODES}")
+        if self.rows not in ROW_MODES:
+            raise ValueError(f"Site '{self.name}': unknown rows mode '{self.rows}', expected {ROW_MODES}")
+        if self.merge not in MERGE_MODES:
+            raise ValueError(f"Site '{self.name}': unknown merge mode '{self.merge}', expected {MERGE_MODES}")
+        for fmt in self.formats:
+            if fmt not in OUTPUT_FORMATS:
+                raise ValueError(f"Site '{self.name}': unknown output format '{fmt}', expected {OUTPUT_FORMATS}")
+        if self.checkpoint and self.engine != "webdriver":
+            raise ValueError(f"Site '{self.name}': checkpoint is only supported by the 'webdriver' engine")
+        if self.interval is not None and self.interval <= 0:
+            raise ValueError(f"Site '{self.name}': interval must be a positive number of seconds")
+        try:
+            BlockingProfile(**self.blocking)
+        except TypeError as e:
+            raise ValueError(f"Site '{self.name}': invalid blocking option: {e}")
+        except ValueError as e:
+            raise ValueError(f"Site '{self.name}': {e}")
+
+    @property
+    def primary_output(self):
+        """The first output file; reported in the results and checked by ``common.sinks.outputs_exist``."""
+        return self.output.format(n=1)
+
+    def __repr__(self):
+        return f"SiteConfig({self.name!r}, {self.url!r})"
+
+
+def load_site_file(path):
+    """Loads one site config from a .toml, .yaml or .yml file."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise ValueError(f"{path}: install PyYAML to use YAML site configs")
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"{path}: site configs must be .toml, .yaml or .yml files")
+    data.setdefault("name", name)
+    try:
+        return SiteConfig(**data)
+    except TypeError as e:
+        raise ValueError(f"{path}: {e}")
+
+
+def load_sites(folder=SITES_DIR, names=None):
+    """Loads every site config of ``folder``, or only the ones listed in ``names``."""
+    sites = {}
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith((".toml", ".yaml", ".yml")):
+            site = load_site_file(os.path.join(folder, filename))
+            sites[site.name] = site
+    if not names:
+        return list(sites.values())
+    missing = [name for name in names if name not in sites]
+    if missing:
+        raise ValueError(f"Unknown site(s) {missing}, available: {sorted(sites)}")
+    return [sites[name] for name in names]
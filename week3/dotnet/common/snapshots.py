@@ -0,0 +1,146 @@
+"""Offline store of rendered pages, used to re-run extraction without a browser.
+
+Every snapshot is the fully expanded, post-JS DOM of a page, optionally with a
+HAR log of the resources it loaded. Pages read straight from the browser (the
+"script" and "webdriver" engines) also keep what the browser rendered: the
+page's innerText, its tables' cells and its text nodes (see
+``common.extraction.render_page``), since CSS and scripts decide what is
+visible and lxml cannot tell from the HTML alone. Bodies are gzip-compressed
+and stored by the SHA-256 of their content, so a page that did not change
+between runs takes no extra space::
+
+    <root>/objects/<2 hex>/<sha256>.html.gz
+    <root>/objects/<2 hex>/<sha256>.har.json.gz
+    <root>/objects/<2 hex>/<sha256>.rendered.json.gz
+    <root>/index.jsonl        one {"url", "site", "taken", "html", "har", "rendered"} line per snapshot
+
+Pages are recorded with ``python -m common --snapshot [--har]``.
+``python -m common --replay`` runs the normal extract/normalise/save pipeline
+over the latest snapshot of each site, from the rendering where there is one
+and from the HTML otherwise; ``--replay-all`` re-processes every snapshot,
+oldest first (see ``common.runner.replay_sites``).
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+
+
+INDEX_FILE = "index.jsonl"
+
+# Resource Timing entries of the current page: [url, type, bytes, start ms, duration ms].
+RESOURCE_ENTRIES_JS = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource')).map(
+    function (e) { return [e.name, e.initiatorType, e.transferSize || 0, e.startTime, e.duration]; });
+"""
+
+
+def utc_timestamp():
+    """Current time as an ISO 8601 UTC string with second precision."""
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_har(page_url, resources, taken):
+    """Builds a minimal HAR 1.2 log from Resource Timing entries.
+
+    Headers and bodies are not available to page scripts, so only URLs, sizes
+    and timings are filled in.
+    """
+    started = datetime.datetime.strptime(taken, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=datetime.timezone.utc)
+    entries = []
+    for url, initiator, size, start_ms, duration_ms in resources:
+        entries.append({
+            "startedDateTime": (started + datetime.timedelta(milliseconds=start_ms)).isoformat(),
+            "time": duration_ms,
+            "request": {"method": "GET", "url": url, "httpVersion": "", "headers": [], "queryString": [],
+                        "cookies": [], "headersSize": -1, "bodySize": 0},
+            "response": {"status": 0, "statusText": "", "httpVersion": "", "headers": [], "cookies": [],
+                         "content": {"size": size, "mimeType": ""}, "redirectURL": "",
+                         "headersSize": -1, "bodySize": size},
+            "cache": {},
+            "timings": {"send": 0, "wait": duration_ms, "receive": 0},
+            "_initiatorType": initiator,
+        })
+    return {"log": {"version": "1.2", "creator": {"name": "ApexaiQ-scraper", "version": "1.0"},
+                    "pages": [{"id": "page_1", "title": page_url, "startedDateTime": started.isoformat(),
+                               "pageTimings": {}}],
+                    "entries": entries}}
+
+
+class SnapshotStore:
+    """Content-addressed, gzip-compressed page snapshots with an append-only index.
+
+    With ``har`` set, scrapers also record a HAR log of each page's resources.
+    """
+    def __init__(self, root=os.path.join("output", "snapshots"), har=False):
+        self.root = root
+        self.har = har
+
+    def _object_path(self, digest, suffix):
+        return os.path.join(self.root, "objects", digest[:2], digest + suffix)
+
+    def _put(self, data, suffix):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest, suffix)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        return digest
+
+    def save(self, url, html, site="", har=None, taken=None, rendered=None):
+        """Stores a snapshot of ``url`` and returns its index entry.
+
+        ``rendered`` is the JSON text of the browser's rendering of the page, if any.
+        """
+        entry = {
+            "url": url,
+            "site": site,
+            "taken": taken or utc_timestamp(),
+            "html": self._put(html.encode("utf-8"), ".html.gz"),
+            "har": self._put(json.dumps(har).encode("utf-8"), ".har.json.gz") if har else "",
+            "rendered": self._put(rendered.encode("utf-8"), ".rendered.json.gz") if rendered else "",
+        }
+        os.makedirs(self.root, exist_ok=True)
+        # One O_APPEND write per line keeps the index consistent across threads and worker processes.
+        fd = os.open(os.path.join(self.root, INDEX_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(entry, sort_keys=True) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+        return entry
+
+    def entries(self, url=None):
+        """Index entries, oldest first, optionally only those of ``url``."""
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            found = [json.loads(line) for line in f if line.strip()]
+        return sorted((e for e in found if url is None or e["url"] == url), key=lambda e: e["taken"])
+
+    def latest(self, url):
+        """The newest entry of ``url``, or None."""
+        found = self.entries(url)
+        return found[-1] if found else None
+
+    def load_html(self, entry):
+        """Returns the HTML of a snapshot entry."""
+        with gzip.open(self._object_path(entry["html"], ".html.gz"), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def load_har(self, entry):
+        """Returns the HAR log of a snapshot entry, or None if none was recorded."""
+        if not entry.get("har"):
+            return None
+        with gzip.open(self._object_path(entry["har"], ".har.json.gz"), "rb") as f:
+            return json.loads(f.read())
+
+    def load_rendered(self, entry):
+        """Returns the rendering (JSON text) of a snapshot entry, or None if none was recorded."""
+        if not entry.get("rendered"):
+            return None
+        with gzip.open(self._object_path(entry["rendered"], ".rendered.json.gz"), "rb") as f:
+            return f.read().decode("utf-8")
@@ -0,0 +1,168 @@
+"""Browserless extraction for pages whose tables are plain static HTML.
+
+The page is fetched over HTTP and parsed with lxml into the same ``RawTable``
+objects the WebDriver engines return, so no Chrome process is needed at all.
+"""
+import requests
+from lxml import html as lxml_html
+
+from common.tables import Cell, RawTable, select_tables
+
+
+USER_AGENT = "Mozilla/5.0 (compatible; ApexaiQ-scraper/1.0)"
+
+# Elements whose text never shows up in the rendered page (innerText skips them).
+INVISIBLE_TAGS = ("script", "style", "noscript", "template")
+
+# Elements that start a new block of text for ``parse_text_nodes``.
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "details", "div", "dl", "dt", "figcaption",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "li", "main", "nav", "ol", "p", "pre",
+    "section", "summary", "table", "td", "th", "tr", "ul",
+}
+
+
+def fetch_html(url, timeout=30, session=None):
+    """Returns the HTML of ``url``; ``file://`` URLs are read from disk."""
+    if url.startswith("file://"):
+        with open(url[len("file://"):], encoding="utf-8") as f:
+            return f.read()
+    response = (session or requests).get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def _is_hidden(element):
+    style = (element.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or element.get("hidden") is not None
+
+
+def visible_text(element):
+    """Approximates ``innerText``: hidden elements are skipped and ``<br>`` becomes a newline."""
+    parts = []
+
+    def walk(el):
+        if not isinstance(el.tag, str) or el.tag in INVISIBLE_TAGS or _is_hidden(el):
+            return
+        if el.tag == "br":
+            parts.append("\n")
+        elif el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(element)
+    lines = (" ".join(line.split()) for line in "".join(parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _span(element, name):
+    try:
+        return max(int(element.get(name, 1)), 1)
+    except ValueError:
+        return 1
+
+
+def iter_parsed_tables(page_html, skip=()):
+    """Yields a ``RawTable`` for every ``<table>`` of an HTML document, one at a time.
+
+    Tables whose index is in ``skip`` are not read.
+    """
+    document = lxml_html.fromstring(page_html)
+    for idx, table in enumerate(document.iter("table")):
+        if idx in skip:
+            continue
+        rows = []
+        for row in table.iter("tr"):
+            rows.append([
+                Cell(visible_text(cell), cell.tag == "th", _span(cell, "rowspan"), _span(cell, "colspan"))
+                for cell in row.iter("th", "td")
+            ])
+        yield RawTable(idx, rows)
+
+
+def parse_tables(page_html):
+    """Parses every ``<table>`` of an HTML document into ``RawTable`` objects."""
+    return list(iter_parsed_tables(page_html))
+
+
+def parse_text_blocks(page_html, tags=("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "pre", "code")):
+    """Returns ``{"tag", "text"}`` for every non-empty element with one of ``tags``."""
+    document = lxml_html.fromstring(page_html)
+    blocks = []
+    for el in document.iter(*tags):
+        text = visible_text(el)
+        if text:
+            blocks.append({"tag": el.tag, "text": text})
+    return blocks
+
+
+def parse_text_nodes(page_html, base_url=None):
+    """Returns (text, link, block id) for every visible text node, like ``TEXT_NODES_JS``."""
+    document = lxml_html.fromstring(page_html)
+    if base_url:
+        document.make_links_absolute(base_url, handle_failures="ignore")
+    body = document.find("body")
+    nodes = []
+    block_count = [0]
+
+    def walk(el, block_id, href):
+        if not isinstance(el.tag, str) or el.tag in INVISIBLE_TAGS or _is_hidden(el):
+            return
+        if el.tag in BLOCK_TAGS:
+            block_id, block_count[0] = block_count[0], block_count[0] + 1
+        if el.tag == "a" and el.get("href"):
+            href = el.get("href")
+        if el.text and el.text.strip():
+            nodes.append((el.text.strip(), href, block_id))
+        for child in el:
+            walk(child, block_id, href)
+            if child.tail and child.tail.strip():
+                nodes.append((child.tail.strip(), href, block_id))
+
+    walk(body if body is not None else document, 0, "")
+    return nodes
+
+
+class StaticHtmlEngine:
+    """Fetches the page with plain HTTP and parses it with lxml, without a browser."""
+    name = "static"
+    needs_browser = False
+
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
+        self.page_source = ""
+        self.url = ""
+
+    def open(self, driver, url):
+        """Downloads ``url``; ``driver`` is ignored and may be None."""
+        self.load(url, fetch_html(url, session=self.session))
+
+    def load(self, url, page_source):
+        """Uses HTML that was already downloaded (e.g. by ``common.fetch``) for ``url``."""
+        self.page_source = page_source
+        self.url = url
+
+    def page_text(self, driver):
+        """Returns the visible text of the downloaded page."""
+        document = lxml_html.fromstring(self.page_source)
+        body = document.find("body")
+        return visible_text(body if body is not None else document)
+
+    def page_html(self, driver):
+        """Returns the downloaded HTML."""
+        return self.page_source
+
+    def text_nodes(self, driver):
+        """Returns (text, link, block id) for every visible text node of the downloaded page."""
+        return parse_text_nodes(self.page_source, self.url)
+
+    def iter_tables(self, driver, skip=()):
+        """Yields a ``RawTable`` for every table of the downloaded page whose index is not in ``skip``."""
+        return iter_parsed_tables(self.page_source, skip)
+
+    def extract_tables(self, driver, skip=(), on_table=None):
+        """Returns a ``RawTable`` for every table of the downloaded page whose index is not in ``skip``."""
+        return select_tables(self.iter_tables(driver, skip), on_table=on_table)
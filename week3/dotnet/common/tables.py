@@ -0,0 +1,72 @@
+"""Engine-independent representation of the tables found on a page."""
+from collections import namedtuple
+
+
+Cell = namedtuple("Cell", ["text", "header", "rowspan", "colspan"])
+
+
+def select_tables(tables, skip=(), on_table=None):
+    """Drops the tables whose index is in ``skip`` and passes each remaining one to ``on_table``.
+
+    ``tables`` may be a generator; every table is handed to ``on_table`` as soon as it is produced.
+    """
+    selected = []
+    for table in tables:
+        if table.index in skip:
+            continue
+        if on_table is not None:
+            on_table(table)
+        selected.append(table)
+    return selected
+
+
+class RawTable:
+    """Cells of one HTML table, row by row, in document order."""
+    def __init__(self, index, rows):
+        self.index = index
+        self.rows = rows
+
+    def header_body_rows(self):
+        """Returns the header cells of the first row and the data cells of the others.
+
+        This mirrors the old ``.//th`` on the first row / ``.//td`` on the rest lookup.
+        """
+        result = []
+        for row_idx, row in enumerate(self.rows):
+            wanted = row_idx == 0
+            result.append([cell.text for cell in row if cell.header == wanted])
+        return result
+
+    def cell_rows(self):
+        """Returns the text of every cell (``th`` and ``td``) of every row."""
+        return [[cell.text for cell in row] for row in self.rows]
+
+    def grid(self):
+        """Returns the cell texts with row/col spans expanded into a full grid."""
+        grid = []
+        pending = {}  # column -> (text, rows left)
+        for row in self.rows:
+            out = []
+            col = 0
+            cells = iter(row)
+            cell = next(cells, None)
+            while cell is not None or any(c >= col for c in pending):
+                if col in pending:
+                    text, left = pending.pop(col)
+                    out.append(text)
+                    if left > 1:
+                        pending[col] = (text, left - 1)
+                    col += 1
+                    continue
+                if cell is None:
+                    out.append("")
+                    col += 1
+                    continue
+                for _ in range(max(cell.colspan, 1)):
+                    out.append(cell.text)
+                    if cell.rowspan > 1:
+                        pending[col] = (cell.text, cell.rowspan - 1)
+                    col += 1
+                cell = next(cells, None)
+            grid.append(out)
+        return grid
@@ -0,0 +1,34 @@
+import os
+from types import SimpleNamespace
+
+from common.bench_suite import driver_peak_rss_kb, prepare_fixtures, run_case, serve
+
+
+def test_static_case_reports_every_phase(tmp_path):
+    """
+    Test that a benchmark case over the local server times each phase and counts the rows.
+    """
+    fixtures = prepare_fixtures(str(tmp_path), rows=50, tables=6, depth=30)
+    assert "large_table.html" in fixtures and "nested.html" in fixtures
+    server, base_url = serve(str(tmp_path))
+    try:
+        result = run_case("large_table.html", f"{base_url}/large_table.html", "static")
+        nested = run_case("nested.html", f"{base_url}/nested.html", "static")
+    finally:
+        server.shutdown()
+    assert result["ok"], result["error"]
+    assert result["rows"] == 50 and result["rows_per_sec"] > 0
+    assert {"navigation", "extract_tables", "normalisation", "extract_versions", "save"} <= set(result["phases"])
+    assert nested["versions"] == 80  # one per summary, one per nested note
+    assert result["peak_rss_kb"] and result["driver_rss_kb"] is None  # no browser for the static engine
+
+
+def test_driver_peak_rss_measures_the_driver_process_tree():
+    """
+    Test that the driver's memory is read from its service process tree and only ever grows.
+    """
+    driver = SimpleNamespace(service=SimpleNamespace(process=SimpleNamespace(pid=os.getpid())))
+    current = driver_peak_rss_kb(driver)
+    assert current > 0
+    assert driver_peak_rss_kb(driver, current * 100) == current * 100
+    assert driver_peak_rss_kb(None, 5) == 5
@@ -0,0 +1,49 @@
+import pytest
+
+from common.blocking import BlockingProfile, page_load_stats
+from common.sites import SiteConfig
+
+
+class CdpDriver:
+    """Records the DevTools commands it is sent."""
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+    def execute_script(self, script):
+        return [850.4, 120000, 12]
+
+
+def test_profile_sends_blocked_patterns_with_allow_exceptions():
+    """
+    Test that categories and deny patterns are blocked and allowed URLs keep their pattern out.
+    """
+    driver = CdpDriver()
+    profile = BlockingProfile(block=["images", "stylesheets"], deny=["*tracker.example.com*"], allow=["*/site.css"])
+    assert profile.apply(driver)
+    assert driver.commands[0] == ("Network.enable", {})
+    blocked = driver.commands[1][1]["urls"]
+    assert "*.png" in blocked and "*tracker.example.com*" in blocked
+    assert "*.css" not in blocked
+    assert BlockingProfile(block=[]).patterns() == []
+
+
+def test_invalid_blocking_config_is_rejected():
+    """
+    Test that unknown categories or keys fail when the site config is loaded.
+    """
+    with pytest.raises(ValueError):
+        SiteConfig("x", "https://example.com", "x.csv", blocking={"block": ["videos"]})
+    with pytest.raises(ValueError):
+        SiteConfig("x", "https://example.com", "x.csv", blocking={"blok": ["images"]})
+
+
+def test_page_load_stats_and_drivers_without_cdp():
+    """
+    Test that load time and bytes are read in one call and non-Chromium drivers are left alone.
+    """
+    assert page_load_stats(CdpDriver()) == {"load_ms": 850, "bytes": 120000, "resources": 12}
+    assert BlockingProfile().apply(object()) is False
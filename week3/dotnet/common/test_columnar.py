@@ -0,0 +1,51 @@
+import pandas as pd
+import pyarrow as pa
+
+from common.columnar import ParquetSink, list_schemas, read_dataset, schema_id
+
+
+def test_parquet_sink_writes_typed_partitions(tmp_path):
+    """
+    Test that dates become date32, repeated values are dictionary-encoded and builds stay strings.
+    """
+    df = pd.DataFrame({
+        "Version": ["2022", "2022", "2019", "2019"],
+        "Availability date": ["2021-08-18", "2023-11-01", "2018-11-13", ""],
+        "Build": ["20348.2031", "20348.2113", "17763.5122", "17763.5206"],
+    })
+    header = tuple(df.columns)
+    sink = ParquetSink(str(tmp_path), "windows_server", scrape_date="2026-10-18")
+    sink.write(0, header, df)
+    assert sink.close() == 4
+
+    schema = list_schemas(str(tmp_path), "windows_server")[schema_id(header)]
+    assert schema.field("Availability date").type == pa.date32()
+    assert pa.types.is_dictionary(schema.field("Version").type)
+    assert schema.field("Build").type == pa.string()
+
+    table = read_dataset(str(tmp_path), "windows_server", schema_id(header), columns=["Build"],
+                         scrape_date="2026-10-18")
+    assert table.column_names == ["Build"]
+    assert table.column("Build").to_pylist()[0] == "20348.2031"
+    assert read_dataset(str(tmp_path), "windows_server", schema_id(header), scrape_date="2000-01-01").num_rows == 0
+
+
+def test_non_date_values_widen_the_column_instead_of_becoming_nulls(tmp_path):
+    """
+    Test that values like "TBD" in an inferred date column are kept, across runs and partitions.
+    """
+    header = ("Version", "End of support")
+    first = pd.DataFrame({"Version": ["8", "7"], "End of support": ["2026-11-10", "2024-11-12"]})
+    sink = ParquetSink(str(tmp_path), "dotnet", scrape_date="2026-10-17")
+    sink.write(0, header, first)
+    sink.close()
+    assert list_schemas(str(tmp_path), "dotnet")[schema_id(header)].field("End of support").type == pa.date32()
+
+    later = pd.DataFrame({"Version": ["10", "9"], "End of support": ["TBD", "Ongoing"]})
+    sink = ParquetSink(str(tmp_path), "dotnet", scrape_date="2026-10-18")
+    sink.write(0, header, later)
+    sink.close()
+
+    assert list_schemas(str(tmp_path), "dotnet")[schema_id(header)].field("End of support").type == pa.string()
+    table = read_dataset(str(tmp_path), "dotnet", schema_id(header)).sort_by("scrape_date")
+    assert table.column("End of support").to_pylist() == ["2026-11-10", "2024-11-12", "TBD", "Ongoing"]
@@ -0,0 +1,39 @@
+import json
+import os
+
+import pandas as pd
+
+from common.delta import STATE_FILE, DeltaSink
+
+
+HEADER = ("Version", "Servicing option", "Build")
+
+
+def _run(folder, rows):
+    sink = DeltaSink(folder, [["Version", "Servicing option"], ["Build"]])
+    sink.write(1, HEADER, pd.DataFrame(rows, columns=list(HEADER)))
+    sink.close()
+    changes = [p for p in sink.paths if p.endswith(".jsonl")]
+    if not changes:
+        return []
+    with open(changes[0], encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_second_run_writes_only_changed_rows(tmp_path):
+    """
+    Test that the first run inserts every row and the next one only the inserted, updated and removed ones.
+    """
+    folder = str(tmp_path / "delta")
+    first = _run(folder, [["24H2", "LTSC", "26100.1"], ["23H2", "AC", "25398.1"], ["2022", "LTSC", "20348.1"]])
+    assert [c["op"] for c in first] == ["insert"] * 3
+
+    second = _run(folder, [["24H2", "LTSC", "26100.2"], ["23H2", "AC", "25398.1"], ["2025", "LTSC", "26200.1"]])
+    ops = {(c["op"], c["id"].split("|", 1)[1]) for c in second}
+    assert ops == {("update", "24H2|LTSC"), ("insert", "2025|LTSC"), ("remove", "2022|LTSC")}
+    update = next(c for c in second if c["op"] == "update")
+    assert update["row"] == {"Version": "24H2", "Servicing option": "LTSC", "Build": "26100.2"}
+
+    with open(os.path.join(folder, STATE_FILE), encoding="utf-8") as f:
+        assert len(json.load(f)["rows"]) == 3
+    assert _run(folder, [["24H2", "LTSC", "26100.2"], ["23H2", "AC", "25398.1"], ["2025", "LTSC", "26200.1"]]) == []
@@ -0,0 +1,84 @@
+import json
+
+from common.extraction import ScriptTableEngine, WebDriverTableEngine, tables_from_payload
+
+
+class FakeDriver:
+    """Stands in for WebDriver and returns a canned extraction payload."""
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def execute_script(self, script):
+        self.calls += 1
+        return json.dumps(self.payload)
+
+
+PAYLOAD = [[
+    [["Version", 1, 1, 1], ["Release date", 1, 1, 1], ["Build", 1, 1, 1]],
+    [["2022", 0, 2, 1], [" August 18, 2021 ", 0, 1, 1], ["20348", 0, 1, 1]],
+    [["November 1, 2023", 0, 1, 1], ["20348.2031", 0, 1, 1]],
+    [["Total", 1, 1, 1], ["n/a", 0, 1, 2]],
+]]
+
+
+def test_script_engine_uses_one_round_trip():
+    """
+    Test that all tables are read with a single execute_script call.
+    """
+    driver = FakeDriver(PAYLOAD * 50)
+    tables = ScriptTableEngine().extract_tables(driver)
+    assert driver.calls == 1
+    assert len(tables) == 50
+
+
+def test_header_body_rows_match_legacy_lookup():
+    """
+    Test that the first row keeps th cells and the other rows keep td cells, stripped.
+    """
+    table = tables_from_payload(PAYLOAD)[0]
+    assert table.header_body_rows() == [
+        ["Version", "Release date", "Build"],
+        ["2022", "August 18, 2021", "20348"],
+        ["November 1, 2023", "20348.2031"],
+        ["n/a"],
+    ]
+    assert table.cell_rows()[3] == ["Total", "n/a"]
+
+
+def test_grid_expands_spans():
+    """
+    Test that rowspan and colspan cells are repeated into a full grid.
+    """
+    table = tables_from_payload(PAYLOAD)[0]
+    assert table.grid()[2] == ["2022", "November 1, 2023", "20348.2031"]
+    assert table.grid()[3] == ["Total", "n/a", "n/a"]
+
+
+class FakeCell:
+    def __init__(self, tag_name, text):
+        self.tag_name = tag_name
+        self.text = text
+
+
+class FakeRow:
+    def __init__(self, *cells):
+        self.cells = [FakeCell(tag, text) for tag, text in cells]
+        self.lookups = []
+
+    def find_elements(self, by, xpath):
+        self.lookups.append(xpath)
+        return self.cells
+
+
+def test_webdriver_engine_keeps_row_headers_in_place():
+    """
+    Test that each row is read with one lookup and a th row header stays before the td cells of its row.
+    """
+    rows = [FakeRow(("th", "Version"), ("th", "Release date")), FakeRow(("TH", "8.0"), ("td", "2023-11-14"))]
+    table = FakeRow()
+    table.cells = rows
+    raw = WebDriverTableEngine()._read_rows(table)
+    assert [[(c.text, c.header) for c in row] for row in raw] == [
+        [("Version", True), ("Release date", True)], [("8.0", True), ("2023-11-14", False)]]
+    assert [row.lookups for row in rows] == [[".//th|.//td"], [".//th|.//td"]]
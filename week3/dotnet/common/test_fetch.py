@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common.cache import NOT_MODIFIED, FetchCache
+from common.fetch import fetch_many
+from common.runner import run_sites
+from common.sites import SiteConfig
+
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the Oracle Linux fixture; /flaky fails twice before answering, /missing is a 404."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.clients.add(self.client_address)
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            flaky_failures = server.requests.count("/flaky")
+        time.sleep(0.02)
+        with server.lock:
+            server.in_flight -= 1
+        if self.path == "/flaky" and flaky_failures <= 2:
+            self._send(503, b"busy")
+        elif self.path == "/missing":
+            self._send(404, b"not found")
+        elif self.headers.get("If-None-Match") == '"v1"':
+            self._send(304, b"")
+        else:
+            with open(FIXTURE, "rb") as f:
+                self._send(200, f.read(), {"ETag": '"v1"'})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.requests, server.clients = [], set()
+    server.in_flight = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_fetch_many_caps_concurrency_and_reuses_connections():
+    """
+    Test that at most `per_host` requests run at once over that many kept-alive connections.
+    """
+    server, base = start_server()
+    try:
+        urls = [f"{base}/page/{i}" for i in range(24)]
+        pages = fetch_many(urls, per_host=3)
+        assert all(pages[url].status == 200 for url in urls)
+        assert "Oracle Linux" in pages[urls[0]].text
+        assert server.peak <= 3
+        assert len(server.clients) <= 3
+    finally:
+        server.shutdown()
+
+
+def test_fetch_retries_with_backoff_and_rate_limits():
+    """
+    Test that 503 answers are retried and the token bucket spaces out requests to one host.
+    """
+    server, base = start_server()
+    try:
+        pages = fetch_many([f"{base}/flaky"], retries=3, backoff=0.01)
+        assert pages[f"{base}/flaky"].status == 200
+        assert server.requests.count("/flaky") == 3
+
+        missing = fetch_many([f"{base}/missing"], retries=3)[f"{base}/missing"]
+        assert isinstance(missing, Exception)
+        assert server.requests.count("/missing") == 1
+
+        start = time.perf_counter()
+        fetch_many([f"{base}/rated/{i}" for i in range(6)], rate=20)
+        assert time.perf_counter() - start >= 0.2
+    finally:
+        server.shutdown()
+
+
+def test_static_sites_use_conditional_get(tmp_path):
+    """
+    Test that static sites are downloaded once per URL and a 304 skips them on the next run.
+    """
+    server, base = start_server()
+    try:
+        sites = [SiteConfig(name, f"{base}/linux", f"{name}.csv", engine="static") for name in ("oracle", "suse")]
+        first, _ = run_sites(sites, output_folder=str(tmp_path), cache=FetchCache(str(tmp_path / "cache.json")))
+        assert [r["rows"] for r in first] == [4, 4]
+        assert server.requests.count("/linux") == 1
+
+        second, _ = run_sites(sites, output_folder=str(tmp_path), cache=FetchCache(str(tmp_path / "cache.json")))
+        assert [r["cache"] for r in second] == [NOT_MODIFIED, NOT_MODIFIED]
+    finally:
+        server.shutdown()
+
+
+def test_not_modified_site_with_deleted_output_is_downloaded_again(tmp_path):
+    """
+    Test that a 304 for a site whose output was deleted re-downloads the page instead of failing.
+    """
+    server, base = start_server()
+    try:
+        sites = [SiteConfig("oracle", f"{base}/linux", "oracle.csv", engine="static")]
+        for _ in range(2):
+            run_sites(sites, output_folder=str(tmp_path), cache=FetchCache(str(tmp_path / "cache.json")))
+        os.remove(tmp_path / "oracle.csv")
+
+        for _ in range(2):
+            results, _ = run_sites(sites, output_folder=str(tmp_path), cache=FetchCache(str(tmp_path / "cache.json")))
+            assert results[0]["ok"] and results[0]["error"] == ""
+            assert (tmp_path / "oracle.csv").exists()
+        assert results[0]["cache"] == NOT_MODIFIED
+    finally:
+        server.shutdown()
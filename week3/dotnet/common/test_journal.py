@@ -0,0 +1,121 @@
+import os
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from common.extraction import WebDriverTableEngine
+from common.journal import JOURNAL_DIR, TableJournal
+from common.runner import scrape_site
+from common.scraper import SiteScraper
+from common.sites import SiteConfig
+from common.tables import Cell, RawTable
+
+
+FIXTURE_URL = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+class FakeElement:
+    def __init__(self, text="", children=None, stale=False, tag_name="td"):
+        self.text = text
+        self.tag_name = tag_name
+        self.children = children or {}
+        self.stale = stale
+
+    def find_elements(self, by, xpath):
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+        return self.children.get(xpath, [])
+
+
+def _table(*values):
+    row = FakeElement(children={".//th|.//td": [FakeElement(v) for v in values]})
+    return FakeElement(children={".//tr": [row]})
+
+
+class FakeDriver:
+    def __init__(self):
+        self.lookups = []
+
+    def find_elements(self, by, xpath):
+        return [_table("a"), FakeElement(stale=True), _table("c")]
+
+    def find_element(self, by, xpath):
+        self.lookups.append(xpath)
+        return _table("b")
+
+
+def test_stale_table_is_read_again_from_a_fresh_lookup():
+    """
+    Test that a stale table is looked up again and that skipped tables are not read.
+    """
+    engine = WebDriverTableEngine()
+    engine.retry_delay = 0
+    driver = FakeDriver()
+    recorded = []
+    tables = engine.extract_tables(driver, skip={2}, on_table=recorded.append)
+    assert [t.cell_rows() for t in tables] == [[["a"]], [["b"]]]
+    assert driver.lookups == ["(//table)[2]"]
+    assert recorded == tables
+
+
+class UnusedDriver:
+    """Fails on any use: a fully journaled page must not be opened again."""
+    def _used(self, *args):
+        raise AssertionError("the driver was used")
+
+    get = execute_script = execute_cdp_cmd = find_elements = find_element = _used
+
+
+def _journal_release_table(tmp_path):
+    journal = TableJournal(str(tmp_path / JOURNAL_DIR), "oracle_linux")
+    journal.resume(FIXTURE_URL)
+    journal.record(RawTable(0, [[Cell("Release", True, 1, 1), Cell("Codename", True, 1, 1)],
+                                [Cell("from journal", False, 1, 1), Cell("x", False, 1, 1)]]))
+    return journal
+
+
+def test_interrupted_run_resumes_from_journal(tmp_path):
+    """
+    Test that journaled tables are not read again and the page is marked as fully read afterwards.
+    """
+    journal = _journal_release_table(tmp_path)
+    journal.close()
+
+    site = SiteConfig("oracle_linux", FIXTURE_URL, "linux.csv", engine="webdriver", rows="all_cells",
+                      checkpoint=True)
+    scraper = SiteScraper(site, FakeDriver(), str(tmp_path))
+    scraper.engine.retry_delay = 0
+    assert not scraper.resume_journal()
+    scraper.extract_tables()
+    assert scraper.counters["tables_found"] == 3
+    assert scraper.driver.lookups == ["(//table)[2]"]
+
+    resumed = TableJournal(os.path.dirname(journal.path), "oracle_linux")
+    assert len(resumed.resume(FIXTURE_URL)) == 3 and resumed.complete
+    resumed.close()
+    scraper.save()
+    assert not os.path.exists(journal.path)
+
+
+def test_fully_journaled_page_is_not_opened_again(tmp_path):
+    """
+    Test that a run which read every table before dying is finished from the journal alone.
+    """
+    journal = _journal_release_table(tmp_path)
+    journal.finish(1)
+    journal.close()
+
+    site = SiteConfig("oracle_linux", FIXTURE_URL, "linux.csv", engine="webdriver", checkpoint=True)
+    result = scrape_site(site, UnusedDriver(), output_folder=str(tmp_path))
+    assert result["ok"] and result["tables"] == 1
+    assert (tmp_path / "linux.csv").read_text().splitlines() == ["Release,Codename", "from journal,x"]
+    assert not os.path.exists(journal.path)
+
+
+def test_checkpoint_needs_the_webdriver_engine():
+    """
+    Test that checkpoint is off by default and rejected for engines that read a page in one call.
+    """
+    assert not SiteConfig("s", FIXTURE_URL, "s.csv").checkpoint
+    with pytest.raises(ValueError, match="checkpoint"):
+        SiteConfig("s", FIXTURE_URL, "s.csv", engine="script", checkpoint=True)
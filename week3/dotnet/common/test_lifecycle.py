@@ -0,0 +1,56 @@
+import datetime
+
+import pandas as pd
+
+from common.lifecycle import LifecycleDB, LifecycleSink, version_sort_key
+from common.sites import SiteConfig
+from common.versions import parse_version
+
+
+COLUMNS = ["Version", "Servicing option", "Availability date", "Build", "Mainstream end date", "Extended end date"]
+ROWS = [
+    ["24H2", "LTSC", "2024-11-01", "26100.2314", "2029-10-09", "2034-10-10"],
+    ["24H2", "LTSC", "2024-12-10", "26100.2605", "2029-10-09", "2034-10-10"],
+    ["2022", "LTSC", "2021-08-18", "20348.2849", "2026-10-13", "2031-10-14"],
+]
+
+
+def _scrape(path, rows):
+    site = SiteConfig("windows_server", "https://example.com/release-info", "micro_{n}.csv", formats=("sqlite",))
+    sink = LifecycleSink(path, site, "2026-10-01")
+    sink.write(0, tuple(COLUMNS), pd.DataFrame(rows, columns=COLUMNS))
+    return sink.close()
+
+
+def test_version_sort_key_orders_like_parsed_keys():
+    """
+    Test that the text keys stored in SQLite sort like the parsed version keys.
+    """
+    versions = ["8.0.1", "8.0", "8.0.0-rc.2", "8.0.0-rc.10", "8.0.0", "10.0.26100.1", "21.0.2+13", "21.0.2+7"]
+    parsed = [parse_version(v) for v in versions]
+    assert sorted(parsed, key=lambda v: v.key) == sorted(parsed, key=version_sort_key)
+
+
+def test_sink_upserts_releases_builds_and_support_dates(tmp_path):
+    """
+    Test that repeated scrapes upsert rows and the expiry and latest queries read them back.
+    """
+    path = str(tmp_path / "lifecycle.db")
+    assert _scrape(path, ROWS) == 3
+    _scrape(path, ROWS[:1] + [["24H2", "LTSC", "2024-12-10", "26100.2605", "2029-10-09", "2035-01-09"]] + ROWS[2:])
+
+    db = LifecycleDB(path)
+    try:
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.conn.execute("SELECT COUNT(*) FROM releases").fetchone()[0] == 2
+        assert db.conn.execute("SELECT COUNT(*) FROM builds").fetchone()[0] == 3
+        assert db.latest("windows_server") == ("24H2", "2024-11-01", "26100.2605")
+        assert db.expiring(90, today=datetime.date(2026, 9, 1)) == [
+            ("windows_server", "2022", "mainstream end date", "2026-10-13")]
+        assert ("windows_server", "24H2", "extended end date", "2035-01-09") in db.expiring(
+            365 * 10, today=datetime.date(2026, 1, 1))
+        plan = " ".join(row[-1] for row in db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM support_dates WHERE end_date BETWEEN '2026-01-01' AND '2026-04-01'"))
+        assert "support_end_date" in plan
+    finally:
+        db.close()
@@ -0,0 +1,48 @@
+import json
+import os
+
+from common.driver import count_round_trips
+from common.metrics import RunMetrics
+from common.runner import run_sites
+from common.sites import SiteConfig
+
+
+FIXTURE_URL = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+def test_run_exports_phases_and_counters(tmp_path):
+    """
+    Test that each result carries phase timings and counters and both export files are written.
+    """
+    site = SiteConfig("oracle_linux", FIXTURE_URL, "linux_{n}.csv", engine="static", merge="schema")
+    results, total = run_sites([site], output_folder=str(tmp_path / "out"))
+    result = results[0]
+    assert {"navigation", "extract_tables", "normalisation", "save"} <= set(result["phases"])
+    assert result["counters"]["tables_found"] == 2
+    assert result["counters"]["rows"] == 4
+    assert result["counters"]["bytes_written"] == os.path.getsize(tmp_path / "out" / "linux_1.csv") + \
+        os.path.getsize(tmp_path / "out" / "linux_2.csv")
+
+    metrics = RunMetrics(str(tmp_path / "metrics"), run_id="test")
+    metrics.record_run(results, total)
+    with open(metrics.log_path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f]
+    assert [e["event"] for e in events] == ["site", "run"]
+    prom = (tmp_path / "metrics" / "scraper.prom").read_text().splitlines()
+    assert 'scraper_rows{site="oracle_linux"} 4' in prom
+    assert any(line.startswith('scraper_phase_seconds{site="oracle_linux",phase="navigation"} ') for line in prom)
+
+
+def test_round_trip_counter_wraps_a_driver_once():
+    """
+    Test that counting calls on a pooled driver twice does not double count.
+    """
+    class Driver:
+        def execute(self, command, params=None):
+            return {}
+
+    driver = Driver()
+    counter = count_round_trips(driver)
+    assert count_round_trips(driver) is counter
+    driver.execute("getTitle")
+    assert counter["calls"] == 1
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from common.normalize import format_date, infer_date_formats, normalize_dates
+
+
+def test_date_columns_are_converted_to_iso():
+    """
+    Test that a mixed-format date column becomes YYYY-MM-DD and other columns stay as they are.
+    """
+    df = pd.DataFrame({
+        "Release date": ["August 18, 2021", "Oct 2, 2018", "13 Nov 2018", "", "TBD"],
+        "Build": ["20348.2031", "17763.1", "17763", "1", "2"],
+        "KB article": ["KB5031364", "KB5031361", "KB1", "KB2", "KB3"],
+    })
+    normalize_dates(df)
+    assert list(df["Release date"]) == ["2021-08-18", "2018-10-02", "2018-11-13", "", "TBD"]
+    assert list(df["Build"]) == ["20348.2031", "17763.1", "17763", "1", "2"]
+    assert df["KB article"].iloc[0] == "KB5031364"
+
+
+def test_infer_rejects_mostly_non_date_columns():
+    """
+    Test that a column is only treated as dates when most sampled values parse.
+    """
+    values = pd.Series(["May 1, 2020", "n/a", "n/a", "n/a"])
+    assert infer_date_formats(values) == []
+    assert infer_date_formats(pd.Series(["2024-05-02", "2023-11-09"])) == ["%Y-%m-%d"]
+
+
+def test_empty_formats_disable_normalisation():
+    """
+    Test that sites with no date formats keep their raw text.
+    """
+    df = pd.DataFrame({"Date": ["August 18, 2021"]})
+    assert normalize_dates(df, formats=())["Date"].iloc[0] == "August 18, 2021"
+    assert format_date("August 18, 2021") == "2021-08-18"
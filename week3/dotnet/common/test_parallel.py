@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from common.bench_suite import write_many_tables
+from common.parallel import parse_tables_parallel
+from common.scraper import SiteScraper
+from common.sites import SiteConfig
+from common.static import parse_tables
+
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+def test_parallel_parse_matches_single_process(tmp_path):
+    """
+    Test that tables parsed by worker processes are the same, in the same order, as a single-process parse.
+    """
+    path = str(tmp_path / "many.html")
+    write_many_tables(path, tables=30, rows=5)
+    with open(path, encoding="utf-8") as f:
+        page_html = f.read()
+    with ProcessPoolExecutor(max_workers=2, mp_context=get_context("spawn")) as executor:
+        tables = parse_tables_parallel(page_html, executor)
+    expected = parse_tables(page_html)
+    assert [t.index for t in tables] == list(range(30))
+    assert [t.rows for t in tables] == [t.rows for t in expected]
+
+
+class FakeDriver:
+    def __init__(self):
+        self.scripts = 0
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        with open(FIXTURE, encoding="utf-8") as f:
+            return f.read()
+
+
+def test_page_source_engine_releases_driver_before_parsing(tmp_path):
+    """
+    Test that the page is taken from the browser once and the tables are parsed without it.
+    """
+    site = SiteConfig("oracle_linux", "https://example.com", "linux_{n}.csv", engine="page_source",
+                      merge="by_header", extract=("tables", "versions"))
+    driver = FakeDriver()
+    scraper = SiteScraper(site, driver, str(tmp_path))
+    scraper.engine.open(driver, site.url)
+    assert scraper.release_driver()
+    assert scraper.driver is None
+    scraper.extract()
+    assert scraper.tables_count == 2
+    assert scraper.versions_data
+    assert driver.scripts == 1
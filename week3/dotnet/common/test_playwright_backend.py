@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from common.driver import count_round_trips
+from common.playwright_backend import PlaywrightDriver, check_sites
+from common.runner import main
+from common.sites import SiteConfig
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    async def goto(self, url, wait_until):
+        self.calls.append(("goto", url))
+
+    async def evaluate(self, expression, arg):
+        self.calls.append(("evaluate", expression, arg))
+        return [["p", "Version 8.0.1"]]
+
+
+def test_driver_forwards_selenium_calls_to_the_event_loop():
+    """
+    Test that blocking calls from a worker thread run on the loop, keep their arguments and are counted.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        page = FakePage()
+        driver = PlaywrightDriver(loop, None, page, timeout=5)
+        driver.get("https://example.com")
+        elements = driver.find_elements(By.XPATH, "//p")
+        assert [(el.tag_name, el.text) for el in elements] == [("p", "Version 8.0.1")]
+        _, expression, arg = page.calls[1]
+        assert expression.startswith("function (args) {") and "arguments[0]" in expression
+        assert arg == ["//p"]
+        assert count_round_trips(driver) is driver.round_trips and driver.round_trips["calls"] == 2
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_webdriver_engine_sites_are_rejected_before_running(tmp_path):
+    """
+    Test that a site using the webdriver engine is refused as soon as the configs are loaded.
+    """
+    check_sites([SiteConfig("dotnet", "https://example.com", "dotnet.csv")])
+    (tmp_path / "legacy.toml").write_text('name = "legacy"\nurl = "https://example.com"\n'
+                                          'output = "legacy.csv"\nengine = "webdriver"\n')
+    with pytest.raises(ValueError, match="legacy"):
+        main(["--sites-dir", str(tmp_path), "--backend", "playwright", "--output-folder", str(tmp_path)])
@@ -0,0 +1,141 @@
+import time
+
+from common.readiness import ReadinessPolicy
+from common.scraper import EXPAND_ALL_XPATH, EXPAND_SECTIONS_JS, SiteScraper
+from common.sites import SiteConfig
+
+
+class ProbeDriver:
+    """Answers the readiness probe from a scripted list of page states."""
+    def __init__(self, states):
+        self.states = states
+        self.calls = 0
+
+    def execute_script(self, script):
+        state = self.states[min(self.calls, len(self.states) - 1)]
+        self.calls += 1
+        return state
+
+
+def test_ready_page_returns_quickly():
+    """
+    Test that an already settled page returns after the short stability window.
+    """
+    driver = ProbeDriver([["complete", 3, 20, 5000.0]])
+    waited = ReadinessPolicy(timeout=5).wait(driver)
+    assert waited < 1
+
+
+def test_waits_for_table_count_to_stabilise():
+    """
+    Test that a growing table count keeps the wait going until it stops changing.
+    """
+    states = [["complete", n, 20, 5000.0] for n in range(10)]
+    driver = ProbeDriver(states)
+    ReadinessPolicy(timeout=5, min_tables=9, poll_frequency=0.01).wait(driver)
+    assert driver.calls > len(states)
+
+
+def test_gives_up_after_timeout():
+    """
+    Test that a page that never settles stops waiting at the site timeout.
+    """
+    driver = ProbeDriver([["loading", 0, 0, 0.0]])
+    start = time.monotonic()
+    ReadinessPolicy(timeout=0.3).wait(driver)
+    assert time.monotonic() - start < 1
+
+
+class ExpandDriver:
+    """Opens 40 sections in the expansion script and reports a settled page afterwards."""
+    def __init__(self):
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if script == EXPAND_SECTIONS_JS:
+            return [40, 2]
+        return ["complete", 3, 20, 5000.0]
+
+
+def test_sections_are_expanded_in_one_call_then_one_wait(tmp_path):
+    """
+    Test that "all" expands every section with one script call followed by a single readiness wait.
+    """
+    driver = ExpandDriver()
+    site = SiteConfig("x", "https://example.com", "x.csv", expand="all", readiness={"poll_frequency": 0.01})
+    scraper = SiteScraper(site, driver, output_folder=str(tmp_path))
+    assert scraper.expand_sections() == 40
+    expand_calls = [args for script, args in driver.scripts if script == EXPAND_SECTIONS_JS]
+    assert expand_calls == [(EXPAND_ALL_XPATH, True)]
+    assert all(args == () for script, args in driver.scripts[1:])  # only readiness probes follow
+
+
+class BusyPage:
+    """A page that keeps loading resources into a Resource Timing buffer of 250 entries.
+
+    ``loaded`` resources are already in when it is first probed; each probe
+    lets ``per_poll`` more finish until ``total``. Like a browser, entries past
+    the buffer size are dropped until a script calls setResourceTimingBufferSize.
+    """
+    def __init__(self, total, loaded, per_poll, cdp=True):
+        self.total = total
+        self.loaded = 0
+        self.entries = 0
+        self.buffer = 250
+        self.new_document_scripts = []
+        self.per_poll = per_poll
+        self._load(loaded)
+        if cdp:
+            self.execute_cdp_cmd = self._execute_cdp_cmd
+
+    def _load(self, count):
+        for _ in range(min(count, self.total - self.loaded)):
+            self.loaded += 1
+            if self.entries < self.buffer:
+                self.entries += 1
+
+    def _run(self, script):
+        if "performance.setResourceTimingBufferSize(" in script:
+            self.buffer = int(script.split("setResourceTimingBufferSize(")[1].split(")")[0])
+
+    def _execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Page.addScriptToEvaluateOnNewDocument"
+        self.new_document_scripts.append(params["source"])
+
+    def get(self, url):
+        # Document scripts run before the page's own resources start loading.
+        loaded, self.loaded, self.entries = self.loaded, 0, 0
+        for script in self.new_document_scripts:
+            self._run(script)
+        self._load(loaded)
+
+    def execute_script(self, script):
+        self._run(script)
+        result = ["complete", 3, self.entries, 5000.0]
+        self._load(self.per_poll)
+        return result
+
+
+def test_network_idle_sees_more_than_250_resources():
+    """
+    Test that a page still loading past 250 resources is not taken as idle once the timing buffer is full.
+    """
+    driver = BusyPage(total=400, loaded=260, per_poll=5)
+    policy = ReadinessPolicy(timeout=10, network_idle_for=0.05, poll_frequency=0.01)
+    assert policy.prepare(driver)
+    driver.get("https://example.com")
+    policy.wait(driver)
+    assert driver.loaded == 400 and driver.entries == 400
+    assert policy.prepare(driver) and len(driver.new_document_scripts) == 1  # registered once per driver
+
+
+def test_probe_raises_the_timing_buffer_without_devtools():
+    """
+    Test that without DevTools the probe itself raises the buffer, so later resources keep the page busy.
+    """
+    driver = BusyPage(total=400, loaded=260, per_poll=5, cdp=False)
+    policy = ReadinessPolicy(timeout=10, network_idle_for=0.05, poll_frequency=0.01)
+    assert not policy.prepare(driver)
+    policy.wait(driver)
+    assert driver.loaded == 400 and driver.entries == 390  # the 10 dropped before the first probe are lost
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+
+from common.cache import MISS, UNCHANGED, FetchCache
+from common.pool import DriverPool
+from common.runner import run_sites
+from common.sites import SiteConfig, load_sites
+
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+def test_pool_never_exceeds_size_and_reuses_drivers():
+    """
+    Test that concurrent borrowers share at most `size` drivers.
+    """
+    pool = DriverPool(2, factory=FakeDriver)
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with pool.acquire() as driver:
+            with lock:
+                in_use.append(driver)
+                peak.append(len(in_use))
+            time.sleep(0.01)
+            with lock:
+                in_use.remove(driver)
+
+    threads = [threading.Thread(target=work) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pool.started == 2
+    assert max(peak) <= 2
+    pool.close()
+
+
+FIXTURE_URL = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+def test_static_sites_run_without_browser(tmp_path):
+    """
+    Test that static sites are scraped concurrently without starting a driver.
+    """
+    sites = [SiteConfig(f"linux_{i}", FIXTURE_URL, f"linux_{i}.csv", engine="static") for i in range(3)]
+    results, total = run_sites(sites, pool_size=2, output_folder=str(tmp_path))
+    assert all(r["ok"] for r in results)
+    assert [r["rows"] for r in results] == [4, 4, 4]
+    assert (tmp_path / "linux_0.csv").exists()
+
+
+def test_merge_by_header_writes_one_csv_per_schema(tmp_path):
+    """
+    Test that the by_header merge mode writes numbered files, one per header row.
+    """
+    site = SiteConfig("linux", FIXTURE_URL, "linux_{n}.csv", engine="static", merge="by_header")
+    results, _ = run_sites([site], output_folder=str(tmp_path))
+    assert results[0]["tables"] == 2
+    assert (tmp_path / "linux_1.csv").read_text().startswith("Release,Codename,Release date[8]")
+    assert (tmp_path / "linux_2.csv").exists()
+
+
+def test_shipped_site_configs_load():
+    """
+    Test that every config in sites/ is valid.
+    """
+    names = [site.name for site in load_sites()]
+    assert "windows_server" in names and "java" in names
+
+
+def test_cache_skips_unchanged_pages(tmp_path):
+    """
+    Test that a second run over the same page is a cache hit and leaves the CSV alone.
+    """
+    sites = [SiteConfig("linux", FIXTURE_URL, "linux.csv", engine="static")]
+    cache = FetchCache(str(tmp_path / "cache.json"))
+    first, _ = run_sites(sites, output_folder=str(tmp_path), cache=cache)
+    (tmp_path / "linux.csv").write_text("sentinel")
+
+    second, _ = run_sites(sites, output_folder=str(tmp_path), cache=FetchCache(str(tmp_path / "cache.json")))
+    assert first[0]["cache"] == MISS
+    assert second[0]["cache"] == UNCHANGED
+    assert (tmp_path / "linux.csv").read_text() == "sentinel"
+
+
+def test_cache_hit_needs_every_configured_output(tmp_path):
+    """
+    Test that an unchanged page is extracted again when one of its outputs, or a newly added format, is missing.
+    """
+    cache_path = str(tmp_path / "cache.json")
+    site = SiteConfig("linux", FIXTURE_URL, "linux.csv", engine="static", formats=("csv", "delta"))
+    run_sites([site], output_folder=str(tmp_path), cache=FetchCache(cache_path))
+    os.remove(tmp_path / "delta" / "linux" / "state.json")
+
+    second, _ = run_sites([site], output_folder=str(tmp_path), cache=FetchCache(cache_path))
+    assert second[0]["cache"] != UNCHANGED and second[0]["rows"] == 4
+    assert (tmp_path / "delta" / "linux" / "state.json").exists()
+
+    site.formats = ("csv", "delta", "sqlite")
+    third, _ = run_sites([site], output_folder=str(tmp_path), cache=FetchCache(cache_path))
+    assert third[0]["cache"] != UNCHANGED
+    fourth, _ = run_sites([site], output_folder=str(tmp_path), cache=FetchCache(cache_path))
+    assert fourth[0]["cache"] == UNCHANGED
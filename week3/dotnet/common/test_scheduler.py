@@ -0,0 +1,47 @@
+import json
+import os
+
+from common.pool import DriverPool
+from common.scheduler import STATE_FILE, Scheduler
+from common.sites import SiteConfig
+
+
+FIXTURE_URL = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+def test_sites_rerun_on_interval_and_failures_back_off(tmp_path):
+    """
+    Test that a healthy site runs once per interval while a failing one backs off exponentially.
+    """
+    good = SiteConfig("good", FIXTURE_URL, "good.csv", engine="static", interval=0.05)
+    bad = SiteConfig("bad", FIXTURE_URL + ".missing", "bad.csv", engine="static", interval=60)
+    scheduler = Scheduler([good, bad], DriverPool(2, factory=FakeDriver), str(tmp_path), jitter=0, backoff=0.1,
+                          seed=1)
+    assert scheduler.run(max_runs=5) >= 5
+
+    with open(tmp_path / STATE_FILE, encoding="utf-8") as f:
+        jobs = {job["site"]: job for job in json.load(f)["jobs"]}
+    assert jobs["good"]["last_ok"] and jobs["good"]["failures"] == 0 and jobs["good"]["runs"] >= 3
+    assert not jobs["bad"]["last_ok"] and jobs["bad"]["failures"] == jobs["bad"]["runs"] >= 1
+    delay = jobs["bad"]["next_run"] - jobs["bad"]["last_run"]
+    assert abs(delay - 0.1 * 2 ** (jobs["bad"]["failures"] - 1)) < 1e-6
+    assert (tmp_path / "good.csv").exists()
+
+
+def test_pool_recycles_driver_after_max_pages():
+    """
+    Test that a driver is quit and replaced once it served max_pages pages.
+    """
+    pool = DriverPool(1, factory=FakeDriver, max_pages=2)
+    seen = []
+    for _ in range(5):
+        with pool.acquire() as driver:
+            seen.append(driver)
+    assert seen[0] is seen[1] and seen[1] is not seen[2]
+    assert pool.started == 3 and pool.recycled == 2 and pool.live == 1
+    pool.close()
@@ -0,0 +1,54 @@
+import datetime
+import json
+import threading
+import urllib.request
+
+import pandas as pd
+
+from common.lifecycle import LifecycleSink
+from common.service import LifecycleService, make_server
+from common.sites import SiteConfig
+
+
+COLUMNS = ["Version", "Release date", "Build", "End of support"]
+
+
+def _scrape(path, rows):
+    sink = LifecycleSink(path, SiteConfig("dotnet", "https://example.com", "dotnet_{n}.csv", formats=("sqlite",)))
+    sink.write(0, tuple(COLUMNS), pd.DataFrame(rows, columns=COLUMNS))
+    sink.close()
+
+
+def test_lookups_and_hot_reload(tmp_path):
+    """
+    Test point, line and range lookups, and that a new scrape is swapped in without touching the old snapshot.
+    """
+    path = str(tmp_path / "lifecycle.db")
+    _scrape(path, [["8.0.10", "2024-10-08", "8.0.10.1", "2026-11-10"],
+                   ["8.0.2", "2024-02-13", "8.0.2.1", "2026-11-10"],
+                   ["9.0.0", "2024-11-12", "9.0.0.1", "2026-05-12"]])
+    service = LifecycleService(path, poll_interval=0.05)
+    old = service.snapshot
+    assert service.handle("/latest", {"product": "dotnet"})[1]["version"] == "9.0.0"
+    assert service.handle("/latest", {"product": "dotnet", "prefix": "8.0"})[1]["version"] == "8.0.10"
+    assert [r["version"] for r in service.handle("/range", {"product": "dotnet", "low": "8.0.3"})[1]] == \
+        ["8.0.10", "9.0.0"]
+    assert [end for end, *_ in old.expiring(200, today=datetime.date(2026, 5, 1))] == ["2026-05-12", "2026-11-10",
+                                                                                      "2026-11-10"]
+    assert service.handle("/range", {"product": "dotnet", "low": "not a version"})[0] == 400
+
+    _scrape(path, [["9.0.1", "2024-12-10", "9.0.1.1", "2026-05-12"]])
+    assert service.reload()
+    assert not service.reload()
+    assert service.handle("/latest", {"product": "dotnet"})[1]["version"] == "9.0.1"
+    assert old.latest("dotnet").version == "9.0.0"
+
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/release?product=dotnet&version=8.0.2"
+        with urllib.request.urlopen(url) as response:
+            assert json.load(response)["build"] == "8.0.2.1"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,109 @@
+import os
+
+import pandas as pd
+import pytest
+
+from common.runner import scrape_site
+from common.schemas import header_signature
+from common.sinks import ClusteredCsvSink, CombinedCsvSink, SchemaCsvSink
+from common.sites import SiteConfig
+from common.static import StaticHtmlEngine
+from common.tables import Cell, RawTable
+
+
+def _files(folder):
+    return sorted(os.path.relpath(os.path.join(parent, name), folder)
+                  for parent, _, names in os.walk(folder) for name in names)
+
+
+def test_combined_sink_unions_columns_in_order(tmp_path):
+    """
+    Test that streamed tables end up in one CSV with the union of their columns.
+    """
+    sink = CombinedCsvSink(str(tmp_path), "all.csv", tag_column="Source_Table")
+    sink.write(0, ("A", "B"), pd.DataFrame([["1", "2"]], columns=["A", "B"]))
+    sink.write(3, ("B", "C"), pd.DataFrame([["3", "4"], ["5", "6"]], columns=["B", "C"]))
+    assert sink.close() == 3
+    assert (tmp_path / "all.csv").read_text().splitlines() == [
+        "A,B,Source_Table,C",
+        "1,2,table_1,",
+        ",3,table_4,4",
+        ",5,table_4,6",
+    ]
+    assert [p.name for p in tmp_path.iterdir()] == ["all.csv"]
+
+
+def test_schema_sink_appends_same_header(tmp_path):
+    """
+    Test that tables with the same header share a file and new headers get a new one.
+    """
+    sink = SchemaCsvSink(str(tmp_path), "part_{n}.csv")
+    sink.write(0, ("A",), pd.DataFrame([["1"]], columns=["A"]))
+    sink.write(1, ("B",), pd.DataFrame([["2"]], columns=["B"]))
+    sink.write(2, ("A",), pd.DataFrame([["3"]], columns=["A"]))
+    assert not (tmp_path / "part_1.csv").exists()
+    sink.close()
+    assert (tmp_path / "part_1.csv").read_text().splitlines() == ["A", "1", "3"]
+    assert (tmp_path / "part_2.csv").read_text().splitlines() == ["B", "2"]
+
+
+def test_header_signature_ignores_footnotes_and_line_breaks():
+    """
+    Test that footnote markers, line breaks and case do not change a header's fingerprint.
+    """
+    assert header_signature(["Release", "Release date[8]", "End of\nPremier Support[105]"]) == \
+        header_signature(["release", "Release  date", "End of Premier Support"])
+    assert header_signature(["Build", "Build"]) == ("build", "build_1")
+
+
+def test_clustered_sink_merges_compatible_headers(tmp_path):
+    """
+    Test that compatible headers share one dense file mapped by column and unrelated ones get their own.
+    """
+    sink = ClusteredCsvSink(str(tmp_path), "linux_{n}.csv")
+    sink.write(0, ("Release", "Codename", "Release date[8]", "End of Premier Support"),
+               pd.DataFrame([["9.4", "Plow", "2024-05-02", "2032-06-30"]]))
+    sink.write(1, ("Version", "Support"), pd.DataFrame([["Oracle Linux 9", "Premier"]]))
+    sink.write(2, ("Release", "Release date", "End of Premier\nSupport[12]", "Codename"),
+               pd.DataFrame([["8.10", "2024-07-10", "2029-07-01", "Ootpa"]]))
+    assert sink.close() == 3
+    assert (tmp_path / "linux_1.csv").read_text().splitlines() == [
+        "Release,Codename,Release date,End of Premier Support",
+        "9.4,Plow,2024-05-02,2032-06-30",
+        "8.10,Ootpa,2024-07-10,2029-07-01",
+    ]
+    assert (tmp_path / "linux_2.csv").read_text().splitlines() == ["Version,Support", "Oracle Linux 9,Premier"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["linux_1.csv", "linux_2.csv"]
+
+
+def test_sink_context_removes_temporary_files_on_error(tmp_path):
+    """
+    Test that a sink used as a context manager leaves no spool or temporary file when the block raises.
+    """
+    with pytest.raises(RuntimeError):
+        with ClusteredCsvSink(str(tmp_path), "part_{n}.csv") as sink:
+            sink.write(0, ("A", "B"), pd.DataFrame([["1", "2"]], columns=["A", "B"]))
+            raise RuntimeError("browser went away")
+    assert _files(tmp_path) == []
+
+
+def test_failed_scrape_streams_tables_and_leaves_no_partial_files(tmp_path, monkeypatch):
+    """
+    Test that each table is written before the next is read, and a failure mid-page removes every unfinished file.
+    """
+    written_before_second = []
+
+    def iter_tables(self, driver, skip=()):
+        header = [Cell("Version", True, 1, 1), Cell("Build", True, 1, 1)]
+        yield RawTable(0, [header, [Cell("8.0", False, 1, 1), Cell("8.0.100", False, 1, 1)]])
+        written_before_second.extend(_files(tmp_path))
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(StaticHtmlEngine, "iter_tables", iter_tables)
+    site = SiteConfig("dotnet", "https://example.com", "dotnet.csv", engine="static",
+                      formats=["csv", "delta", "sqlite"])
+    result = scrape_site(site, output_folder=str(tmp_path), page_source="<html><body></body></html>")
+
+    assert not result["ok"] and "connection reset" in result["error"]
+    assert "dotnet.csv.spool" in written_before_second
+    assert [name for name in _files(tmp_path) if name.endswith((".tmp", ".spool", ".csv", ".jsonl"))] == []
@@ -0,0 +1,98 @@
+import json
+import os
+
+from common.extraction import PAGE_HTML_JS, RENDERED_PAGE_JS
+from common.runner import replay_sites, run_sites
+from common.scraper import SiteScraper
+from common.sites import SiteConfig
+from common.snapshots import SnapshotStore, build_har
+from common.static import parse_tables
+
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "oracle_linux.html")
+
+
+def test_store_is_content_addressed_and_compressed(tmp_path):
+    """
+    Test that identical pages share one compressed object and every save gets an index entry.
+    """
+    store = SnapshotStore(str(tmp_path))
+    html = "<html><body>" + "<p>same page</p>" * 500 + "</body></html>"
+    har = build_har("https://example.com", [["https://example.com/", "navigation", 2048, 0.0, 120.5]],
+                    "2026-01-05T10:00:00Z")
+    first = store.save("https://example.com", html, "example", har, taken="2026-01-05T10:00:00Z")
+    second = store.save("https://example.com", html, "example", taken="2026-02-05T10:00:00Z")
+    assert first["html"] == second["html"]
+    objects = [f for _, _, files in os.walk(tmp_path / "objects") for f in files]
+    assert len(objects) == 2  # one page, one HAR
+    assert os.path.getsize(store._object_path(first["html"], ".html.gz")) < len(html) / 10
+    assert store.latest("https://example.com")["taken"] == "2026-02-05T10:00:00Z"
+    assert store.load_html(first) == html
+    assert store.load_har(first)["log"]["entries"][0]["response"]["bodySize"] == 2048
+    assert store.load_har(second) is None
+
+
+def test_replay_reproduces_outputs_without_fetching(tmp_path):
+    """
+    Test that a recorded page is re-extracted offline, one Parquet partition per snapshot day.
+    """
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    site = SiteConfig("oracle_linux", "file://" + FIXTURE, "linux_{n}.csv", engine="static", merge="schema",
+                      formats=("csv", "parquet"))
+    live, _ = run_sites([site], output_folder=str(tmp_path / "live"), snapshots=store)
+    assert live[0]["ok"]
+    with open(FIXTURE, encoding="utf-8") as f:
+        store.save(site.url, f.read(), site.name, taken="2025-12-01T08:00:00Z")
+
+    offline = SiteConfig("oracle_linux", site.url.replace("file://", "file:///missing"), "linux_{n}.csv",
+                         engine="static", merge="schema", formats=("csv", "parquet"))
+    assert replay_sites([offline], store, str(tmp_path / "none"))[0][0]["error"] == "no snapshot"
+
+    results, _ = replay_sites([site], store, str(tmp_path / "replay"), history=True)
+    assert [r["rows"] for r in results] == [4, 4]
+    assert (tmp_path / "replay" / "linux_1.csv").read_text() == (tmp_path / "live" / "linux_1.csv").read_text()
+    schema_folder = next((tmp_path / "replay" / "dataset" / "source=oracle_linux").iterdir())
+    assert len([p for p in schema_folder.iterdir() if p.name.startswith("scrape_date=")]) == 2
+
+
+class RenderingDriver:
+    """Answers the snapshot scripts the way Chrome does for a page that hides a release with CSS."""
+    def __init__(self, html, rendered):
+        self.html = html
+        self.rendered = rendered
+
+    def execute_script(self, script, *args):
+        if script == RENDERED_PAGE_JS:
+            return json.dumps(self.rendered)
+        assert script == PAGE_HTML_JS
+        return self.html
+
+
+def test_browser_snapshots_replay_what_the_browser_rendered(tmp_path):
+    """
+    Test that a script-engine snapshot replays from the browser's rendering, so CSS-hidden content stays out.
+    """
+    html = ("<html><head><style>.old { display: none }</style></head><body>"
+            "<p>Version 9.0.1 released</p><p class='old'>Version 7.0.0 released</p>"
+            "<table><tr><th>Version</th><th>Released</th></tr><tr><td>9.0.1</td><td>2025-01-14</td></tr>"
+            "<tr class='old'><td>7.0.0</td><td>2022-11-08</td></tr></table></body></html>")
+    rendered = {
+        "text": "Version 9.0.1 released\nVersion\tReleased\n9.0.1\t2025-01-14",
+        "tables": [[[["Version", 1, 1, 1], ["Released", 1, 1, 1]], [["9.0.1", 0, 1, 1], ["2025-01-14", 0, 1, 1]],
+                    [["", 0, 1, 1], ["", 0, 1, 1]]]],
+        "text_nodes": [["Version 9.0.1 released", "", 1], ["Version", "", 4], ["Released", "", 5],
+                       ["9.0.1", "", 7], ["2025-01-14", "", 8]],
+        "blocks": [{"tag": "p", "text": "Version 9.0.1 released"}],
+    }
+    assert "7.0.0" in [row[0].text for row in parse_tables(html)[0].rows]  # lxml cannot see the stylesheet
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    site = SiteConfig("dotnet", "https://example.com/releases", "dotnet.csv", extract=("tables", "text"))
+    entry = SiteScraper(site, RenderingDriver(html, rendered), str(tmp_path / "live")).save_snapshot(store)
+    assert store.load_html(entry) == html and json.loads(store.load_rendered(entry))["engine"] == "script"
+
+    results, _ = replay_sites([site], store, str(tmp_path / "replay"))
+    assert results[0]["ok"], results[0]["error"]
+    table = (tmp_path / "replay" / "dotnet.csv").read_text()
+    assert "9.0.1" in table and "7.0.0" not in table
+    blocks = json.loads((tmp_path / "replay" / "all_text_data.json").read_text())
+    assert [block["text"] for block in blocks] == ["Version 9.0.1 released"]
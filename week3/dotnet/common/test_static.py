@@ -0,0 +1,46 @@
+import os
+
+from common.extraction import get_engine
+from common.static import parse_tables, parse_text_blocks
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_tables_reads_visible_text_only():
+    """
+    Test that sort keys, inline styles and footnote links are handled like innerText.
+    """
+    tables = parse_tables(read_fixture("oracle_linux.html"))
+    assert len(tables) == 2
+    rows = tables[0].header_body_rows()
+    assert rows[0] == ["Release", "Codename", "Release date[8]", "End of Premier Support"]
+    assert rows[1] == ["9.4", "Plow", "May 2, 2024", "June 30, 2032"]
+    assert rows[2] == ["9.3", "November 9, 2023", "June\n30, 2032"]
+    assert rows[3] == ["8.10", "Ootpa", "July 10, 2024", "July 1, 2029"]
+
+
+def test_parse_tables_keeps_spans():
+    """
+    Test that rowspan/colspan are parsed so the grid can be rebuilt.
+    """
+    tables = parse_tables(read_fixture("oracle_linux.html"))
+    assert tables[0].grid()[2][1] == "Plow"
+    assert tables[1].grid()[0] == ["Version", "Support", "Support"]
+    assert tables[1].cell_rows()[1] == ["Oracle Linux 9", "Premier", "Extended"]
+
+
+def test_static_engine_needs_no_browser():
+    """
+    Test that the static engine opens and extracts a page without a WebDriver.
+    """
+    engine = get_engine("static")
+    assert not engine.needs_browser
+    engine.open(None, "file://" + os.path.join(FIXTURES, "oracle_linux.html"))
+    assert len(engine.extract_tables(None)) == 2
+    assert {"tag": "li", "text": "Ksplice"} in parse_text_blocks(engine.page_source)
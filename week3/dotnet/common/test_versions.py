@@ -0,0 +1,115 @@
+import os
+
+from common.scraper import SiteScraper
+from common.sites import SiteConfig
+from common.static import parse_text_nodes
+from common.versions import VersionIndex, VersionRecord, build_index, parse_version
+
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "news.html")
+
+
+def test_text_nodes_are_read_once_with_their_link():
+    """
+    Test that nested divs do not repeat text and links are resolved against the page URL.
+    """
+    with open(FIXTURE, encoding="utf-8") as f:
+        nodes = parse_text_nodes(f.read(), "https://www.dbf2002.com/news.html")
+    texts = [text for text, _, _ in nodes]
+    assert texts.count("What's new") == 1
+    assert ("version 8.15", "https://www.dbf2002.com/download/dbfview.exe") in [(t, h) for t, h, _ in nodes]
+    assert "v9.99 hidden build" not in texts
+
+
+def test_extract_versions_single_pass(tmp_path):
+    """
+    Test that versions, dates and links come out once per block and de-duplicated.
+    """
+    site = SiteConfig("news", "file://" + FIXTURE, "versions.csv", engine="static", extract=["versions"])
+    scraper = SiteScraper(site, output_folder=str(tmp_path))
+    scraper.open_website()
+    scraper.extract_versions()
+    # file:// links are not http(s), so no URL is kept for them
+    assert scraper.versions_data == [
+        {"Version": "v8.15", "Date": "2024-05-03", "URL": ""},
+        {"Version": "v8.10", "Date": "2024-01-12", "URL": ""},
+        {"Version": "v7.95", "Date": "2023-06-01", "URL": ""},
+    ]
+
+
+def test_version_keys_sort_numerically():
+    """
+    Test that semver, Windows builds and Java versions get keys that sort as versions, not strings.
+    """
+    ordered = ["8.0.0-preview.7", "8.0.0-rc.2", "8.0.0", "8.0.100", "8.0.303", "10.0.100"]
+    assert sorted(ordered[::-1], key=lambda v: parse_version(v).key) == ordered
+    assert parse_version("10.0.26100.6899").kind == "windows"
+    assert parse_version("26100.6899").key > parse_version("26100.863").key
+    assert parse_version("21.0.2+13").key > parse_version("21.0.2+9").key
+    assert parse_version("v8.15").raw == "v8.15"
+    assert parse_version("24H2") is None
+
+
+def test_index_latest_and_range_queries(tmp_path):
+    """
+    Test that the index answers latest-per-line and newer-than queries from scraper CSVs.
+    """
+    (tmp_path / "dotnet_1.csv").write_text(
+        "SDK version,Release date\n8.0.303,2024-07-09\n8.0.100,2023-11-14\n9.0.100,2024-11-12\n")
+    (tmp_path / "micro.csv").write_text(
+        "Version,OS build,Availability date\n24H2,26100.6899,2025-10-14\n24H2,26100.863,2024-06-11\n")
+    sites = [SiteConfig("dotnet", "https://example.com", "dotnet_{n}.csv"),
+             SiteConfig("windows_server", "https://example.com", "micro.csv", index={"product_column": "Version"})]
+    index = build_index(str(tmp_path), sites)
+    assert len(index) == 5
+    assert index.latest("dotnet").version.raw == "9.0.100"
+    assert index.latest("dotnet", "8.0.x").version.raw == "8.0.303"
+    assert index.latest("dotnet", "7.0") is None
+    assert [r.version.raw for r in index.after("windows_server 24H2", "26100.863")] == ["26100.6899"]
+    assert index.latest("windows_server 24H2").date == "2025-10-14"
+
+    index.add(VersionRecord("dotnet", parse_version("10.0.100-rc.1"), "", "manual", ""))
+    assert index.latest("dotnet").version.raw == "10.0.100-rc.1"
+
+
+def test_index_keeps_records_sorted_when_added_out_of_order():
+    """
+    Test that records added to a VersionIndex in any order come back sorted and bounded per product.
+    """
+    index = VersionIndex()
+    for raw in ["8.0.303", "8.0.100", "9.0.100", "8.0.0-rc.2"]:
+        index.add(VersionRecord("dotnet", parse_version(raw), "", "manual", ""))
+    index.add(VersionRecord("java", parse_version("21.0.2+13"), "", "manual", ""))
+    assert index.products() == ["dotnet", "java"]
+    assert [r.version.raw for r in index.between("dotnet")] == ["8.0.0-rc.2", "8.0.100", "8.0.303", "9.0.100"]
+    assert [r.version.raw for r in index.after("dotnet", "8.0.100")] == ["8.0.303", "9.0.100"]
+    assert index.latest("java").version.raw == "21.0.2+13"
+
+
+def test_repeated_version_keeps_its_first_date(tmp_path):
+    """
+    Test that rows with the same version and URL but another date are merged into the first one.
+    """
+    page = ("<html><body><p>Version 8.15 released May 3, 2024</p><p>Version 8.15 mirrored May 9, 2024</p>"
+            "<p>Version 8.10 released Jan 12, 2024</p></body></html>")
+    site = SiteConfig("news", "https://example.com/news.html", "versions.csv", engine="static",
+                      extract=["versions"])
+    scraper = SiteScraper(site, output_folder=str(tmp_path))
+    scraper.open_website(page)
+    scraper.extract_versions()
+    assert [(row["Version"], row["Date"]) for row in scraper.versions_data] == [
+        ("v8.15", "2024-05-03"), ("v8.10", "2024-01-12")]
+
+
+def test_trailing_zero_components_are_the_same_version():
+    """
+    Test that "10.0.22631.0" and "10.0.22631" get one key and stay inside their line.
+    """
+    assert parse_version("10.0.22631.0").key == parse_version("10.0.22631").key
+    assert parse_version("8.0").key == parse_version("8.0.0").key < parse_version("8.0.1").key
+    index = VersionIndex(VersionRecord("windows", parse_version(raw), "", "manual", "")
+                         for raw in ["10.0.22631.0", "10.0.22621.4317", "10.0.22631.4460"])
+    assert index.latest("windows", "10.0.22631").version.raw == "10.0.22631.4460"
+    assert [r.version.raw for r in index.after("windows", "10.0.22631")] == ["10.0.22631.4460"]
+    index.add(VersionRecord("dotnet", parse_version("8.0.0"), "", "manual", ""))
+    assert index.latest("dotnet", "8.0").version.raw == "8.0.0"
@@ -0,0 +1,222 @@
+"""Version parsing and an in-memory sorted index over the scraped version data.
+
+``parse_version`` turns the version strings found on the scraped pages into
+tuple keys that sort correctly:
+
+    semver / dotted      8.0.100, v1.2.3, 8.0.0-rc.2
+    Windows builds       10.0.26100.6899, 26100.6899
+    Java                 21.0.2+13, 17.0.10+7-LTS
+
+``VersionIndex`` keeps the records of each product sorted by that key, so the
+latest version, the latest of a line ("8.0.x") and range queries ("all builds
+after 26100.6899") are binary searches instead of string-sorting CSVs.
+
+Usage (from week3/dotnet):
+    python -m common.versions latest windows_server
+    python -m common.versions latest dotnet 8.0
+    python -m common.versions range windows_server 26100.6899
+"""
+import argparse
+import bisect
+import csv
+import glob
+import os
+import re
+from collections import namedtuple
+
+
+# Java first: its "+build" suffix would otherwise be read as semver build metadata.
+JAVA_RE = re.compile(r"^v?(\d+(?:\.\d+){0,3})\+(\d+)(?:-([0-9A-Za-z.-]+))?$")
+SEMVER_RE = re.compile(r"^v?(\d+(?:\.\d+){0,3})(?:-([0-9A-Za-z.-]+))?(?:\+([0-9A-Za-z.-]+))?$", re.IGNORECASE)
+# Used to find a version inside a longer cell such as "Version 8.0.100 (SDK)".
+SEARCH_RE = re.compile(r"\bv?\d+(?:\.\d+){1,3}(?:\+\d+)?(?:-[0-9A-Za-z.]+)?", re.IGNORECASE)
+VERSION_COLUMN_RE = re.compile(r"version|build|release|sdk|runtime", re.IGNORECASE)
+
+Version = namedtuple("Version", ["raw", "key", "kind"])
+VersionRecord = namedtuple("VersionRecord", ["product", "version", "date", "source", "url"])
+
+
+def _prerelease_key(prerelease):
+    # Numeric identifiers sort before alphanumeric ones, as in semver.
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease.split("."))
+
+
+def _numbers(text):
+    # Trailing zero components do not change a version: "10.0.22631.0" is "10.0.22631".
+    numbers = [int(n) for n in text.split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    return tuple(numbers)
+
+
+def _key(numbers, prerelease="", build=0):
+    # A release sorts after its pre-releases: (1,) > (0, ...).
+    release = (1,) if not prerelease else (0, _prerelease_key(prerelease))
+    return (_numbers(numbers), release, build)
+
+
+def parse_version(text):
+    """Parses a version string into a ``Version``; returns None if it is not one."""
+    text = text.strip()
+    match = JAVA_RE.match(text)
+    if match:
+        numbers, build, _ = match.groups()
+        return Version(text, _key(numbers, "", int(build)), "java")
+    match = SEMVER_RE.match(text)
+    if not match:
+        return None
+    numbers, prerelease, _ = match.groups()
+    parts = numbers.count(".") + 1
+    kind = "windows" if parts == 4 or (parts == 2 and int(numbers.split(".")[0]) >= 10000) else "semver"
+    return Version(text, _key(numbers, prerelease or ""), kind)
+
+
+def find_version(text):
+    """Returns the first version found inside ``text``, or None."""
+    match = SEARCH_RE.search(text)
+    return parse_version(match.group(0)) if match else None
+
+
+def _prefix_bounds(prefix):
+    text = prefix.rstrip(".x")
+    numbers = tuple(int(n) for n in text.split("."))
+    upper = numbers[:-1] + (numbers[-1] + 1,)
+    return (_numbers(text),), (upper,)
+
+
+class VersionIndex:
+    """Per-product lists of version records kept sorted by version key.
+
+    Bulk loads go through ``extend``, which sorts each product once; ``add`` is
+    for the odd single record and inserts it in place.
+    """
+    def __init__(self, records=()):
+        self.keys = {}     # product -> sorted list of version keys
+        self.records = {}  # product -> records, in the same order as keys
+        self.extend(records)
+
+    def add(self, record):
+        """Inserts a record; ``record.version`` must be a parsed ``Version``."""
+        keys = self.keys.setdefault(record.product, [])
+        records = self.records.setdefault(record.product, [])
+        position = bisect.bisect_right(keys, record.version.key)
+        keys.insert(position, record.version.key)
+        records.insert(position, record)
+
+    def extend(self, records):
+        """Adds many records and re-sorts each product they touch once."""
+        touched = set()
+        for record in records:
+            self.records.setdefault(record.product, []).append(record)
+            touched.add(record.product)
+        for product in touched:
+            # Stable, so records with the same key keep their insertion order.
+            self.records[product].sort(key=_version_key)
+            self.keys[product] = [record.version.key for record in self.records[product]]
+
+    def __len__(self):
+        return sum(len(keys) for keys in self.keys.values())
+
+    def products(self):
+        """Returns the indexed product names."""
+        return sorted(self.keys)
+
+    def latest(self, product, prefix=None):
+        """Latest record of ``product``, optionally within a line such as "8.0" / "8.0.x"."""
+        if prefix:
+            found = self.between(product, *_prefix_bounds(prefix))
+            return found[-1] if found else None
+        records = self.records.get(product)
+        return records[-1] if records else None
+
+    def between(self, product, low=None, high=None):
+        """Records with low <= key < high (either bound may be None)."""
+        keys = self.keys.get(product, [])
+        start = bisect.bisect_left(keys, low) if low is not None else 0
+        end = bisect.bisect_left(keys, high) if high is not None else len(keys)
+        return self.records.get(product, [])[start:end]
+
+    def after(self, product, version):
+        """Records strictly newer than ``version`` (a string such as "26100.6899")."""
+        parsed = parse_version(version)
+        if parsed is None:
+            raise ValueError(f"Not a version: {version!r}")
+        keys = self.keys.get(product, [])
+        return self.records.get(product, [])[bisect.bisect_right(keys, parsed.key):]
+
+
+def _version_key(record):
+    return record.version.key
+
+
+def _date_column(header):
+    for col in header:
+        if "date" in col.lower():
+            return col
+    return None
+
+
+def index_csv(index, path, product, product_column=None, version_columns=None, source=""):
+    """Adds every row of a scraper CSV that holds a version; returns the number of records added."""
+    found = []
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames or []
+        columns = version_columns or [col for col in header if VERSION_COLUMN_RE.search(col)]
+        date_column = _date_column(header)
+        for row in reader:
+            for col in columns:
+                version = find_version(row.get(col) or "")
+                if version is None:
+                    continue
+                name = f"{product} {row[product_column]}".strip() if product_column else product
+                found.append(VersionRecord(name, version, row.get(date_column, "") if date_column else "",
+                                           source or os.path.basename(path), row.get("URL", "")))
+                break
+    index.extend(found)
+    return len(found)
+
+
+def build_index(output_folder, sites):
+    """Builds a ``VersionIndex`` from the CSV outputs of the given site configs."""
+    index = VersionIndex()
+    for site in sites:
+        for path in sorted(glob.glob(os.path.join(output_folder, site.output.format(n="*")))):
+            index_csv(index, path, site.name, site.index.get("product_column"),
+                      site.index.get("version_columns"), site.name)
+    return index
+
+
+def _print_records(records):
+    for r in records:
+        print(f"{r.product:<30} {r.version.raw:<20} {r.date:<12} {r.source}")
+
+
+def main(argv=None):
+    from common.sites import SITES_DIR, load_sites
+
+    parser = argparse.ArgumentParser(description="Query the scraped versions.")
+    parser.add_argument("--output-folder", default="output")
+    parser.add_argument("--sites-dir", default=SITES_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("products")
+    latest = sub.add_parser("latest")
+    latest.add_argument("product")
+    latest.add_argument("prefix", nargs="?", help="Version line, e.g. 8.0 or 8.0.x")
+    between = sub.add_parser("range")
+    between.add_argument("product")
+    between.add_argument("after", help="Only versions newer than this one")
+    args = parser.parse_args(argv)
+
+    index = build_index(args.output_folder, load_sites(args.sites_dir))
+    if args.command == "products":
+        print("\n".join(index.products()))
+    elif args.command == "latest":
+        record = index.latest(args.product, args.prefix)
+        _print_records([record] if record else [])
+    else:
+        _print_records(index.after(args.product, args.after))
+
+
+if __name__ == "__main__":
+    main()